@@ -1,10 +1,12 @@
 import pandas as pd
 from typing import List
+from core.instrumentation import traced
 
 
 class InsightsGenerator:
     """Service for generating insights from data"""
     
+    @traced
     def generate_insights(self, df: pd.DataFrame) -> List[str]:
         """Calculate key insights from the data"""
         insights = []
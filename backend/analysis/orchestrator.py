@@ -11,7 +11,7 @@ class AnalysisOrchestrator:
     
     def __init__(self, color_config, config_manager=None):
         """Initialize with color configuration"""
-        self.color_manager = ColorManager(color_config)
+        self.color_manager = ColorManager(color_config, config_manager)
         self.data_processor = DataProcessor(config_manager)
         self.statistics_calculator = StatisticsCalculator()
         self.insights_generator = InsightsGenerator()
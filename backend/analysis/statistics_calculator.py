@@ -1,11 +1,13 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List
+from core.instrumentation import traced
 
 
 class StatisticsCalculator:
     """Service for calculating summary and response statistics"""
     
+    @traced
     def generate_summary_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate and return summary statistics"""
         total_responses = len(df)
@@ -34,6 +36,7 @@ class StatisticsCalculator:
             'header_info': header_info
         }
     
+    @traced
     def generate_response_statistics(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Generate response statistics by category"""
         stats = []
@@ -1,7 +1,7 @@
 # backend/config/app_state.py
-import json
 from typing import Dict, Any, Optional
 from .config_manager import ConfigManager
+from .config_service import ConfigSnapshot
 
 
 class AppState:
@@ -24,21 +24,26 @@ class AppState:
                 'app_settings': {}
             }
             self.load_initial_state()
+            # Follow configuration reloads so the active protocol never goes stale
+            self.config_manager.subscribe(self._on_config_reloaded)
             AppState._initialized = True
     
     def load_initial_state(self):
         """Load initial state from config files"""
         try:
-            observation_configs = self.config_manager.get_observation_configs()
-            if observation_configs:
-                self._state['current_observation_config'] = observation_configs[0].copy()
-                self._state['current_observation_config']['colors'] = self.config_manager.get_colors()
-            else:
-                self._state['current_observation_config'] = self.get_fallback_config()
-                
+            # Protocols from the shared config snapshot are read-only and already include colors
+            config = self.config_manager.get_config_by_index(0)
+            self._state['current_observation_config'] = config or self.get_fallback_config()
         except Exception:
             self._state['current_observation_config'] = self.get_fallback_config()
     
+    def _on_config_reloaded(self, snapshot: ConfigSnapshot):
+        """Re-resolve the active protocol by name in a newly loaded configuration"""
+        current_name = self.get_current_config().get('name')
+        config = snapshot.get_protocol_by_name(current_name) or snapshot.get_protocol(0)
+        if config:
+            self._state['current_observation_config'] = config
+    
     def get_fallback_config(self):
         """Return fallback configuration"""
         return {
@@ -92,3 +97,9 @@ class AppState:
                 self._state['current_observation_config'] = config
         except Exception:
             pass
+    
+    def update_config_by_name(self, name: str):
+        """Update current observation configuration, looked up by protocol name"""
+        config = self.config_manager.get_config_by_name(name)
+        if config:
+            self._state['current_observation_config'] = config
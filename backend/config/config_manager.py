@@ -1,72 +1,77 @@
-import json
-import os
-from typing import Dict, Any, List, Optional
+from typing import Any, Callable, Mapping, Optional, Tuple
+from core.util_functions import resource_path
+from .config_service import ConfigService, ConfigSnapshot, get_fallback_config
+from .protocol_index import ProtocolIndex
 
 
 class ConfigManager:
-    """Pure configuration loader class with no GUI dependencies"""
-    
-    def __init__(self, config_path: str = "config.json"):
-        self.config_path = config_path
-        self._config = None
-    
-    def load_config(self) -> Dict[str, Any]:
+    """Pure configuration loader class with no GUI dependencies
+
+    All managers for the same file share one ConfigService, so config.json is
+    parsed once per process and every caller sees the same immutable snapshot.
+    Returned configurations are read-only; use config_service.thaw() for an
+    editable copy.
+    """
+
+    def __init__(self, config_path: Optional[str] = None):
+        # Use resource_path to make the path PyInstaller-safe
+        self.config_path = config_path or resource_path("config.json")
+        self.service = ConfigService.for_path(self.config_path)
+
+    def get_snapshot(self) -> ConfigSnapshot:
+        """Get the current immutable configuration snapshot"""
+        return self.service.get_snapshot()
+
+    def load_config(self) -> Mapping[str, Any]:
         """Load configuration from JSON file"""
-        if self._config is None:
-            try:
-                with open(self.config_path, "r") as f:
-                    self._config = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError) as e:
-                print(f"Failed to load config: {e}")
-                self._config = self._get_fallback_config()
-        return self._config
-    
-    def get_observation_configs(self) -> List[Dict[str, Any]]:
-        """Get all observation configurations"""
-        config = self.load_config()
-        return config.get("observation_configs", [])
-    
-    def get_colors(self) -> Dict[str, str]:
+        return self.get_snapshot().data
+
+    def get_protocol_names(self) -> Tuple[str, ...]:
+        """Get the names of all protocols in display order, without loading their bodies"""
+        return self.get_snapshot().protocol_names
+
+    def get_observation_configs(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get all observation configurations (loads every protocol; prefer get_protocol_names)"""
+        return self.get_snapshot().all_protocols()
+
+    def get_colors(self) -> Mapping[str, str]:
         """Get color configuration"""
-        config = self.load_config()
-        return config.get("colors", {})
-    
-    def get_config_by_index(self, index: int) -> Optional[Dict[str, Any]]:
-        """Get observation configuration by index"""
-        configs = self.get_observation_configs()
-        if 0 <= index < len(configs):
-            config = configs[index].copy()
-            # Add colors to the config
-            config['colors'] = self.get_colors()
-            return config
-        return None
-    
-    def get_config_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        """Get observation configuration by name"""
-        configs = self.get_observation_configs()
-        for config in configs:
-            if config.get('name') == name:
-                config_copy = config.copy()
-                config_copy['colors'] = self.get_colors()
-                return config_copy
-        return None
-    
-    def _get_fallback_config(self) -> Dict[str, Any]:
+        return self.get_snapshot().colors
+
+    def get_config_by_index(self, index: int) -> Optional[Mapping[str, Any]]:
+        """Get observation configuration (with colors) by index"""
+        return self.get_snapshot().get_protocol(index)
+
+    def get_config_by_name(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get observation configuration (with colors) by name"""
+        return self.get_snapshot().get_protocol_by_name(name)
+
+    def get_protocol_index(self, config: Mapping[str, Any]) -> ProtocolIndex:
+        """Get the compiled index for a protocol, cached per configuration snapshot"""
+        snapshot = self.get_snapshot()
+        name = config.get("name")
+        if snapshot.get_protocol_by_name(name) is config:
+            return snapshot.derived(f"protocol_index:{name}", lambda _: ProtocolIndex(config))
+        # Protocols not from the current snapshot (fallbacks, stale sessions) are compiled directly
+        return ProtocolIndex(config)
+
+    def get_protocol_index_by_name(self, name: str) -> Optional[ProtocolIndex]:
+        """Get the compiled index for a protocol by name"""
+        config = self.get_config_by_name(name)
+        return self.get_protocol_index(config) if config else None
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None], weak: bool = False) -> Callable[[], None]:
+        """Call callback with the new snapshot whenever the configuration is reloaded"""
+        return self.service.subscribe(callback, weak)
+
+    def start_watching(self) -> bool:
+        """Hot-reload protocols when config.json is replaced on disk"""
+        return self.service.start_watching()
+
+    def stop_watching(self) -> None:
+        """Stop hot-reloading protocols"""
+        self.service.stop_watching()
+
+    def _get_fallback_config(self):
         """Return fallback configuration if file cannot be loaded"""
-        return {
-            "colors": {
-                "student": "#F46715",
-                "engagement": "#4169E1", 
-                "instructor": "#0C8346",
-                "comments": "#808080",
-                "carmine": "#931621"
-            },
-            "observation_configs": [{
-                "name": "Default",
-                "timer_method": "timepoint",
-                "timer_interval": 0,
-                "student_actions": [],
-                "instructor_actions": [],
-                "engagement_images": []
-            }]
-        }
+        return get_fallback_config()
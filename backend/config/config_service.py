@@ -0,0 +1,348 @@
+import json
+import os
+import threading
+import weakref
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from .protocol_registry import ProtocolRegistry
+from .protocol_schema import validate_config
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a frozen value (for callers that need to edit it)"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def get_fallback_config() -> Dict[str, Any]:
+    """Return fallback configuration if file cannot be loaded"""
+    return {
+        "colors": {
+            "student": "#F46715",
+            "engagement": "#4169E1",
+            "instructor": "#0C8346",
+            "comments": "#808080",
+            "carmine": "#931621"
+        },
+        "observation_configs": [{
+            "name": "Default",
+            "timer_method": "timepoint",
+            "timer_interval": 0,
+            "student_actions": [],
+            "instructor_actions": [],
+            "engagement_images": []
+        }]
+    }
+
+
+class ConfigSnapshot:
+    """Immutable, fully parsed view of one version of config.json.
+
+    Protocol views with the shared colors merged in are built once per snapshot,
+    so callers can hand them around without copying. Protocols kept in a
+    protocol directory are only listed by name until first requested, then
+    loaded and cached on the snapshot. Values derived from the configuration
+    (orderings, indexes, ...) can be memoized on the snapshot with derived()
+    and are discarded automatically when the file changes.
+    """
+
+    def __init__(self, data: Dict[str, Any], version: int, file_stamp: Optional[Tuple] = None,
+                 registry: Optional[ProtocolRegistry] = None):
+        self.version = version
+        self.file_stamp = file_stamp
+        self.registry = registry
+        self.data = freeze(data)
+        self.colors = self.data.get("colors", MappingProxyType({}))
+        self.observation_configs = self.data.get("observation_configs", ())
+
+        # Protocols inline in config.json come first, then the protocol directory
+        names = [protocol.get("name") for protocol in self.observation_configs]
+        if registry is not None:
+            inline_names = set(names)
+            names.extend(name for name in registry.names if name not in inline_names)
+        self.protocol_names: Tuple[str, ...] = tuple(names)
+
+        # Protocols with colors added, as the GUIs expect them (directory protocols load on demand)
+        self._protocols: List[Optional[Mapping[str, Any]]] = [
+            MappingProxyType({**protocol, "colors": self.colors}) for protocol in self.observation_configs
+        ]
+        self._protocols.extend([None] * (len(names) - len(self._protocols)))
+        self._index_by_name = {}
+        for index, name in enumerate(names):
+            self._index_by_name.setdefault(name, index)
+
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def get_protocol(self, index: int) -> Optional[Mapping[str, Any]]:
+        """Get protocol (with colors) by index"""
+        if not 0 <= index < len(self._protocols):
+            return None
+        protocol = self._protocols[index]
+        if protocol is None and self.registry is not None:
+            body = self.registry.load(self.protocol_names[index])
+            if body is not None:
+                protocol = MappingProxyType({**freeze(body), "colors": self.colors})
+                # Reference assignment is atomic; concurrent loaders build equal views
+                self._protocols[index] = protocol
+        return protocol
+
+    def get_protocol_by_name(self, name: str) -> Optional[Mapping[str, Any]]:
+        """Get protocol (with colors) by name"""
+        index = self._index_by_name.get(name)
+        return self.get_protocol(index) if index is not None else None
+
+    def get_protocol_index(self, name: str) -> Optional[int]:
+        """Get the position of a protocol by name"""
+        return self._index_by_name.get(name)
+
+    def all_protocols(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get every protocol, loading any that have not been loaded yet"""
+        protocols = (self.get_protocol(index) for index in range(len(self._protocols)))
+        return tuple(protocol for protocol in protocols if protocol is not None)
+
+    def derived(self, key: str, factory: Callable[["ConfigSnapshot"], Any]) -> Any:
+        """Return a value computed from this snapshot, building it at most once"""
+        if key not in self._derived:
+            with self._derived_lock:
+                if key not in self._derived:
+                    self._derived[key] = factory(self)
+        return self._derived[key]
+
+
+class ConfigService:
+    """Shared, cached access to a configuration file.
+
+    There is one service per file path per process. The file is parsed once and
+    the result shared as an immutable ConfigSnapshot; it is only parsed again
+    when its modification time (or size) changes, after which subscribers are
+    notified with the new snapshot.
+
+    With start_watching() a filesystem watcher drives reloads instead: new files
+    are parsed and validated on the watcher thread, and get_snapshot() stops
+    checking the file on every call.
+    """
+    _instances: Dict[str, "ConfigService"] = {}
+    _instances_lock = threading.Lock()
+
+    # Wait this long after the last filesystem event before reloading, so
+    # editors and deploy scripts can finish writing the file
+    RELOAD_DEBOUNCE_SECONDS = 0.25
+
+    @classmethod
+    def for_path(cls, config_path: str) -> "ConfigService":
+        """Get the process-wide service for a configuration file"""
+        key = os.path.abspath(config_path)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(key)
+            return cls._instances[key]
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._version = 0
+        self._failed_stamp: Optional[Tuple] = None
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[], Optional[Callable[[ConfigSnapshot], None]]]] = []
+        self._observer = None
+        self._reload_timer: Optional[threading.Timer] = None
+        self._reload_forced = False
+
+    def get_snapshot(self) -> ConfigSnapshot:
+        """Get the current snapshot, re-parsing the file only if it changed on disk"""
+        # While watching, the watcher reloads the file - no stat on the hot path
+        if self._snapshot is None or self._observer is None:
+            self.reload_if_changed()
+        return self._snapshot
+
+    def reload_if_changed(self) -> bool:
+        """Re-parse the file if its modification stamp changed; return True if reloaded"""
+        stamp = self._current_stamp()
+        snapshot = self._snapshot
+        if snapshot is not None and stamp in (snapshot.file_stamp, self._failed_stamp):
+            return False
+        return self.reload() is not None
+
+    def reload(self, force: bool = False) -> Optional[ConfigSnapshot]:
+        """Parse and validate the file now and publish it as the new snapshot"""
+        with self._lock:
+            stamp = self._current_stamp()
+            # Another thread may already have loaded this version
+            if not force and self._snapshot is not None and stamp is not None and stamp == self._snapshot.file_stamp:
+                return None
+
+            registry = None
+            try:
+                with open(self.config_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # Schema check (compiled once) so malformed protocols never reach the pages
+                errors = validate_config(data)
+                if errors:
+                    raise ValueError("invalid configuration:\n  " + "\n  ".join(errors))
+                # Only the directory index is read here; protocol bodies load on first use
+                registry = ProtocolRegistry.for_config(data, self.config_path)
+            except (OSError, ValueError) as e:
+                # json.JSONDecodeError is a ValueError; OSError covers a missing,
+                # unreadable or locked file (and a protocol index that cannot be read)
+                print(f"Failed to load config: {e}")
+                if self._snapshot is not None:
+                    # Keep serving the last good configuration until the file changes again
+                    self._failed_stamp = stamp
+                    return None
+                data = get_fallback_config()
+
+            snapshot = self._publish(data, self._stamp_for(registry), registry)
+
+        self._notify(snapshot)
+        return snapshot
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None], weak: bool = False) -> Callable[[], None]:
+        """Register a callback for new snapshots; returns a function that unsubscribes.
+
+        With weak=True a bound method is held through a weak reference, so
+        subscribing does not keep short-lived objects (data processors, color
+        managers) alive. Callbacks run on the thread that performed the reload.
+        """
+        if weak and hasattr(callback, "__self__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        with self._lock:
+            self._subscribers.append(ref)
+
+        def unsubscribe():
+            with self._lock:
+                if ref in self._subscribers:
+                    self._subscribers.remove(ref)
+        return unsubscribe
+
+    def start_watching(self) -> bool:
+        """Reload the file from a filesystem watcher; returns False if watching is unavailable"""
+        with self._lock:
+            if self._observer is not None:
+                return True
+            try:
+                from watchdog.observers import Observer
+                from watchdog.events import FileSystemEventHandler
+            except ImportError as e:
+                print(f"Config hot-reload unavailable: {e}")
+                return False
+
+            service = self
+
+            class ConfigFileHandler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    # Deploys often replace the file (moved/created) rather than modify it
+                    paths = (getattr(event, "src_path", None), getattr(event, "dest_path", None))
+                    paths = [os.path.abspath(path) for path in paths if path]
+                    registry = service._snapshot.registry if service._snapshot else None
+                    if any(path in (service.config_path, registry and registry.index_path) for path in paths):
+                        service._schedule_reload()
+                    elif registry and any(os.path.dirname(path) == registry.directory for path in paths):
+                        # A protocol body changed; its stamp is not tracked, so reload unconditionally
+                        service._schedule_reload(force=True)
+
+            # Load the current file before the watcher takes over change detection
+            self.reload_if_changed()
+
+            observer = Observer()
+            handler = ConfigFileHandler()
+            watched_dirs = {os.path.dirname(self.config_path) or "."}
+            if self._snapshot.registry is not None:
+                watched_dirs.add(self._snapshot.registry.directory)
+            for directory in watched_dirs:
+                if os.path.isdir(directory):
+                    observer.schedule(handler, directory, recursive=False)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+        return True
+
+    def stop_watching(self) -> None:
+        """Stop the filesystem watcher and go back to checking the file on access"""
+        with self._lock:
+            observer, self._observer = self._observer, None
+            if self._reload_timer is not None:
+                self._reload_timer.cancel()
+                self._reload_timer = None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=2)
+
+    def is_watching(self) -> bool:
+        """Check if a filesystem watcher is driving reloads"""
+        return self._observer is not None
+
+    def _schedule_reload(self, force: bool = False) -> None:
+        """Debounce filesystem events into a single reload off the calling thread"""
+        with self._lock:
+            if self._reload_timer is not None:
+                self._reload_timer.cancel()
+                # Do not lose a pending forced reload to a later ordinary event
+                force = force or self._reload_forced
+            self._reload_forced = force
+            target = (lambda: self.reload(force=True)) if force else self.reload_if_changed
+            timer = threading.Timer(self.RELOAD_DEBOUNCE_SECONDS, target)
+            timer.daemon = True
+            self._reload_timer = timer
+            timer.start()
+
+    def _publish(self, data: Dict[str, Any], stamp: Optional[Tuple],
+                 registry: Optional[ProtocolRegistry] = None) -> ConfigSnapshot:
+        """Swap in a new snapshot built from parsed data"""
+        # Build everything before the swap so readers never see a partial protocol set
+        snapshot = ConfigSnapshot(data, self._version + 1, stamp, registry)
+        self._version = snapshot.version
+        self._failed_stamp = None
+        # Single reference assignment - readers see either the old or the new snapshot
+        self._snapshot = snapshot
+        return snapshot
+
+    def _notify(self, snapshot: ConfigSnapshot) -> None:
+        """Call subscribers with a new snapshot (the first load is not announced)"""
+        if snapshot.version == 1:
+            return
+        with self._lock:
+            # Drop subscribers whose objects have been garbage collected
+            self._subscribers = [ref for ref in self._subscribers if ref() is not None]
+            callbacks = [ref() for ref in self._subscribers]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(snapshot)
+            except Exception as e:
+                print(f"Config subscriber failed: {e}")
+
+    def _current_stamp(self) -> Optional[Tuple]:
+        """Stamp of config.json plus the index of the current protocol directory"""
+        snapshot = self._snapshot
+        return self._stamp_for(snapshot.registry if snapshot is not None else None)
+
+    def _stamp_for(self, registry: Optional[ProtocolRegistry]) -> Optional[Tuple]:
+        """Stamp of config.json, extended with the stamp of a protocol directory index"""
+        stamp = self._file_stamp()
+        if stamp is None or registry is None:
+            return stamp
+        return stamp + (registry.index_stamp(),)
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the file, None if it does not exist"""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Observation categories and the protocol sections their buttons come from
+CATEGORY_SECTIONS = (
+    ("Student", "student_actions"),
+    ("Instructor", "instructor_actions"),
+    ("Engagement", "engagement_images"),
+)
+
+# Values used before protocols could define their own engagement scale
+LEGACY_ENGAGEMENT_VALUES = {"Low": 1, "Medium": 2, "High": 3}
+
+
+class ProtocolIndex:
+    """Compiled lookup tables for one observation protocol.
+
+    Every button in the protocol gets an integer code id. Per-code tables give
+    the category, label, recorded value and display position, so recording an
+    interval is a walk over the toggled code ids instead of building and
+    re-parsing "Category_label" strings.
+
+    Engagement levels may set a numeric "value" in config.json; otherwise the
+    legacy Low/Medium/High values are used, and any other label is scored by
+    its position (the first level listed gets the highest value).
+    """
+
+    def __init__(self, protocol: Mapping[str, Any]):
+        self.name = protocol.get("name", "")
+        categories: List[str] = []
+        labels: List[str] = []
+        values: List[Any] = []
+        positions: List[int] = []
+
+        for category, section in CATEGORY_SECTIONS:
+            entries = protocol.get(section, ())
+            for position, entry in enumerate(entries):
+                label = entry["label"]
+                categories.append(category)
+                labels.append(label)
+                positions.append(position)
+                if "value" in entry:
+                    values.append(entry["value"])
+                elif category == "Engagement":
+                    values.append(LEGACY_ENGAGEMENT_VALUES.get(label, len(entries) - position))
+                else:
+                    values.append(1)
+
+        # Per-code tables (indexed by code id)
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self.values: Tuple[Any, ...] = tuple(values)
+        self.positions: Tuple[int, ...] = tuple(positions)
+
+        # Lookups
+        self._code_ids: Dict[Tuple[str, str], int] = {}
+        self.label_to_category: Dict[str, str] = {}
+        self.state_keys: Dict[str, int] = {}
+        self.response_order: Dict[str, Tuple[str, ...]] = {}
+        for code_id, (category, label) in enumerate(zip(categories, labels)):
+            self._code_ids.setdefault((category, label), code_id)
+            # Labels can repeat across categories; the first category wins here
+            self.label_to_category.setdefault(label, category)
+            # Widget state keys as used by the Streamlit pages, e.g. "student_L"
+            self.state_keys.setdefault(f"{category.lower()}_{label}", code_id)
+        for category, _ in CATEGORY_SECTIONS:
+            self.response_order[category] = tuple(
+                label for label, cat in zip(labels, categories) if cat == category
+            )
+
+    @property
+    def size(self) -> int:
+        """Number of codes in the protocol"""
+        return len(self.labels)
+
+    def code_id(self, category: str, label: str) -> Optional[int]:
+        """Get the code id of a button, None if it is not part of the protocol"""
+        return self._code_ids.get((category, label))
+
+    def value_of(self, category: str, label: str, default: Any = 1) -> Any:
+        """Get the value recorded for a button"""
+        code_id = self._code_ids.get((category, label))
+        return self.values[code_id] if code_id is not None else default
+
+    def engagement_value(self, label: str) -> Any:
+        """Get the numeric value of an engagement level"""
+        return self.value_of("Engagement", label, LEGACY_ENGAGEMENT_VALUES.get(label, 1))
+
+    def codes_in(self, category: str) -> List[int]:
+        """Get the code ids of a category in display order"""
+        return [code_id for code_id, cat in enumerate(self.categories) if cat == category]
+
+    def display_rank(self, category: str, label: str) -> int:
+        """Position of a response within its category (unknown responses sort last)"""
+        code_id = self._code_ids.get((category, label))
+        return self.positions[code_id] if code_id is not None else 999
+
+    def rows_for(self, code_ids: Iterable[int]) -> List[Tuple[str, str, Any]]:
+        """Get (category, label, value) rows for a set of code ids"""
+        categories, labels, values = self.categories, self.labels, self.values
+        return [(categories[i], labels[i], values[i]) for i in code_ids]
+
+    @staticmethod
+    def toggled_codes(flags: bytearray) -> List[int]:
+        """Code ids whose flag is set in a per-code toggle array"""
+        return [code_id for code_id, flag in enumerate(flags) if flag]
@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Mapping, Optional, Tuple
+from .protocol_schema import validate_protocol, validate_registry_index
+
+
+class ProtocolRegistry:
+    """Protocols stored one per file in a directory, listed by a small index.json.
+
+    config.json points to the directory with "protocol_dir" (relative to
+    config.json). Only the index is read up front:
+
+        {"protocols": [{"name": "COPUS", "file": "copus.json",
+                        "description": "...", "timer_method": "interval"}]}
+
+    Each protocol file is read, validated and cached the first time it is
+    requested, so startup cost does not grow with the number of protocols.
+    """
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self.index_path = os.path.join(self.directory, self.INDEX_FILE)
+        self.entries: Tuple[Dict[str, Any], ...] = self._load_index()
+        self.names: Tuple[str, ...] = tuple(entry["name"] for entry in self.entries)
+        self._entries_by_name = {entry["name"]: entry for entry in self.entries}
+        self._protocols: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_config(cls, data: Mapping[str, Any], config_path: str) -> Optional["ProtocolRegistry"]:
+        """Build the registry a configuration points to, None if it has no protocol_dir"""
+        protocol_dir = data.get("protocol_dir")
+        if not protocol_dir:
+            return None
+        return cls(os.path.join(os.path.dirname(config_path), protocol_dir))
+
+    def get_entry(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the index entry (name, file and optional summary fields) of a protocol"""
+        return self._entries_by_name.get(name)
+
+    def load(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load a protocol body on first access; None if it is unknown or invalid"""
+        if name not in self._protocols:
+            with self._lock:
+                if name not in self._protocols:
+                    self._protocols[name] = self._read_protocol(name)
+        return self._protocols[name]
+
+    def index_stamp(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of index.json, None if it does not exist"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_index(self) -> Tuple[Dict[str, Any], ...]:
+        """Read and validate index.json; an unreadable index gives an empty registry"""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            errors = validate_registry_index(data)
+            if errors:
+                raise ValueError("invalid protocol index:\n  " + "\n  ".join(errors))
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError is a ValueError
+            print(f"Failed to load protocol index {self.index_path}: {e}")
+            return ()
+        return tuple(data["protocols"])
+
+    def _read_protocol(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read and validate one protocol file"""
+        entry = self._entries_by_name.get(name)
+        if entry is None:
+            return None
+
+        path = os.path.join(self.directory, entry["file"])
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                protocol = json.load(f)
+            errors = validate_protocol(protocol)
+            if errors:
+                raise ValueError("invalid protocol:\n  " + "\n  ".join(errors))
+        except (OSError, ValueError) as e:
+            print(f"Failed to load protocol {name!r} from {path}: {e}")
+            return None
+
+        # The index decides the name the protocol is listed and selected under
+        protocol["name"] = name
+        return protocol
@@ -0,0 +1,340 @@
+"""Schema validation for config.json protocol files.
+
+The schema is compiled into a jsonschema validator once per process and
+reused for every load, hot-reload and settings check. It can also be run as a
+quick check before deploying a protocol file:
+
+    python -m backend.config.protocol_schema config.json [more.json ...]
+
+Protocols kept in a protocol directory (see protocol_registry.py) are checked
+along with the config.json that points to them.
+"""
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+# A single button (action or engagement level)
+BUTTON_SCHEMA = {
+    "type": "object",
+    "required": ["label"],
+    "properties": {
+        "label": {"type": "string", "minLength": 1},
+        "name": {"type": "string"},
+        "text": {"type": "string"},
+        "image": {"type": "string"},
+        "value": {"type": "number"}
+    }
+}
+
+# One observation protocol
+PROTOCOL_SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "description": {"type": "string"},
+        "instructions": {"type": "string"},
+        "timer_method": {"enum": ["interval", "timepoint"]},
+        "timer_interval": {"type": "integer", "minimum": 0},
+        "student_actions": {"type": "array", "items": {"$ref": "#/definitions/button"}},
+        "instructor_actions": {"type": "array", "items": {"$ref": "#/definitions/button"}},
+        "engagement_images": {"type": "array", "items": {"$ref": "#/definitions/button"}}
+    }
+}
+
+# The whole config.json file
+CONFIG_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "colors": {
+            "type": "object",
+            "additionalProperties": {"type": "string"}
+        },
+        "protocol_dir": {"type": "string", "minLength": 1},
+        "observation_configs": {
+            "type": "array",
+            "items": {"$ref": "#/definitions/protocol"}
+        }
+    },
+    "definitions": {
+        "button": BUTTON_SCHEMA,
+        "protocol": PROTOCOL_SCHEMA
+    }
+}
+
+# A protocol stored in its own file
+PROTOCOL_FILE_SCHEMA = {
+    **PROTOCOL_SCHEMA,
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "definitions": {"button": BUTTON_SCHEMA}
+}
+
+# The index.json of a protocol directory
+REGISTRY_INDEX_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["protocols"],
+    "properties": {
+        "protocols": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "file"],
+                "properties": {
+                    "name": {"type": "string", "minLength": 1},
+                    "file": {"type": "string", "minLength": 1},
+                    "description": {"type": "string"},
+                    "timer_method": {"enum": ["interval", "timepoint"]}
+                }
+            }
+        }
+    }
+}
+
+SCHEMAS = {
+    "config": CONFIG_SCHEMA,
+    "protocol": PROTOCOL_FILE_SCHEMA,
+    "registry_index": REGISTRY_INDEX_SCHEMA
+}
+
+# Protocol sections whose button labels must be unique (they identify recorded codes)
+BUTTON_SECTIONS = ("student_actions", "instructor_actions", "engagement_images")
+
+
+@lru_cache(maxsize=None)
+def _validator_class():
+    """Import jsonschema on first use; None if it is not installed"""
+    try:
+        from jsonschema import Draft7Validator
+    except ImportError as e:
+        print(f"Schema validation unavailable, using basic checks: {e}")
+        return None
+    return Draft7Validator
+
+
+@lru_cache(maxsize=None)
+def get_validator(kind: str = "config"):
+    """Compile a schema once; None if jsonschema is not installed"""
+    validator_class = _validator_class()
+    if validator_class is None:
+        return None
+    schema = SCHEMAS[kind]
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def format_path(path: Iterable[Any]) -> str:
+    """Format a JSON path as e.g. observation_configs[0].student_actions[2].label"""
+    text = ""
+    for part in path:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        else:
+            text += f".{part}" if text else str(part)
+    return text or "(root)"
+
+
+def validate_config(data: Any) -> List[str]:
+    """Validate parsed configuration data; return a list of "path: problem" messages"""
+    errors = _schema_errors("config", data)
+    if errors is None:
+        errors = _validate_structure(data)
+    # Checks the schema language cannot express; only run them on well-formed data
+    if not errors:
+        errors = _validate_unique_names(data)
+    return errors
+
+
+def validate_protocol(data: Any) -> List[str]:
+    """Validate a protocol loaded from its own file"""
+    errors = _schema_errors("protocol", data)
+    if errors is None:
+        errors = _validate_protocol_structure(data, "")
+    if not errors:
+        errors = _validate_unique_labels(data, "")
+    return errors
+
+
+def validate_registry_index(data: Any) -> List[str]:
+    """Validate the index.json of a protocol directory"""
+    errors = _schema_errors("registry_index", data)
+    if errors is None:
+        errors = _validate_index_structure(data)
+    if not errors:
+        errors = _validate_unique_entries(data.get("protocols", []), "protocols")
+    return errors
+
+
+def _schema_errors(kind: str, data: Any) -> Optional[List[str]]:
+    """Run the compiled schema; None if jsonschema is not installed"""
+    validator = get_validator(kind)
+    if validator is None:
+        return None
+    return [
+        f"{format_path(error.absolute_path)}: {error.message}"
+        for error in sorted(validator.iter_errors(data), key=lambda error: format_path(error.absolute_path))
+    ]
+
+
+def is_valid_config(data: Any) -> bool:
+    """Check if parsed configuration data is valid"""
+    return not validate_config(data)
+
+
+def _validate_structure(data: Any) -> List[str]:
+    """Basic structural checks used when jsonschema is not installed"""
+    if not isinstance(data, dict):
+        return ["(root): configuration must be a JSON object"]
+
+    errors = []
+    if not isinstance(data.get("colors", {}), dict):
+        errors.append("colors: must be an object")
+    if not isinstance(data.get("protocol_dir", ""), str):
+        errors.append("protocol_dir: must be a string")
+
+    observation_configs = data.get("observation_configs", [])
+    if not isinstance(observation_configs, list):
+        return errors + ["observation_configs: must be a list"]
+
+    for i, config in enumerate(observation_configs):
+        errors.extend(_validate_protocol_structure(config, f"observation_configs[{i}]"))
+    return errors
+
+
+def _validate_protocol_structure(config: Any, path: str) -> List[str]:
+    """Basic structural checks of one protocol"""
+    if not isinstance(config, dict) or not isinstance(config.get("name"), str):
+        return [f"{path or '(root)'}: must be an object with a name"]
+
+    errors = []
+    prefix = f"{path}." if path else ""
+    for section in BUTTON_SECTIONS:
+        buttons = config.get(section, [])
+        if not isinstance(buttons, list):
+            errors.append(f"{prefix}{section}: must be a list")
+            continue
+        for j, button in enumerate(buttons):
+            if not isinstance(button, dict) or not isinstance(button.get("label"), str):
+                errors.append(f"{prefix}{section}[{j}]: must be an object with a label")
+    return errors
+
+
+def _validate_index_structure(data: Any) -> List[str]:
+    """Basic structural checks of a protocol directory index"""
+    if not isinstance(data, dict) or not isinstance(data.get("protocols"), list):
+        return ["(root): must be an object with a protocols list"]
+    errors = []
+    for i, entry in enumerate(data["protocols"]):
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str) \
+                or not isinstance(entry.get("file"), str):
+            errors.append(f"protocols[{i}]: must be an object with a name and a file")
+    return errors
+
+
+def _validate_unique_names(data: Any) -> List[str]:
+    """Protocol names and button labels within a section must be unique"""
+    observation_configs = data.get("observation_configs", [])
+    errors = _validate_unique_entries(observation_configs, "observation_configs")
+    for i, config in enumerate(observation_configs):
+        errors.extend(_validate_unique_labels(config, f"observation_configs[{i}]"))
+    return errors
+
+
+def _validate_unique_entries(entries: List[Dict[str, Any]], path: str) -> List[str]:
+    """Names in a list of protocols (or index entries) must be unique"""
+    errors = []
+    seen_names = {}
+    for i, entry in enumerate(entries):
+        name = entry["name"]
+        if name in seen_names:
+            errors.append(f"{path}[{i}].name: duplicate protocol name {name!r} "
+                          f"(also {path}[{seen_names[name]}])")
+        seen_names.setdefault(name, i)
+    return errors
+
+
+def _validate_unique_labels(config: Dict[str, Any], path: str) -> List[str]:
+    """Button labels identify recorded codes, so they must be unique within a section"""
+    errors = []
+    prefix = f"{path}." if path else ""
+    for section in BUTTON_SECTIONS:
+        seen_labels = set()
+        for j, button in enumerate(config.get(section, [])):
+            label = button["label"]
+            if label in seen_labels:
+                errors.append(f"{prefix}{section}[{j}].label: duplicate label {label!r}")
+            seen_labels.add(label)
+    return errors
+
+
+def detect_kind(data: Any) -> str:
+    """Guess which kind of file parsed data came from (config, protocol or registry_index)"""
+    if isinstance(data, dict):
+        if "protocols" in data:
+            return "registry_index"
+        if "name" in data and "observation_configs" not in data:
+            return "protocol"
+    return "config"
+
+
+def check_file(path: str) -> List[str]:
+    """Validate one file, following a config's protocol_dir; returns "file: path: problem" messages"""
+    validators = {
+        "config": validate_config,
+        "protocol": validate_protocol,
+        "registry_index": validate_registry_index
+    }
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError is a ValueError
+        return [f"{path}: {e}"]
+
+    kind = detect_kind(data)
+    errors = [f"{path}: {error}" for error in validators[kind](data)]
+
+    # A config that points to a protocol directory is only valid if the directory is
+    if kind == "config" and not errors and data.get("protocol_dir"):
+        directory = os.path.join(os.path.dirname(os.path.abspath(path)), data["protocol_dir"])
+        index_path = os.path.join(directory, "index.json")
+        index_errors = check_file(index_path)
+        errors.extend(index_errors)
+        if not index_errors:
+            with open(index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)["protocols"]
+            for entry in entries:
+                errors.extend(check_file(os.path.join(directory, entry["file"])))
+    return errors
+
+
+def check_files(paths: List[str]) -> int:
+    """Validate configuration files and print the results; returns the number of invalid files"""
+    invalid = 0
+    for path in paths:
+        start = time.perf_counter()
+        errors = check_file(path)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if errors:
+            invalid += 1
+            print(f"{path}: INVALID ({len(errors)} problem(s), {elapsed_ms:.1f} ms)")
+            for error in errors:
+                print(f"  {error}")
+        else:
+            print(f"{path}: OK ({elapsed_ms:.1f} ms)")
+    return invalid
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; exit status 1 if any file is invalid"""
+    paths = list(sys.argv[1:] if argv is None else argv) or ["config.json"]
+    return 1 if check_files(paths) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
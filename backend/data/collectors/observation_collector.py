@@ -1,12 +1,19 @@
 import time
-from typing import List, Tuple, Any, Dict
+from typing import List, Tuple, Any, Dict, Iterable, Iterator, Optional
+from core.logging_utils import get_logger
+from ...config.protocol_index import ProtocolIndex
+from ..storage.reflect_format import write_reflect
+
+logger = get_logger(__name__)
 
 
 class ObservationCollector:
     """Pure data collection service for observations"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], protocol_index: Optional[ProtocolIndex] = None):
         self.config = config
+        # Shared compiled protocol (code ids -> category, label, value)
+        self.protocol_index = protocol_index or ProtocolIndex(config)
         self.responses = []
         self.start_time = None
     
@@ -24,12 +31,41 @@ class ObservationCollector:
         current_time = time.time() - self.start_time
 
         self.responses.append((current_time, category, response, value))
-        print(f"Recorded {category}: {response} (value: {value}) at {current_time:.3f}s")
+        logger.debug("Recorded %s: %s (value: %s) at %.3fs", category, response, value, current_time)
+    
+    def record_codes(self, code_ids: Iterable[int]) -> None:
+        """Record one response per protocol code id, all at the same timestamp"""
+        if not self.start_time:
+            return
+        
+        current_time = time.time() - self.start_time
+        self.responses.extend(
+            (current_time, category, label, value)
+            for category, label, value in self.protocol_index.rows_for(code_ids)
+        )
     
     def get_responses(self) -> List[Tuple]:
         """Get all recorded responses"""
         return self.responses.copy()
     
+    def iter_responses(self) -> Iterator[Tuple]:
+        """Iterate over recorded responses without copying them (e.g. for streaming exports)"""
+        return iter(self.responses)
+    
+    def has_responses(self) -> bool:
+        """Check if any responses were recorded"""
+        return bool(self.responses)
+    
+    def export_session(self, filepath: str, metadata: Dict[str, Any]) -> bool:
+        """Save the recorded responses as a .reflect session file (codes follow the protocol index)"""
+        try:
+            duration = self.get_elapsed_time() if self.start_time else None
+            write_reflect(filepath, self.responses, metadata, self.start_time, duration, self.protocol_index)
+            return True
+        except Exception as e:
+            print(f"Failed to save session: {e}")
+            return False
+    
     def get_elapsed_time(self) -> float:
         """Get elapsed time since observation started"""
         if self.start_time:
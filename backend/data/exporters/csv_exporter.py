@@ -1,42 +1,117 @@
 import csv
+import io
 import time
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Iterable, Iterator, TextIO
+from core.instrumentation import traced
+from .. import file_formats
+from ..file_formats import open_text_output
+from ..storage.reflect_format import write_reflect
+
+# Column header of the data section
+CSV_COLUMNS = ["time_s", "category", "response", "value"]
 
 
 class CSVExporter:
-    """Pure CSV export service for observation data"""
-    
-    def export_observations(self, responses: List[Tuple], filepath: str, metadata: Dict[str, Any]) -> bool:
-        """Export observations to CSV file with metadata"""
+    """Pure CSV export service for observation data
+
+    Output is produced incrementally: write_observations() writes to any text
+    sink (an open file, a StringIO, ...) and iter_csv_chunks() yields encoded
+    chunks for downloads, so exporting never builds the whole file in memory.
+    """
+
+    # Rows written between chunks yielded by iter_csv_chunks
+    CHUNK_ROWS = 1000
+
+    @traced
+    def export_observations(self, responses: Iterable[Tuple], filepath: str, metadata: Dict[str, Any]) -> bool:
+        """Export observations to CSV file with metadata (.csv.gz / .csv.zst are compressed)"""
         try:
-            with open(filepath, "w", newline="", encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Add metadata as comment lines
-                for key, value in metadata.items():
-                    writer.writerow([f"# {key}: {value}"])
-                
-                # Add empty line separator
-                writer.writerow([])
-                
-                # Data header and rows
-                writer.writerow(["time_s", "category", "response", "value"])
-                writer.writerows(responses)
-            
+            # .reflect paths get the binary session format instead
+            if file_formats.format_from_path(filepath) == file_formats.REFLECT:
+                write_reflect(filepath, responses, metadata)
+                return True
+
+            with open_text_output(filepath) as f:
+                self.write_observations(responses, f, metadata)
+
             return True
-            
+
         except Exception as e:
             print(f"Failed to export CSV: {e}")
             return False
-    
+
+    @traced
+    def write_observations(self, responses: Iterable[Tuple], sink: TextIO, metadata: Dict[str, Any]) -> int:
+        """Write metadata and observations to a text sink row by row; returns the row count"""
+        writer = csv.writer(sink)
+        self._write_header(writer, sink, metadata)
+
+        count = 0
+        for row in responses:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def iter_csv_chunks(self, responses: Iterable[Tuple], metadata: Dict[str, Any],
+                        chunk_rows: int = CHUNK_ROWS, encoding: str = 'utf-8') -> Iterator[bytes]:
+        """Yield the CSV export as encoded chunks (for chunked downloads)"""
+        # One small buffer is reused, so memory does not grow with the number of rows
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        self._write_header(writer, buffer, metadata)
+
+        pending = 0
+        for row in responses:
+            writer.writerow(row)
+            pending += 1
+            if pending >= chunk_rows:
+                yield self._drain(buffer, encoding)
+                pending = 0
+
+        if buffer.tell():
+            yield self._drain(buffer, encoding)
+
+    @traced
+    def export_to_bytes(self, responses: Iterable[Tuple], metadata: Dict[str, Any]) -> bytes:
+        """Export observations to an in-memory CSV file"""
+        return b"".join(self.iter_csv_chunks(responses, metadata))
+
     def create_metadata(self, config: Dict[str, Any], start_time: float, duration: float) -> Dict[str, str]:
         """Create metadata dictionary for CSV export"""
         protocol_name = config.get('name', 'Unknown')
         start_datetime = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
-        
-        return {
-            f"Protocol: {protocol_name}": "",
-            f"Observation Started: {start_datetime}": "",
-            f"Total Duration: {duration:.1f} seconds": "",
-            "Generated by: REFLECT v1.0": ""
+
+        metadata = {
+            "Protocol": protocol_name,
+            "Observation Started": start_datetime,
+            "Total Duration": f"{duration:.1f} seconds",
         }
+        # The timer settings make the file self-describing (e.g. for the code index of a session archive)
+        if config.get('timer_method'):
+            metadata["Timer Method"] = config['timer_method']
+        if config.get('timer_method') == "interval" and config.get('timer_interval'):
+            metadata["Timer Interval"] = f"{config['timer_interval']} seconds"
+        metadata["Generated by"] = "REFLECT v1.0"
+        return metadata
+
+    def _write_header(self, writer, sink: TextIO, metadata: Dict[str, Any]) -> None:
+        """Write metadata comment lines, a separator and the column header"""
+        terminator = writer.dialect.lineterminator
+        for key, value in metadata.items():
+            # Written raw (not as a CSV field) so values with commas stay readable
+            line = f"# {key}: {value}" if value != "" else f"# {key}"
+            sink.write(" ".join(line.splitlines()) + terminator)
+
+        # Add empty line separator
+        writer.writerow([])
+
+        # Data header
+        writer.writerow(CSV_COLUMNS)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO, encoding: str) -> bytes:
+        """Take the buffered text as bytes and empty the buffer"""
+        chunk = buffer.getvalue().encode(encoding)
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
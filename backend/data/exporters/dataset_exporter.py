@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+from .parquet_exporter import ParquetExporter
+from ..file_formats import file_digest, has_known_suffix
+
+# Partition value used when a session has no protocol or start time (Hive convention)
+UNKNOWN_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+class DatasetExporter:
+    """Export an archive of observation sessions as a hive-partitioned Parquet dataset
+
+    Sessions are written one file each under
+
+        <root>/protocol=<name>/year=<YYYY>/month=<MM>/<session id>.parquet
+
+    using the ParquetExporter columns plus a session_id column, so tools such
+    as pyarrow.dataset, DuckDB or Spark can prune partitions instead of
+    scanning every CSV. A session id is the SHA-256 of the source file
+    contents; _manifest.json records every exported session, which makes
+    repeated exports of a growing archive append only the new sessions.
+    """
+    MANIFEST_FILE = "_manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, root: str, data_processor=None):
+        self.root = os.path.abspath(root)
+        if data_processor is None:
+            # Imported here so writing a dataset from DataFrames does not need the processor
+            from ..processors.data_processor import DataProcessor
+            data_processor = DataProcessor()
+        self.data_processor = data_processor
+        self.parquet_exporter = ParquetExporter()
+        self.manifest_path = os.path.join(self.root, self.MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+
+    def has_session(self, session_id: str) -> bool:
+        """Check if a session is already part of the dataset"""
+        return session_id in self.manifest["sessions"]
+
+    def export_files(self, file_paths: Iterable[str]) -> Tuple[int, List[str]]:
+        """Add observation files to the dataset; returns (sessions added, error messages)"""
+        added, errors = 0, []
+        try:
+            for file_path in file_paths:
+                try:
+                    if self._export_file(file_path):
+                        added += 1
+                except Exception as e:
+                    errors.append(f"{file_path}: {e}")
+        finally:
+            # The manifest is saved once per batch, also when a batch is interrupted
+            if added:
+                self._save_manifest()
+        return added, errors
+
+    def export_directory(self, directory: str) -> Tuple[int, List[str]]:
+        """Add every observation file below a directory to the dataset"""
+        file_paths = []
+        for dirpath, dirnames, filenames in os.walk(directory):
+            # Never read the dataset back into itself
+            dirnames[:] = sorted(
+                name for name in dirnames
+                if os.path.abspath(os.path.join(dirpath, name)) != self.root
+            )
+            file_paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if has_known_suffix(name))
+        return self.export_files(file_paths)
+
+    def add_session(self, df, session_id: str, source: str = "") -> bool:
+        """Write one loaded session (a DataProcessor DataFrame) unless it is already exported"""
+        if self.has_session(session_id):
+            return False
+
+        header_info = dict(df.attrs.get('header_info', {}))
+        protocol, year, month = self.partition_values(header_info)
+        partition = "/".join([
+            f"protocol={quote(protocol, safe='')}",
+            f"year={year}",
+            f"month={month}",
+        ])
+        relative_path = f"{partition}/{session_id}.parquet"
+        self._write_session(df, session_id, header_info, relative_path)
+
+        self.manifest["sessions"][session_id] = {
+            "path": relative_path,
+            "protocol": protocol,
+            "started": header_info.get("Observation Started", ""),
+            "rows": int(len(df)),
+            "source": source,
+            "exported": time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        summary = self.manifest["partitions"].setdefault(partition, {"sessions": 0, "rows": 0})
+        summary["sessions"] += 1
+        summary["rows"] += int(len(df))
+        return True
+
+    def save(self) -> None:
+        """Write the manifest (needed after add_session, export_* save it themselves)"""
+        self._save_manifest()
+
+    @staticmethod
+    def partition_values(header_info: Dict[str, str]) -> Tuple[str, str, str]:
+        """Get the (protocol, year, month) partition of a session from its header"""
+        protocol = header_info.get("Protocol") or UNKNOWN_PARTITION
+        started = header_info.get("Observation Started", "")
+        try:
+            start = time.strptime(started, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return protocol, UNKNOWN_PARTITION, UNKNOWN_PARTITION
+        return protocol, f"{start.tm_year:04d}", f"{start.tm_mon:02d}"
+
+    def _export_file(self, file_path: str) -> bool:
+        """Load and write one file; False if it was exported before"""
+        session_id = file_digest(file_path)
+        # Checked before parsing, so unchanged files cost one read of their bytes
+        if self.has_session(session_id):
+            return False
+
+        result = self.data_processor.load_and_validate_data(file_path)
+        if not result.success:
+            raise ValueError(result.error)
+        return self.add_session(result.data, session_id, os.path.basename(file_path))
+
+    def _write_session(self, df, session_id: str, header_info: Dict[str, str], relative_path: str) -> None:
+        """Write a session file; written under a temporary name so readers never see partial files"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self.parquet_exporter.build_schema(header_info)
+        rows = df[["time_s", "category", "response", "value"]].itertuples(index=False, name=None)
+        table = self.parquet_exporter.build_table(list(rows), schema)
+        session_ids = pa.array([session_id] * table.num_rows, type=pa.string()).dictionary_encode()
+        table = table.append_column(pa.field("session_id", session_ids.type), session_ids)
+
+        path = os.path.join(self.root, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        pq.write_table(table, temp_path, compression="zstd")
+        os.replace(temp_path, path)
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Read the manifest of an existing dataset (an empty one for a new dataset)"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == self.MANIFEST_VERSION:
+                return manifest
+            print(f"Unsupported dataset manifest version in {self.manifest_path}, starting a new manifest")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Failed to read dataset manifest {self.manifest_path}: {e}")
+        return {"version": self.MANIFEST_VERSION, "sessions": {}, "partitions": {}}
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically"""
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: export observation files or directories to a dataset"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 2:
+        print("usage: python -m backend.data.exporters.dataset_exporter DATASET_DIR FILE_OR_DIR...")
+        return 2
+
+    exporter = DatasetExporter(args[0])
+    added, errors = 0, []
+    for source in args[1:]:
+        if os.path.isdir(source):
+            result = exporter.export_directory(source)
+        else:
+            result = exporter.export_files([source])
+        added += result[0]
+        errors.extend(result[1])
+
+    for error in errors:
+        print(f"Skipped {error}")
+    print(f"Added {added} session(s); dataset has {len(exporter.manifest['sessions'])} session(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from typing import Any, Dict, Iterable, List, Tuple
+from ..file_formats import split_value
+
+# Keys of the file-level metadata written next to the session header
+FORMAT_KEY = "reflect.format"
+FORMAT_VERSION = "observations/1"
+
+
+class ParquetExporter:
+    """Export observation data as typed, dictionary-encoded Parquet
+
+    Columns: time_s (float64), category and response (dictionary-encoded
+    strings), value (float64, null for free text) and value_text (free text
+    such as comments, or a number's text when it is not written exactly as
+    the number, e.g. "1e3"). The session header (protocol, start time, ...) is
+    stored as file-level key/value metadata instead of comment lines.
+    Rows are written in row groups, so memory does not grow with the session.
+    """
+
+    # Rows per row group
+    BATCH_ROWS = 65536
+
+    def export_observations(self, responses: Iterable[Tuple], filepath: str, metadata: Dict[str, Any]) -> bool:
+        """Export observations to a Parquet file with metadata"""
+        try:
+            import pyarrow.parquet as pq
+
+            schema = self.build_schema(metadata)
+            with pq.ParquetWriter(filepath, schema, compression="zstd", use_dictionary=True) as writer:
+                batch = []
+                for row in responses:
+                    batch.append(row)
+                    if len(batch) >= self.BATCH_ROWS:
+                        writer.write_table(self.build_table(batch, schema))
+                        batch = []
+                if batch:
+                    writer.write_table(self.build_table(batch, schema))
+
+            return True
+
+        except Exception as e:
+            print(f"Failed to export Parquet: {e}")
+            return False
+
+    def build_schema(self, metadata: Dict[str, Any]):
+        """Arrow schema of an observation file carrying the session header"""
+        import pyarrow as pa
+
+        file_metadata = {FORMAT_KEY: FORMAT_VERSION}
+        file_metadata.update({str(key): str(value) for key, value in metadata.items()})
+        return pa.schema([
+            ("time_s", pa.float64()),
+            ("category", pa.dictionary(pa.int32(), pa.string())),
+            ("response", pa.dictionary(pa.int32(), pa.string())),
+            ("value", pa.float64()),
+            ("value_text", pa.string()),
+        ], metadata=file_metadata)
+
+    def build_table(self, rows: List[Tuple], schema):
+        """Convert a batch of (time_s, category, response, value) rows to an Arrow table"""
+        import pyarrow as pa
+
+        times, categories, responses, values, texts = [], [], [], [], []
+        for time_s, category, response, value in rows:
+            times.append(time_s)
+            categories.append(category)
+            responses.append(response)
+            number, text = self.split_value(value, category)
+            values.append(number)
+            texts.append(text)
+
+        return pa.Table.from_arrays([
+            pa.array(times, type=pa.float64()),
+            pa.array(categories, type=pa.string()).dictionary_encode(),
+            pa.array(responses, type=pa.string()).dictionary_encode(),
+            pa.array(values, type=pa.float64()),
+            pa.array(texts, type=pa.string()),
+        ], schema=schema)
+
+    # Numbers go to the typed value column, free text to value_text
+    split_value = staticmethod(split_value)
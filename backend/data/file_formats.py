@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import io
+import math
+import numbers
+import re
+from typing import Any, Optional, TextIO, Tuple
+
+# Observation file formats, by file name suffix
+CSV = "csv"
+CSV_GZIP = "csv.gz"
+CSV_ZSTD = "csv.zst"
+PARQUET = "parquet"
+REFLECT = "reflect"
+
+FORMAT_SUFFIXES = (
+    (".csv.gz", CSV_GZIP),
+    (".csv.zst", CSV_ZSTD),
+    (".parquet", PARQUET),
+    (".reflect", REFLECT),
+    (".csv", CSV),
+)
+
+# Categories holding free-text comments (as matched by the analysis pages)
+COMMENT_CATEGORY = re.compile(r"comment|note", re.IGNORECASE)
+
+# Leading bytes of compressed and columnar files
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", CSV_GZIP),
+    (b"\x28\xb5\x2f\xfd", CSV_ZSTD),
+    (b"PAR1", PARQUET),
+    (b"REFLECT\x00", REFLECT),
+)
+
+# File dialog filters (Qt syntax)
+OPEN_FILE_FILTER = "Observation Files (*.csv *.csv.gz *.csv.zst *.parquet *.reflect);;All Files (*)"
+SAVE_FILE_FILTERS = {
+    CSV: "CSV Files (*.csv)",
+    CSV_GZIP: "Compressed CSV (*.csv.gz)",
+    CSV_ZSTD: "Zstandard Compressed CSV (*.csv.zst)",
+    PARQUET: "Parquet Files (*.parquet)",
+    REFLECT: "REFLECT Session Files (*.reflect)",
+}
+
+
+def format_from_path(path: str) -> str:
+    """Get the observation file format from a file name (plain CSV if unknown)"""
+    lower = path.lower()
+    for suffix, file_format in FORMAT_SUFFIXES:
+        if lower.endswith(suffix):
+            return file_format
+    return CSV
+
+
+def has_known_suffix(path: str) -> bool:
+    """Check if a file name ends with one of the observation file suffixes"""
+    return path.lower().endswith(tuple(suffix for suffix, _ in FORMAT_SUFFIXES))
+
+
+def strip_suffix(name: str) -> str:
+    """File name without its observation file suffix (e.g. "session.csv.gz" -> "session")"""
+    lower = name.lower()
+    for suffix, _ in FORMAT_SUFFIXES:
+        if lower.endswith(suffix):
+            return name[:-len(suffix)]
+    # Unknown suffix: drop the last extension only
+    return name.rsplit('.', 1)[0] if '.' in name else name
+
+
+def format_from_bytes(data: bytes) -> str:
+    """Get the observation file format from file contents (plain CSV if unknown)"""
+    for magic, file_format in MAGIC_NUMBERS:
+        if data.startswith(magic):
+            return file_format
+    return CSV
+
+
+def open_text_output(path: str) -> TextIO:
+    """Open a CSV file for writing, compressed according to its suffix"""
+    file_format = format_from_path(path)
+    if file_format == CSV_GZIP:
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    if file_format == CSV_ZSTD:
+        import pyarrow as pa
+        return io.TextIOWrapper(pa.output_stream(path, compression="zstd"), encoding="utf-8", newline="")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def open_text_input(path: str) -> TextIO:
+    """Open a CSV file for reading, decompressing according to its suffix"""
+    file_format = format_from_path(path)
+    if file_format == CSV_GZIP:
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    if file_format == CSV_ZSTD:
+        import pyarrow as pa
+        return io.TextIOWrapper(pa.input_stream(path, compression="zstd"), encoding="utf-8", newline="")
+    return open(path, "r", newline="", encoding="utf-8")
+
+
+def text_input_from_bytes(data: bytes) -> TextIO:
+    """Wrap CSV file contents (plain or compressed) in a text stream"""
+    file_format = format_from_bytes(data)
+    if file_format == CSV_GZIP:
+        return gzip.open(io.BytesIO(data), "rt", newline="", encoding="utf-8")
+    if file_format == CSV_ZSTD:
+        import pyarrow as pa
+        stream = pa.input_stream(pa.py_buffer(data), compression="zstd")
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", newline="")
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks (identifies a session across imports)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def split_value(value: Any, category: str = "") -> Tuple[Optional[float], Optional[str]]:
+    """Split a recorded value into (number, free text) for formats with a typed value column
+
+    Comment values are always text. Other strings that hold a number (values
+    read back from CSV files with comments, e.g. "2") also keep their text
+    unless the number writes back as exactly the same string, so readers,
+    which prefer the text, show the value as it was recorded.
+    """
+    if isinstance(value, numbers.Number) and not isinstance(value, bool):
+        # Missing values read from CSV arrive as NaN
+        return (None, None) if value != value else (value, None)
+    if value is None:
+        return None, None
+    text = str(value)
+    if COMMENT_CATEGORY.search(str(category)):
+        return None, text
+    try:
+        number = float(text)
+    except ValueError:
+        return None, text
+    if not math.isfinite(number):
+        # "nan" or "inf" is text, not a measurement
+        return None, text
+    exact = str(int(number)) if number.is_integer() else repr(number)
+    return number, (None if text == exact else text)
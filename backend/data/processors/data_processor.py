@@ -1,6 +1,11 @@
+import csv
+import io
 import pandas as pd
-import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, TextIO
+from core.instrumentation import traced
+from ...config.config_manager import ConfigManager
+from .. import file_formats
+from ..storage.reflect_format import ReflectFile
 
 
 class DataLoadResult:
@@ -16,46 +21,25 @@ class DataProcessor:
     
     def __init__(self, config_manager=None):
         self._config_ordering = None
-        self.config_manager = config_manager
+        # Without an injected manager, use the shared default configuration
+        self.config_manager = config_manager or ConfigManager()
         self._load_config_ordering()
+        # Rebuild the ordering when protocols are hot-reloaded
+        self.config_manager.subscribe(self._on_config_reloaded, weak=True)
     
-    def _load_config_ordering(self):
+    def _on_config_reloaded(self, snapshot):
+        """Invalidate the ordering built from the previous configuration"""
+        self._load_config_ordering(snapshot)
+    
+    def _load_config_ordering(self, snapshot=None):
         """Load category and response ordering from config.json"""
         try:
-            if self.config_manager:
-                config = self.config_manager.load_config()
-            else:
-                # Fallback to direct file loading
-                with open("config.json", "r") as f:
-                    config = json.load(f)
-            
-            # Get category order from colors section
-            category_order = list(config.get("colors", {}).keys())
-            
-            # Get response orderings for each category from observation configs
-            response_orderings = {}
-            for obs_config in config.get("observation_configs", []):
-                # Student actions
-                student_actions = [action["label"] for action in obs_config.get("student_actions", [])]
-                if student_actions:
-                    response_orderings["student"] = student_actions
-                
-                # Instructor actions  
-                instructor_actions = [action["label"] for action in obs_config.get("instructor_actions", [])]
-                if instructor_actions:
-                    response_orderings["instructor"] = instructor_actions
-                
-                # Engagement levels
-                engagement_levels = [level["label"] for level in obs_config.get("engagement_images", [])]
-                if engagement_levels:
-                    response_orderings["engagement"] = engagement_levels
-            
-            self._config_ordering = {
-                'categories': category_order,
-                'responses': response_orderings
-            }
-            
-        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            snapshot = snapshot or self.config_manager.get_snapshot()
+            # The ordering only depends on the configuration, so it is built once per snapshot
+            self._config_ordering = snapshot.derived(
+                "data_processor.ordering", self._build_config_ordering
+            )
+        except (KeyError, TypeError):
             # Fallback ordering if config can't be loaded
             self._config_ordering = {
                 'categories': ['student', 'instructor', 'comments', 'engagement'],
@@ -64,51 +48,171 @@ class DataProcessor:
                 }
             }
     
-    def load_and_validate_data(self, file_path: str) -> DataLoadResult:
-        """Load CSV data and validate format"""
-        try:
-            # Read the file and skip comment lines (lines starting with #)
-            with open(file_path, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-            
-            # Extract header information from comment lines
-            header_info = {}
-            data_start_line = 0
-            for i, line in enumerate(lines):
-                if line.strip().startswith('#'):
-                    # Parse header information
-                    line_content = line.strip()[1:].strip()  # Remove # and whitespace
-                    if ':' in line_content:
-                        key, value = line_content.split(':', 1)
-                        header_info[key.strip()] = value.strip()
-                else:
-                    data_start_line = i
-                    break
-            
-            # Read CSV starting from the data header line
-            df = pd.read_csv(file_path, skiprows=data_start_line)
-            
-            # Validate required columns
-            required_columns = ["time_s", "category", "response", "value"]
-            if not all(col in df.columns for col in required_columns):
-                return DataLoadResult(
-                    False, 
-                    None, 
-                    f"Invalid CSV format - requires {', '.join(required_columns)} columns"
-                )
-            
-            # Apply config-based ordering
-            df = self._apply_config_ordering(df)
-            
-            # Store header information in the dataframe as metadata
-            df.attrs['header_info'] = header_info
+    @staticmethod
+    def _build_config_ordering(snapshot) -> Dict[str, Any]:
+        """Build category and response ordering from a configuration snapshot
+        
+        Only the inline observation_configs are read (the last one defining a
+        category wins), so protocol directory files stay unloaded until they
+        are selected. Files naming their protocol are ordered by that
+        protocol's own index in _apply_config_ordering.
+        """
+        config = snapshot.data
+        
+        # Get category order from colors section
+        category_order = list(config.get("colors", {}).keys())
+        
+        # Get response orderings for each category from observation configs
+        response_orderings = {}
+        for obs_config in config.get("observation_configs", []):
+            # Student actions
+            student_actions = [action["label"] for action in obs_config.get("student_actions", [])]
+            if student_actions:
+                response_orderings["student"] = student_actions
             
-            return DataLoadResult(True, df)
+            # Instructor actions  
+            instructor_actions = [action["label"] for action in obs_config.get("instructor_actions", [])]
+            if instructor_actions:
+                response_orderings["instructor"] = instructor_actions
             
+            # Engagement levels
+            engagement_levels = [level["label"] for level in obs_config.get("engagement_images", [])]
+            if engagement_levels:
+                response_orderings["engagement"] = engagement_levels
+        
+        return {
+            'categories': category_order,
+            'responses': response_orderings
+        }
+    
+    @traced
+    def load_and_validate_data(self, file_path: str) -> DataLoadResult:
+        """Load observation data (CSV, .csv.gz, .csv.zst, Parquet or .reflect) and validate format"""
+        try:
+            file_format = file_formats.format_from_path(file_path)
+            if file_format == file_formats.PARQUET:
+                return self._load_parquet(file_path)
+            if file_format == file_formats.REFLECT:
+                return self._load_reflect(file_path)
+            with file_formats.open_text_input(file_path) as stream:
+                return self._load_csv_stream(stream)
         except Exception as e:
             return DataLoadResult(False, None, f"Failed to load file: {e}")
     
-    def _apply_config_ordering(self, df: pd.DataFrame) -> pd.DataFrame:
+    @traced
+    def load_and_validate_bytes(self, data: bytes) -> DataLoadResult:
+        """Load observation data from memory (e.g. an upload); the format is detected from the contents"""
+        try:
+            file_format = file_formats.format_from_bytes(data)
+            if file_format == file_formats.PARQUET:
+                return self._load_parquet(io.BytesIO(data))
+            if file_format == file_formats.REFLECT:
+                return self._load_reflect(data)
+            with file_formats.text_input_from_bytes(data) as stream:
+                return self._load_csv_stream(stream)
+        except Exception as e:
+            return DataLoadResult(False, None, f"Failed to load file: {e}")
+    
+    @traced
+    def load_dataframe(self, df: pd.DataFrame, header_info: Dict[str, str]) -> DataLoadResult:
+        """Validate and order observations that come from another source (e.g. the session repository)"""
+        return self._finish_loading(df, dict(header_info))
+    
+    @traced
+    def _load_csv_stream(self, stream: TextIO) -> DataLoadResult:
+        """Parse a CSV export in a single pass: comment header, column line, then rows"""
+        # Extract header information from the leading comment lines
+        header_info = {}
+        columns_line = ""
+        for line in stream:
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                # Parse header information
+                line_content = stripped[1:].strip()  # Remove # and whitespace
+                if ':' in line_content:
+                    key, value = line_content.split(':', 1)
+                    # Older exports end metadata lines with a stray ": " separator
+                    header_info[key.strip()] = value.strip().rstrip(':').strip()
+            elif stripped:
+                columns_line = stripped
+                break
+        
+        # The rest of the stream is read directly, without re-reading the header
+        columns = next(csv.reader([columns_line])) if columns_line else []
+        try:
+            df = pd.read_csv(stream, header=None, names=columns)
+        except pd.errors.EmptyDataError:
+            # A header without rows
+            df = pd.DataFrame(columns=columns)
+        return self._finish_loading(df, header_info)
+    
+    @traced
+    def _load_parquet(self, source) -> DataLoadResult:
+        """Load a Parquet export (typed columns, header in the file metadata)"""
+        import pyarrow.parquet as pq
+        
+        table = pq.read_table(source)
+        metadata = table.schema.metadata or {}
+        header_info = {
+            key.decode('utf-8'): value.decode('utf-8') for key, value in metadata.items()
+            if not key.startswith((b'reflect.', b'ARROW:', b'pandas'))
+        }
+        
+        df = table.to_pandas()
+        # Dictionary-encoded columns arrive as categoricals; the analysis expects plain strings
+        for column in ('category', 'response'):
+            if column in df.columns:
+                df[column] = df[column].astype(object)
+        
+        if 'value_text' in df.columns:
+            df = self.merge_value_text(df)
+        
+        return self._finish_loading(df, header_info)
+    
+    @traced
+    def _load_reflect(self, source) -> DataLoadResult:
+        """Load a .reflect session file (memory-mapped when given a path)"""
+        with ReflectFile(source) as session:
+            df = session.to_dataframe()
+            header_info = dict(session.metadata)
+        
+        return self._finish_loading(self.merge_value_text(df), header_info)
+    
+    @staticmethod
+    def merge_value_text(df: pd.DataFrame) -> pd.DataFrame:
+        """Fold the separate numeric and free-text columns back into one value column"""
+        values = df['value']
+        # Whole numbers read back as int, like the CSV reader does
+        if values.notna().all() and (values % 1 == 0).all():
+            values = values.astype('int64')
+        # Free text (comments) goes back into the value column
+        texts = df.pop('value_text')
+        if texts.notna().any():
+            values = values.astype(object).where(texts.isna(), texts)
+        df['value'] = values
+        return df
+    
+    def _finish_loading(self, df: pd.DataFrame, header_info: Dict[str, str]) -> DataLoadResult:
+        """Validate columns, apply ordering and attach the header information"""
+        # Validate required columns
+        required_columns = ["time_s", "category", "response", "value"]
+        if not all(col in df.columns for col in required_columns):
+            return DataLoadResult(
+                False, 
+                None, 
+                f"Invalid CSV format - requires {', '.join(required_columns)} columns"
+            )
+        
+        # Apply config-based ordering (using the recorded protocol when it is known)
+        df = self._apply_config_ordering(df, header_info.get('Protocol'))
+        
+        # Store header information in the dataframe as metadata
+        df.attrs['header_info'] = header_info
+        
+        return DataLoadResult(True, df)
+    
+    @traced
+    def _apply_config_ordering(self, df: pd.DataFrame, protocol_name: Optional[str] = None) -> pd.DataFrame:
         """Apply ordering based on config.json"""
         if not self._config_ordering:
             return df
@@ -122,6 +226,12 @@ class DataProcessor:
         
         # Create response ordering for each category
         response_orderings = self._config_ordering['responses']
+        # Prefer the exact button order of the protocol the file was recorded with
+        index = self.config_manager.get_protocol_index_by_name(protocol_name) if protocol_name else None
+        if index is not None:
+            response_orderings = {
+                category.lower(): labels for category, labels in index.response_order.items() if labels
+            }
         df['_response_order'] = 0  # Default order
         
         for category, responses in response_orderings.items():
@@ -0,0 +1 @@
+# Session storage formats and archives
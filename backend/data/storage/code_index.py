@@ -0,0 +1,253 @@
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# A code is a (category, response) pair, e.g. ("Instructor", "Lec")
+Code = Tuple[str, str]
+
+# Posting list of one code: session id -> bitmap of the session's intervals that contain it.
+# Bitmaps are Python ints (bit i = interval i), so intersection, union and difference of
+# whole sessions are single integer operations.
+Postings = Dict[int, int]
+
+# Rows this close to an interval boundary (fraction of the interval) were recorded by
+# the interval timer; QTimer's default coarse timers may fire up to 5% late or early
+TICK_TOLERANCE = 0.05
+
+
+def bitmap_from_positions(positions: Iterable[int]) -> int:
+    """Build an interval bitmap from interval positions"""
+    bitmap = 0
+    for position in positions:
+        bitmap |= 1 << position
+    return bitmap
+
+
+def bitmap_positions(bitmap: int) -> List[int]:
+    """Interval positions set in a bitmap, in ascending order"""
+    positions = []
+    position = 0
+    while bitmap:
+        low = (bitmap & -bitmap).bit_length() - 1
+        position += low
+        positions.append(position)
+        bitmap >>= low + 1
+        position += 1
+    return positions
+
+
+def bitmap_count(bitmap: int) -> int:
+    """Number of intervals set in a bitmap"""
+    return bin(bitmap).count("1")
+
+
+def bitmap_runs(bitmap: int) -> List[Tuple[int, int]]:
+    """Runs of consecutive set intervals as (first position, length)"""
+    runs = []
+    position = 0
+    while bitmap:
+        # Skip the zeros below the run, then count its ones
+        low = (bitmap & -bitmap).bit_length() - 1
+        bitmap >>= low
+        position += low
+        length = (~bitmap & (bitmap + 1)).bit_length() - 1
+        runs.append((position, length))
+        bitmap >>= length
+        position += length
+    return runs
+
+
+def bitmap_to_bytes(bitmap: int) -> bytes:
+    """Serialize a bitmap (little endian, as short as possible)"""
+    return bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+
+
+def bitmap_from_bytes(data: bytes) -> int:
+    """Deserialize a bitmap written by bitmap_to_bytes"""
+    return int.from_bytes(data, "little")
+
+
+def times_to_bytes(times: Sequence[float]) -> bytes:
+    """Serialize interval start times as little-endian float64"""
+    values = array("d", times)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def times_from_bytes(data: bytes) -> array:
+    """Deserialize interval start times written by times_to_bytes"""
+    values = array("d")
+    values.frombytes(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def interval_number(time_s: float, interval_s: float) -> int:
+    """Interval (0-based) a row recorded at time_s belongs to.
+
+    The interval observation page records toggled codes when an interval
+    ends (t = I, 2I, ...), so a row on such a tick belongs to the interval
+    that just ended. The row recorded when the session is stopped between
+    ticks belongs to the interval in progress.
+    """
+    tick = int(round(time_s / interval_s))
+    if tick >= 1 and abs(time_s - tick * interval_s) <= TICK_TOLERANCE * interval_s:
+        return tick - 1
+    return max(int(time_s // interval_s), 0)
+
+
+def build_interval_postings(rows: Iterable[Tuple[float, str, str]],
+                            interval_s: float) -> Tuple[List[float], float, Dict[Code, int]]:
+    """Turn one session's (time_s, category, response) rows into intervals and code bitmaps.
+
+    interval_s is the session's timer interval. Interval n starts at
+    n * interval_s and holds the rows interval_number() assigns to it, so
+    intervals in which nothing was recorded are zero bits and break runs.
+    Timepoint (or unknown) sessions, interval_s <= 0, have no intervals:
+    every code gets bit 0, so they take part in session-level queries but
+    not in runs. Returns (interval start times, interval length in seconds,
+    bitmap per code).
+    """
+    bitmaps: Dict[Code, int] = {}
+    if interval_s <= 0:
+        for _, category, response in rows:
+            bitmaps[(category, response)] = 1
+        return [0.0], 0.0, bitmaps
+
+    interval_s = float(interval_s)
+    last = 0
+    for time_s, category, response in rows:
+        position = interval_number(time_s, interval_s)
+        last = max(last, position)
+        code = (category, response)
+        bitmaps[code] = bitmaps.get(code, 0) | (1 << position)
+    times = [position * interval_s for position in range(last + 1)]
+    return times, interval_s, bitmaps
+
+
+class CodeRun(NamedTuple):
+    """A run of consecutive intervals within one session"""
+    session_id: int
+    first_interval: int
+    intervals: int
+    start_s: float
+    end_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+class CodeIndex:
+    """Inverted index from codes to the sessions and intervals that contain them.
+
+    Built from the code_postings table of a SessionRepository, which is
+    filled when sessions are imported, so queries never load a DataFrame.
+    Operators combine posting lists interval by interval:
+
+        lecturing = index.postings(("Instructor", "Lec"))
+        questions = index.postings(("Student", "SQ"))
+        index.runs(index.difference(lecturing, questions), min_seconds=600)
+
+    finds stretches of 10+ minutes of lecturing without student questions.
+    """
+
+    def __init__(self, repository, protocol: Optional[str] = None):
+        self.repository = repository
+        self.protocol = protocol
+        self._postings: Dict[Code, Postings] = {}
+        self._intervals: Dict[int, Tuple[float, array]] = {}
+
+    def postings(self, code: Code) -> Postings:
+        """Posting list of a code (loaded once per index)"""
+        if code not in self._postings:
+            self._postings[code] = self.repository.code_postings(code[0], code[1], self.protocol)
+        return self._postings[code]
+
+    def sessions_with(self, code: Code) -> List[int]:
+        """Sorted ids of the sessions containing a code"""
+        return sorted(self.postings(code))
+
+    @staticmethod
+    def intersection(*posting_lists: Postings) -> Postings:
+        """Intervals containing all of the codes"""
+        if not posting_lists:
+            return {}
+        # Walk the shortest list, probing the others
+        ordered = sorted(posting_lists, key=len)
+        result = {}
+        for session_id, bitmap in ordered[0].items():
+            for other in ordered[1:]:
+                bitmap &= other.get(session_id, 0)
+                if not bitmap:
+                    break
+            if bitmap:
+                result[session_id] = bitmap
+        return result
+
+    @staticmethod
+    def union(*posting_lists: Postings) -> Postings:
+        """Intervals containing any of the codes"""
+        result: Postings = {}
+        for postings in posting_lists:
+            for session_id, bitmap in postings.items():
+                result[session_id] = result.get(session_id, 0) | bitmap
+        return result
+
+    @staticmethod
+    def difference(postings: Postings, *excluded: Postings) -> Postings:
+        """Intervals of the first posting list containing none of the excluded codes"""
+        result = {}
+        for session_id, bitmap in postings.items():
+            for other in excluded:
+                bitmap &= ~other.get(session_id, 0)
+            if bitmap:
+                result[session_id] = bitmap
+        return result
+
+    def all_of(self, *codes: Code) -> Postings:
+        """Intervals where every code was recorded"""
+        return self.intersection(*(self.postings(code) for code in codes))
+
+    def any_of(self, *codes: Code) -> Postings:
+        """Intervals where at least one of the codes was recorded"""
+        return self.union(*(self.postings(code) for code in codes))
+
+    def interval_counts(self, postings: Postings) -> Dict[int, int]:
+        """Number of matching intervals per session"""
+        return {session_id: bitmap_count(bitmap) for session_id, bitmap in postings.items()}
+
+    def runs(self, postings: Postings, min_intervals: int = 1, min_seconds: float = 0.0) -> List[CodeRun]:
+        """Runs of consecutive matching intervals, at least min_intervals long and min_seconds long.
+
+        A run lasts from its first interval's time to its last one's plus the
+        session's interval length. Timepoint sessions have no intervals and
+        are left out (see sessions_without_intervals).
+        """
+        self._load_intervals(postings)
+        result = []
+        for session_id in sorted(postings):
+            interval_s, times = self._intervals.get(session_id, (0.0, array("d")))
+            if interval_s <= 0:
+                continue
+            for first, length in bitmap_runs(postings[session_id]):
+                if length < min_intervals or first + length > len(times):
+                    continue
+                run = CodeRun(session_id, first, length, times[first], times[first + length - 1] + interval_s)
+                if run.duration_s >= min_seconds:
+                    result.append(run)
+        return result
+
+    def sessions_without_intervals(self, postings: Postings) -> List[int]:
+        """Sorted ids of timepoint (or unknown-timer) sessions in a posting list, which runs() skips"""
+        self._load_intervals(postings)
+        return sorted(session_id for session_id in postings
+                      if self._intervals.get(session_id, (0.0, None))[0] <= 0)
+
+    def _load_intervals(self, postings: Postings) -> None:
+        """Fetch interval times of the sessions not seen yet"""
+        missing = [session_id for session_id in postings if session_id not in self._intervals]
+        if missing:
+            self._intervals.update(self.repository.session_intervals(missing))
@@ -0,0 +1,261 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from ..file_formats import split_value
+
+# File layout (little endian):
+#
+#   fixed header   magic, version, flags, JSON header length, row count
+#   JSON header    metadata, protocol, start time, duration, code table, column layout
+#   columns        each starting on an 8-byte boundary:
+#     time_delta   int32   milliseconds since the previous row (first row: since 0)
+#     code         uint16  index into the code table of (category, response) pairs
+#     value        float64 numeric value, NaN when the row has none
+#     text_offsets uint32  row count + 1 offsets into the string heap
+#     text_heap    bytes   UTF-8 free text (comments); rows without text have empty slices
+#
+# Columns are read as NumPy views on a memory map, so reading one column does
+# not read (or page in) the others.
+MAGIC = b"REFLECT\x00"
+VERSION = 1
+FIXED_HEADER = struct.Struct("<8sHHIQ")
+ALIGNMENT = 8
+
+# Column name -> array typecode (writing) and NumPy dtype (reading)
+COLUMN_TYPES = (
+    ("time_delta", "i", "<i4"),
+    ("code", "H", "<u2"),
+    ("value", "d", "<f8"),
+    ("text_offsets", "I", "<u4"),
+)
+TIME_SCALE = 1000  # time_delta units per second
+MAX_CODES = 1 << 16
+
+Source = Union[str, bytes, bytearray, memoryview]
+
+
+def _padding(length: int) -> int:
+    """Bytes needed to move from length to the next 8-byte boundary"""
+    return -length % ALIGNMENT
+
+
+def write_reflect(path: str, responses: Iterable[Tuple], metadata: Dict[str, Any],
+                  start_time: Optional[float] = None, duration: Optional[float] = None,
+                  protocol_index=None) -> int:
+    """Write observations to a .reflect file; returns the number of rows written.
+
+    With a ProtocolIndex the code table starts with the protocol's codes (so
+    code ids match ProtocolIndex ids); responses outside it are appended.
+    """
+    codes: List[Tuple[str, str]] = []
+    code_ids: Dict[Tuple[str, str], int] = {}
+    if protocol_index is not None:
+        for category, label in zip(protocol_index.categories, protocol_index.labels):
+            code_ids.setdefault((category, label), len(codes))
+            codes.append((category, label))
+
+    time_deltas = array("i")
+    code_column = array("H")
+    values = array("d")
+    text_offsets = array("I", [0])
+    heap = bytearray()
+    previous_ms = 0
+
+    for time_s, category, response, value in responses:
+        key = (str(category), str(response))
+        code_id = code_ids.get(key)
+        if code_id is None:
+            if len(codes) >= MAX_CODES:
+                raise ValueError(f"more than {MAX_CODES} distinct responses")
+            code_id = code_ids[key] = len(codes)
+            codes.append(key)
+
+        current_ms = int(round(float(time_s) * TIME_SCALE))
+        time_deltas.append(current_ms - previous_ms)
+        previous_ms = current_ms
+        code_column.append(code_id)
+
+        number, text = split_value(value, key[0])
+        values.append(float("nan") if number is None else float(number))
+        if text:
+            heap += text.encode("utf-8")
+        text_offsets.append(len(heap))
+
+    columns = [(name, typecode) for name, typecode, _ in COLUMN_TYPES]
+    data = {"time_delta": time_deltas, "code": code_column, "value": values, "text_offsets": text_offsets}
+    if sys.byteorder != "little":
+        for column in data.values():
+            column.byteswap()
+
+    # Column offsets are relative to the start of the column section
+    layout: Dict[str, List[int]] = {}
+    offset = 0
+    for name, _ in columns:
+        size = len(data[name]) * data[name].itemsize
+        layout[name] = [offset, size]
+        offset += size + _padding(size)
+    layout["text_heap"] = [offset, len(heap)]
+
+    header = json.dumps({
+        "metadata": {str(key): str(value) for key, value in metadata.items()},
+        "protocol": metadata.get("Protocol", ""),
+        "start_time": start_time,
+        "duration": duration,
+        "codes": codes,
+        "time_scale": TIME_SCALE,
+        "columns": layout,
+    }, ensure_ascii=False).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(FIXED_HEADER.pack(MAGIC, VERSION, 0, len(header), len(code_column)))
+        f.write(header)
+        f.write(b"\x00" * _padding(FIXED_HEADER.size + len(header)))
+        for name, _ in columns:
+            column = data[name]
+            column.tofile(f)
+            f.write(b"\x00" * _padding(len(column) * column.itemsize))
+        f.write(heap)
+
+    return len(code_column)
+
+
+def read_header(source: Source) -> Dict[str, Any]:
+    """Read only the header of a .reflect file (e.g. to filter a corpus by protocol)"""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            fixed = f.read(FIXED_HEADER.size)
+            header, _ = _parse_header(fixed, lambda length: f.read(length))
+        return header
+    buffer = memoryview(source)
+    header, _ = _parse_header(bytes(buffer[:FIXED_HEADER.size]),
+                              lambda length: bytes(buffer[FIXED_HEADER.size:FIXED_HEADER.size + length]))
+    return header
+
+
+def _parse_header(fixed: bytes, read_json) -> Tuple[Dict[str, Any], int]:
+    """Parse the fixed and JSON headers; returns (header, start of the column section)"""
+    if len(fixed) < FIXED_HEADER.size:
+        raise ValueError("not a REFLECT session file (too short)")
+    magic, version, _flags, header_length, row_count = FIXED_HEADER.unpack(fixed)
+    if magic != MAGIC:
+        raise ValueError("not a REFLECT session file")
+    if version > VERSION:
+        raise ValueError(f"unsupported REFLECT session file version {version}")
+
+    header = json.loads(read_json(header_length).decode("utf-8"))
+    header["row_count"] = row_count
+    data_start = FIXED_HEADER.size + header_length
+    return header, data_start + _padding(data_start)
+
+
+class ReflectFile:
+    """Read a .reflect session file through zero-copy NumPy views.
+
+    A path is memory-mapped; bytes (e.g. an upload) are viewed in place.
+    Columns are decoded only when requested, so a corpus scan that needs,
+    say, codes and values never touches the timestamps or comment text.
+    """
+
+    def __init__(self, source: Source):
+        self._file = None
+        self._mmap = None
+        if isinstance(source, str):
+            self._file = open(source, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffer = memoryview(self._mmap)
+        else:
+            self._buffer = memoryview(source)
+
+        fixed = bytes(self._buffer[:FIXED_HEADER.size])
+        header, self._data_start = _parse_header(
+            fixed, lambda length: bytes(self._buffer[FIXED_HEADER.size:FIXED_HEADER.size + length])
+        )
+        self.header = header
+        self.metadata: Dict[str, str] = header.get("metadata", {})
+        self.protocol: str = header.get("protocol", "")
+        self.start_time: Optional[float] = header.get("start_time")
+        self.duration: Optional[float] = header.get("duration")
+        self.codes: List[Tuple[str, str]] = [tuple(code) for code in header.get("codes", [])]
+        self.row_count: int = header["row_count"]
+        self.time_scale: int = header.get("time_scale", TIME_SCALE)
+        self._layout: Dict[str, List[int]] = header["columns"]
+
+    def __enter__(self) -> "ReflectFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the memory map (views still held elsewhere keep it alive until dropped)"""
+        self._buffer.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # NumPy views are still referenced; the map closes when they are collected
+                pass
+            self._file.close()
+            self._mmap = self._file = None
+
+    def raw_column(self, name: str):
+        """Zero-copy NumPy view of a stored column (time_delta, code, value, text_offsets)"""
+        import numpy as np
+
+        dtype = dict((column, numpy_type) for column, _, numpy_type in COLUMN_TYPES)[name]
+        offset, size = self._layout[name]
+        start = self._data_start + offset
+        return np.frombuffer(self._buffer[start:start + size], dtype=dtype)
+
+    def time_s(self):
+        """Timestamps in seconds, rebuilt from the deltas"""
+        import numpy as np
+
+        return np.cumsum(self.raw_column("time_delta"), dtype=np.int64) / self.time_scale
+
+    def categories(self):
+        """Category of every row (object array)"""
+        import numpy as np
+
+        table = np.array([category for category, _ in self.codes] or [""], dtype=object)
+        return table[self.raw_column("code")]
+
+    def responses(self):
+        """Response label of every row (object array)"""
+        import numpy as np
+
+        table = np.array([response for _, response in self.codes] or [""], dtype=object)
+        return table[self.raw_column("code")]
+
+    def values(self):
+        """Numeric values (NaN where the row has none)"""
+        return self.raw_column("value")
+
+    def texts(self) -> List[Optional[str]]:
+        """Free text of every row, None for rows without text"""
+        offsets = self.raw_column("text_offsets").tolist()
+        offset, size = self._layout["text_heap"]
+        start = self._data_start + offset
+        heap = bytes(self._buffer[start:start + size])
+        return [
+            heap[begin:end].decode("utf-8") if end > begin else None
+            for begin, end in zip(offsets, offsets[1:])
+        ]
+
+    def to_dataframe(self, columns: Optional[Sequence[str]] = None):
+        """Build a DataFrame of the requested columns (time_s, category, response, value, value_text)"""
+        import pandas as pd
+
+        readers = {
+            "time_s": self.time_s,
+            "category": self.categories,
+            "response": self.responses,
+            "value": self.values,
+            "value_text": self.texts,
+        }
+        columns = list(columns) if columns is not None else list(readers)
+        # The DataFrame copies the arrays, so it stays valid after close()
+        return pd.DataFrame({name: readers[name]() for name in columns}, columns=columns)
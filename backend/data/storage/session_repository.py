@@ -0,0 +1,587 @@
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import pandas as pd
+from ..file_formats import COMMENT_CATEGORY, file_digest, has_known_suffix, split_value
+from .code_index import bitmap_from_bytes, bitmap_to_bytes, build_interval_postings, times_from_bytes, times_to_bytes
+
+SCHEMA_VERSION = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL DEFAULT '',
+    protocol TEXT NOT NULL DEFAULT '',
+    started_at TEXT NOT NULL DEFAULT '',
+    duration_s REAL,
+    event_count INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_protocol ON sessions (protocol, started_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_started ON sessions (started_at);
+
+CREATE TABLE IF NOT EXISTS session_metadata (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (session_id, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS events (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    time_s REAL NOT NULL,
+    category TEXT NOT NULL,
+    response TEXT NOT NULL,
+    value REAL,
+    value_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_session ON events (session_id, time_s);
+CREATE INDEX IF NOT EXISTS idx_events_code ON events (category, response, session_id);
+
+CREATE TABLE IF NOT EXISTS response_shares (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    response TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    share REAL NOT NULL,
+    PRIMARY KEY (session_id, category, response)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_response_shares ON response_shares (category, response, share);
+
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    time_s REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_comments_session ON comments (session_id, time_s);
+
+CREATE TABLE IF NOT EXISTS session_intervals (
+    session_id INTEGER PRIMARY KEY REFERENCES sessions (id) ON DELETE CASCADE,
+    interval_s REAL NOT NULL,
+    times BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS code_postings (
+    category TEXT NOT NULL,
+    response TEXT NOT NULL,
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    bitmap BLOB NOT NULL,
+    PRIMARY KEY (category, response, session_id)
+) WITHOUT ROWID;
+"""
+
+# Full-text index over comments, kept in sync with the comments table by triggers
+FULL_TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5 (
+    text, content='comments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS comments_fts_insert AFTER INSERT ON comments BEGIN
+    INSERT INTO comments_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS comments_fts_delete AFTER DELETE ON comments BEGIN
+    INSERT INTO comments_fts (comments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# Timer interval of interval protocols that do not set one (as on the observation pages)
+DEFAULT_TIMER_INTERVAL = 120
+
+# SQLite limits the number of "?" parameters per statement
+MAX_QUERY_PARAMETERS = 500
+
+
+class SessionRepository:
+    """Observation sessions stored in a local SQLite database (stdlib sqlite3)
+
+    Each imported session gets a row in `sessions` (protocol, start time,
+    duration), its header in `session_metadata` and its rows in `events`.
+    `response_shares` holds, per session and response, the share of the
+    category's recorded timestamps (intervals) the response was marked in,
+    so questions such as "sessions with more than 30% lecturing in the fall"
+    are index lookups instead of parsing every file. Comments are copied to
+    `comments` with an FTS5 full-text index (a LIKE scan when the SQLite
+    build lacks FTS5), updated in the same transaction as each import.
+    Each session's codes are also stored as bitmaps over its timer intervals
+    in `code_postings`, which CodeIndex queries across sessions.
+
+    Sessions are identified by the SHA-256 of the imported file, so importing
+    an archive again only adds new sessions. Loaded sessions are DataFrames
+    ready for the AnalysisOrchestrator.
+    """
+
+    def __init__(self, path: str, data_processor=None):
+        self.path = path
+        if data_processor is None:
+            # Imported here so queries do not need the configuration
+            from ..processors.data_processor import DataProcessor
+            data_processor = DataProcessor()
+        self.data_processor = data_processor
+        # One connection shared by the threads of a process (e.g. Streamlit sessions)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._create_schema()
+
+    def __enter__(self) -> "SessionRepository":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _create_schema(self) -> None:
+        """Create the tables and indexes of a new database"""
+        with self._lock:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            if self.path != ":memory:":
+                # Readers do not block the importer
+                self._conn.execute("PRAGMA journal_mode = WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise ValueError(f"session database {self.path} has a newer schema (version {version})")
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+                if version < 2:
+                    # Databases from before the comments index: index their stored comments
+                    self._conn.executemany(
+                        "INSERT INTO comments (session_id, time_s, text) VALUES (?, ?, ?)",
+                        [(session_id, time_s, self._comment_text(response, value_text))
+                         for session_id, time_s, category, response, value_text in self._conn.execute(
+                             "SELECT session_id, time_s, category, response, value_text FROM events"
+                         ) if COMMENT_CATEGORY.search(category)]
+                    )
+                if version < 5:
+                    # Build the code index of databases from before it, or rebuild it on the
+                    # intervals the rows were recorded for (version 3 indexed distinct
+                    # timestamps, version 4 started intervals at the timer ticks)
+                    self._conn.execute("DELETE FROM code_postings")
+                    self._conn.execute("DELETE FROM session_intervals")
+                    headers: Dict[int, Dict[str, str]] = {}
+                    for session_id, key, value in self._conn.execute(
+                        "SELECT session_id, key, value FROM session_metadata"
+                    ):
+                        headers.setdefault(session_id, {})[key] = value
+                    sessions: Dict[int, List[Tuple[float, str, str]]] = {}
+                    for session_id, time_s, category, response in self._conn.execute(
+                        "SELECT session_id, time_s, category, response FROM events"
+                    ):
+                        sessions.setdefault(session_id, []).append((time_s, category, response))
+                    for session_id, rows in sessions.items():
+                        self._index_intervals(session_id, rows, self._interval_length(headers.get(session_id, {})))
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.full_text = self._create_full_text_index()
+
+    def _create_full_text_index(self) -> bool:
+        """Create the FTS5 comments index; False if this SQLite build has no FTS5 (LIKE search is used)"""
+        existed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'comments_fts'"
+        ).fetchone() is not None
+        try:
+            with self._conn:
+                self._conn.executescript(FULL_TEXT_SCHEMA)
+                if not existed:
+                    # Comments stored before the index existed (or without FTS5)
+                    self._conn.execute("INSERT INTO comments_fts (comments_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, comments are searched without an index: {e}")
+            return False
+        return True
+
+    # Import
+
+    def has_session(self, digest: str) -> bool:
+        """Check if a session (by file digest) was imported before"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM sessions WHERE digest = ?", (digest,)).fetchone()
+        return row is not None
+
+    def import_file(self, file_path: str) -> Optional[int]:
+        """Import an observation file; returns the new session id, None if it was imported before"""
+        digest = file_digest(file_path)
+        # Checked before parsing, so unchanged files cost one read of their bytes
+        if self.has_session(digest):
+            return None
+
+        result = self.data_processor.load_and_validate_data(file_path)
+        if not result.success:
+            raise ValueError(result.error)
+        return self.add_session(result.data, digest, os.path.basename(file_path))
+
+    def import_files(self, file_paths: Iterable[str]) -> Tuple[int, List[str]]:
+        """Import observation files; returns (sessions added, error messages)"""
+        added, errors = 0, []
+        for file_path in file_paths:
+            try:
+                if self.import_file(file_path) is not None:
+                    added += 1
+            except Exception as e:
+                errors.append(f"{file_path}: {e}")
+        return added, errors
+
+    def import_directory(self, directory: str) -> Tuple[int, List[str]]:
+        """Import every observation file below a directory"""
+        file_paths = []
+        for dirpath, dirnames, filenames in os.walk(directory):
+            dirnames.sort()
+            file_paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if has_known_suffix(name))
+        return self.import_files(file_paths)
+
+    def add_session(self, df: pd.DataFrame, digest: str, source: str = "") -> Optional[int]:
+        """Store one loaded session (a DataProcessor DataFrame); None if the digest is already stored"""
+        header_info = dict(df.attrs.get('header_info', {}))
+        events = [
+            (float(time_s), str(category), str(response)) + self._event_value(value, str(category))
+            for time_s, category, response, value
+            in df[['time_s', 'category', 'response', 'value']].itertuples(index=False, name=None)
+        ]
+        shares = self.compute_response_shares(df)
+
+        with self._lock, self._conn:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO sessions (digest, source, protocol, started_at, duration_s, event_count, imported_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, source, header_info.get("Protocol", ""), self._started_at(header_info),
+                     self._duration(header_info, df), len(events), time.strftime('%Y-%m-%d %H:%M:%S'))
+                )
+            except sqlite3.IntegrityError:
+                # Same digest imported before
+                return None
+            session_id = cursor.lastrowid
+
+            self._conn.executemany(
+                "INSERT INTO session_metadata (session_id, key, value) VALUES (?, ?, ?)",
+                [(session_id, str(key), str(value)) for key, value in header_info.items()]
+            )
+            self._conn.executemany(
+                "INSERT INTO events (session_id, time_s, category, response, value, value_text)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(session_id,) + event for event in events]
+            )
+            self._conn.executemany(
+                "INSERT INTO response_shares (session_id, category, response, count, share)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(session_id,) + share for share in shares]
+            )
+            # The full-text index is updated by trigger in the same transaction
+            self._conn.executemany(
+                "INSERT INTO comments (session_id, time_s, text) VALUES (?, ?, ?)",
+                [(session_id, time_s, self._comment_text(response, value_text))
+                 for time_s, category, response, _, value_text in events
+                 if COMMENT_CATEGORY.search(category)]
+            )
+            self._index_intervals(session_id, [(time_s, category, response) for time_s, category, response, _, _ in events],
+                                  self._interval_length(header_info))
+        return session_id
+
+    def _index_intervals(self, session_id: int, rows: List[Tuple[float, str, str]], interval_s: float) -> None:
+        """Store the interval times and code bitmaps of a session (inside the caller's transaction)"""
+        codes = [row for row in rows if not COMMENT_CATEGORY.search(row[1])]
+        times, interval_s, bitmaps = build_interval_postings(codes, interval_s)
+        self._conn.execute(
+            "INSERT INTO session_intervals (session_id, interval_s, times) VALUES (?, ?, ?)",
+            (session_id, interval_s, times_to_bytes(times))
+        )
+        self._conn.executemany(
+            "INSERT INTO code_postings (category, response, session_id, bitmap) VALUES (?, ?, ?, ?)",
+            [(category, response, session_id, bitmap_to_bytes(bitmap))
+             for (category, response), bitmap in bitmaps.items()]
+        )
+
+    def _interval_length(self, header_info: Dict[str, str]) -> float:
+        """Timer interval (seconds) of an interval recording; 0.0 for timepoint or unknown sessions.
+
+        Taken from the file header (Timer Method / Timer Interval), or for
+        files without them from the protocol named in the header. Interval
+        recordings that name no interval used DEFAULT_TIMER_INTERVAL.
+        """
+        method = header_info.get("Timer Method")
+        interval = header_info.get("Timer Interval")
+        if method is None:
+            config_manager = getattr(self.data_processor, "config_manager", None)
+            protocol = header_info.get("Protocol")
+            config = config_manager.get_config_by_name(protocol) if config_manager is not None and protocol else None
+            if config is None:
+                return 0.0
+            method = config.get("timer_method")
+            interval = config.get("timer_interval")
+        if method != "interval":
+            return 0.0
+        if not interval:
+            # Protocols without timer_interval are recorded (and exported) with the default
+            interval = DEFAULT_TIMER_INTERVAL
+        try:
+            interval_s = float(str(interval).split()[0])
+        except (IndexError, ValueError):
+            return 0.0
+        return interval_s if interval_s > 0 else 0.0
+
+    @staticmethod
+    def compute_response_shares(df: pd.DataFrame) -> List[Tuple[str, str, int, float]]:
+        """(category, response, count, share) per response of a session.
+
+        The share is the fraction of the category's distinct timestamps the
+        response was recorded at. Interval recordings write every code of an
+        interval at one timestamp, so for them this is the share of intervals.
+        """
+        if df.empty:
+            return []
+        codes = df[['time_s', 'category', 'response']].astype({'category': str, 'response': str})
+        timestamps = codes.groupby('category')['time_s'].nunique()
+        per_response = codes.groupby(['category', 'response'])['time_s'].agg(['size', 'nunique'])
+        return [
+            (category, response, int(count), float(distinct) / float(timestamps[category]))
+            for (category, response), count, distinct
+            in zip(per_response.index, per_response['size'], per_response['nunique'])
+        ]
+
+    @staticmethod
+    def _comment_text(response: str, value_text: Optional[str]) -> str:
+        """Comment text of an event: the value for "Comment, Comment, <text>" rows, else the response"""
+        return value_text if value_text else response
+
+    @staticmethod
+    def _event_value(value: Any, category: str) -> Tuple[Optional[float], Optional[str]]:
+        """(value, value_text) columns of an event; NumPy scalars become plain floats for sqlite3"""
+        number, text = split_value(value, category)
+        return (None if number is None else float(number)), text
+
+    @staticmethod
+    def _started_at(header_info: Dict[str, str]) -> str:
+        """Start time as sortable 'YYYY-MM-DD HH:MM:SS' text ('' if unknown)"""
+        started = header_info.get("Observation Started", "")
+        try:
+            return time.strftime('%Y-%m-%d %H:%M:%S', time.strptime(started, '%Y-%m-%d %H:%M:%S'))
+        except ValueError:
+            return ""
+
+    @staticmethod
+    def _duration(header_info: Dict[str, str], df: pd.DataFrame) -> Optional[float]:
+        """Session duration in seconds, from the header ("123.4 seconds") or the recorded times"""
+        match = re.match(r"\s*([0-9.]+)", header_info.get("Total Duration", ""))
+        if match:
+            try:
+                return float(match.group(1))
+            except ValueError:
+                pass
+        return float(df['time_s'].max()) if not df.empty else None
+
+    # Queries
+
+    def session_count(self) -> int:
+        """Number of stored sessions"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def find_sessions(self, protocol: Optional[str] = None, started_from: Optional[str] = None,
+                      started_before: Optional[str] = None, response: Optional[Tuple[str, str]] = None,
+                      min_share: float = 0.0) -> pd.DataFrame:
+        """Find sessions by protocol, start date range and response share.
+
+        Dates are 'YYYY-MM-DD' (or full timestamps); started_from is inclusive,
+        started_before exclusive. With response=(category, label) only sessions
+        where the label's share is at least min_share are returned, with a
+        "share" column, e.g. all fall 2024 sessions with over 30% lecturing:
+
+            find_sessions(started_from="2024-09-01", started_before="2025-01-01",
+                          response=("Instructor", "Lec"), min_share=0.3)
+        """
+        columns = "s.id, s.digest, s.source, s.protocol, s.started_at, s.duration_s, s.event_count"
+        sql = f"SELECT {columns} FROM sessions s"
+        params: List[Any] = []
+        if response is not None:
+            sql = (f"SELECT {columns}, r.share FROM response_shares r"
+                   " JOIN sessions s ON s.id = r.session_id"
+                   " WHERE r.category = ? AND r.response = ? AND r.share >= ?")
+            params.extend([response[0], response[1], min_share])
+        else:
+            sql += " WHERE 1 = 1"
+
+        if protocol is not None:
+            sql += " AND s.protocol = ?"
+            params.append(protocol)
+        if started_from is not None:
+            sql += " AND s.started_at >= ?"
+            params.append(started_from)
+        if started_before is not None:
+            # Sessions without a known start time are stored as '' and never match
+            sql += " AND s.started_at < ? AND s.started_at != ''"
+            params.append(started_before)
+        sql += " ORDER BY s.started_at, s.id"
+
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def get_metadata(self, session_id: int) -> Dict[str, str]:
+        """Header information of a session"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM session_metadata WHERE session_id = ?", (session_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def load_session(self, session_id: int):
+        """Load one session as a DataLoadResult, like loading its file with DataProcessor"""
+        if not self._session_exists(session_id):
+            from ..processors.data_processor import DataLoadResult
+            return DataLoadResult(False, None, f"Session {session_id} not found")
+
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT time_s, category, response, value, value_text FROM events"
+                " WHERE session_id = ? ORDER BY time_s",
+                self._conn, params=(session_id,)
+            )
+        return self.data_processor.load_dataframe(
+            self.data_processor.merge_value_text(df), self.get_metadata(session_id)
+        )
+
+    def load_events(self, session_ids: Optional[Sequence[int]] = None,
+                    categories: Optional[Sequence[str]] = None,
+                    responses: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Events of many sessions (with a session_id column), filtered through the indexes"""
+        base_sql = "SELECT session_id, time_s, category, response, value, value_text FROM events WHERE 1 = 1"
+        filter_params: List[Any] = []
+        for column, values in (("category", categories), ("response", responses)):
+            if values is not None:
+                base_sql += f" AND {column} IN ({', '.join('?' * len(values))})"
+                filter_params.extend(values)
+
+        if session_ids is None:
+            batches: List[Sequence[int]] = [()]
+        else:
+            ids = list(session_ids)
+            batches = [ids[i:i + MAX_QUERY_PARAMETERS] for i in range(0, len(ids), MAX_QUERY_PARAMETERS)]
+
+        frames = []
+        with self._lock:
+            for batch in batches:
+                sql, params = base_sql, list(filter_params)
+                if session_ids is not None:
+                    sql += f" AND session_id IN ({', '.join('?' * len(batch))})"
+                    params.extend(batch)
+                frames.append(pd.read_sql_query(sql + " ORDER BY session_id, time_s", self._conn, params=params))
+
+        if not frames:
+            return pd.DataFrame(columns=["session_id", "time_s", "category", "response", "value"])
+        return self.data_processor.merge_value_text(pd.concat(frames, ignore_index=True))
+
+    def search_comments(self, query: str, limit: int = 100, protocol: Optional[str] = None,
+                        started_from: Optional[str] = None,
+                        started_before: Optional[str] = None) -> pd.DataFrame:
+        """Search comments across all sessions; every hit carries its session and timestamp.
+
+        All words must match (a trailing * matches a prefix, e.g. "click*").
+        With FTS5 hits are ranked by relevance, otherwise they are found with
+        LIKE and listed by session start time.
+        """
+        columns = ["session_id", "source", "protocol", "started_at", "time_s", "text"]
+        terms = [term for term in query.split() if term.strip("*")]
+        if not terms:
+            return pd.DataFrame(columns=columns)
+
+        sql = ("SELECT c.session_id, s.source, s.protocol, s.started_at, c.time_s, c.text"
+               " FROM comments c JOIN sessions s ON s.id = c.session_id")
+        params: List[Any] = []
+        if self.full_text:
+            sql += " JOIN comments_fts f ON f.rowid = c.id WHERE comments_fts MATCH ?"
+            params.append(" ".join(self._fts_term(term) for term in terms))
+        else:
+            sql += " WHERE " + " AND ".join(["c.text LIKE ? ESCAPE '\\'"] * len(terms))
+            params.extend(self._like_pattern(term) for term in terms)
+
+        if protocol is not None:
+            sql += " AND s.protocol = ?"
+            params.append(protocol)
+        if started_from is not None:
+            sql += " AND s.started_at >= ?"
+            params.append(started_from)
+        if started_before is not None:
+            sql += " AND s.started_at < ? AND s.started_at != ''"
+            params.append(started_before)
+        sql += " ORDER BY f.rank" if self.full_text else " ORDER BY s.started_at, c.session_id, c.time_s"
+        sql += " LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    @staticmethod
+    def _fts_term(term: str) -> str:
+        """Quote a search word for FTS5 so punctuation is not read as query syntax"""
+        prefix = term.endswith("*")
+        word = term.rstrip("*").replace('"', '""')
+        return f'"{word}"' + ("*" if prefix else "")
+
+    @staticmethod
+    def _like_pattern(term: str) -> str:
+        """LIKE pattern of a search word (case-insensitive for ASCII)"""
+        word = term.rstrip("*").replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{word}%"
+
+    def code_postings(self, category: str, response: str, protocol: Optional[str] = None) -> Dict[int, int]:
+        """Interval bitmaps (session id -> bitmap) of one code, see CodeIndex"""
+        sql = "SELECT p.session_id, p.bitmap FROM code_postings p"
+        params: List[Any] = []
+        if protocol is not None:
+            sql += " JOIN sessions s ON s.id = p.session_id AND s.protocol = ?"
+            params.append(protocol)
+        sql += " WHERE p.category = ? AND p.response = ?"
+        params.extend([category, response])
+        with self._lock:
+            return {session_id: bitmap_from_bytes(bitmap) for session_id, bitmap in self._conn.execute(sql, params)}
+
+    def session_intervals(self, session_ids: Sequence[int]) -> Dict[int, Tuple[float, Any]]:
+        """Interval length and interval start times of sessions, see CodeIndex"""
+        ids = list(session_ids)
+        result = {}
+        with self._lock:
+            for i in range(0, len(ids), MAX_QUERY_PARAMETERS):
+                batch = ids[i:i + MAX_QUERY_PARAMETERS]
+                for session_id, interval_s, times in self._conn.execute(
+                    "SELECT session_id, interval_s, times FROM session_intervals"
+                    f" WHERE session_id IN ({', '.join('?' * len(batch))})", batch
+                ):
+                    result[session_id] = (interval_s, times_from_bytes(times))
+        return result
+
+    def _session_exists(self, session_id: int) -> bool:
+        """Check if a session id is stored"""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: import observation files or directories into a session database"""
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) < 2:
+        print("usage: python -m backend.data.storage.session_repository DATABASE FILE_OR_DIR...")
+        return 2
+
+    with SessionRepository(args[0]) as repository:
+        added, errors = 0, []
+        for source in args[1:]:
+            if os.path.isdir(source):
+                result = repository.import_directory(source)
+            else:
+                result = repository.import_files([source])
+            added += result[0]
+            errors.extend(result[1])
+
+        for error in errors:
+            print(f"Skipped {error}")
+        print(f"Imported {added} session(s); database has {repository.session_count()} session(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
+import io
 import pandas as pd
 from matplotlib.backends.backend_pdf import PdfPages
 from matplotlib.figure import Figure
 from typing import Optional
+from core.instrumentation import traced
 from ..analysis.statistics_calculator import StatisticsCalculator
 from ..analysis.insights_generator import InsightsGenerator
 from ..visualization.plot_factory import PlotFactory
@@ -10,6 +12,9 @@ from ..visualization.plot_factory import PlotFactory
 class PDFExporter:
     """Handles PDF export functionality for analysis reports"""
     
+    # Page size in inches (US Letter)
+    PAGE_SIZE = (8.5, 11.0)
+    
     def __init__(self, statistics_calculator: StatisticsCalculator, insights_generator: InsightsGenerator, plot_factory: PlotFactory):
         """Initialize with analysis services and plot factory"""
         self.statistics_calculator = statistics_calculator
@@ -19,37 +24,58 @@ class PDFExporter:
     def export_analysis_report(self, df: pd.DataFrame, output_path: str, file_name: str = "", color_manager=None) -> bool:
         """Export comprehensive analysis report to PDF"""
         try:
-            with PdfPages(output_path) as pdf:
-                # Set up the page size (A4)
-                fig_width, fig_height = 8.5, 11.0  # 8.5 x 11 inches
-                
+            self._write_report(output_path, df, file_name, color_manager)
+            return True
+            
+        except Exception as e:
+            print(f"Failed to export PDF: {e}")
+            return False
+    
+    def render_analysis_report(self, df: pd.DataFrame, file_name: str = "", color_manager=None) -> Optional[bytes]:
+        """Render the analysis report into memory and return the PDF bytes (None on failure)"""
+        buffer = io.BytesIO()
+        try:
+            self._write_report(buffer, df, file_name, color_manager)
+        except Exception as e:
+            print(f"Failed to export PDF: {e}")
+            return None
+        return buffer.getvalue()
+    
+    @traced
+    def _write_report(self, output, df: pd.DataFrame, file_name: str, color_manager) -> None:
+        """Write all report pages to a file path or binary file object"""
+        # One figure is cleared and redrawn for every page instead of allocating a figure per page
+        fig = Figure(figsize=self.PAGE_SIZE)
+        try:
+            with PdfPages(output) as pdf:
                 # 1. Title page
-                self._create_title_page(pdf, df, file_name, fig_width, fig_height)
+                self._create_title_page(pdf, fig, df, file_name)
                 
                 # 2. Summary statistics
-                self._create_summary_page(pdf, df, fig_width, fig_height)
+                self._create_summary_page(pdf, fig, df)
                 
                 # 3. Time series plot
-                self._create_time_series_page(pdf, df, fig_width, fig_height, color_manager)
+                self._create_time_series_page(pdf, fig, df, color_manager)
                 
                 # 4. Category distribution
-                self._create_category_distribution_page(pdf, df, fig_width, fig_height, color_manager)
+                self._create_category_distribution_page(pdf, fig, df, color_manager)
                 
                 # 5. Response statistics table
-                self._create_statistics_table_page(pdf, df, fig_width, fig_height)
+                self._create_statistics_table_page(pdf, fig, df)
                 
                 # 6. Insights page
-                self._create_insights_page(pdf, df, fig_width, fig_height)
-                
-            return True
-            
-        except Exception as e:
-            print(f"Failed to export PDF: {e}")
-            return False
+                self._create_insights_page(pdf, fig, df)
+        finally:
+            fig.clear()
+    
+    def _new_page(self, fig: Figure) -> Figure:
+        """Clear the report figure for the next page"""
+        return self.plot_factory.prepare_figure(fig, *self.PAGE_SIZE)
     
-    def _create_title_page(self, pdf, df: pd.DataFrame, file_name: str, fig_width: float, fig_height: float):
+    @traced
+    def _create_title_page(self, pdf, fig: Figure, df: pd.DataFrame, file_name: str):
         """Create title page"""
-        fig = Figure(figsize=(fig_width, fig_height))
+        fig = self._new_page(fig)
         ax = fig.add_subplot(111)
         ax.text(0.5, 0.7, "Survey Analysis Report", 
                ha='center', va='center', fontsize=24, weight='bold')
@@ -61,11 +87,11 @@ class PDFExporter:
         ax.set_ylim(0, 1)
         ax.axis('off')
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
     
-    def _create_summary_page(self, pdf, df: pd.DataFrame, fig_width: float, fig_height: float):
+    @traced
+    def _create_summary_page(self, pdf, fig: Figure, df: pd.DataFrame):
         """Create summary statistics page"""
-        fig = Figure(figsize=(fig_width, fig_height))
+        fig = self._new_page(fig)
         ax = fig.add_subplot(111)
         ax.text(0.1, 0.9, "Data Summary", fontsize=16, weight='bold')
         
@@ -92,23 +118,23 @@ class PDFExporter:
         ax.set_ylim(0, 1)
         ax.axis('off')
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
     
-    def _create_time_series_page(self, pdf, df: pd.DataFrame, fig_width: float, fig_height: float, color_manager):
+    @traced
+    def _create_time_series_page(self, pdf, fig: Figure, df: pd.DataFrame, color_manager):
         """Create time series plot page"""
-        fig = self.plot_factory.create_time_series_plot(df, color_manager)
+        fig = self.plot_factory.create_time_series_plot(df, color_manager, fig)
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
     
-    def _create_category_distribution_page(self, pdf, df: pd.DataFrame, fig_width: float, fig_height: float, color_manager):
+    @traced
+    def _create_category_distribution_page(self, pdf, fig: Figure, df: pd.DataFrame, color_manager):
         """Create category distribution page"""
-        fig = self.plot_factory.create_category_distribution_plot(df, color_manager)
+        fig = self.plot_factory.create_category_distribution_plot(df, color_manager, fig)
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
     
-    def _create_statistics_table_page(self, pdf, df: pd.DataFrame, fig_width: float, fig_height: float):
+    @traced
+    def _create_statistics_table_page(self, pdf, fig: Figure, df: pd.DataFrame):
         """Create response statistics table page"""
-        fig = Figure(figsize=(fig_width, fig_height))
+        fig = self._new_page(fig)
         ax = fig.add_subplot(111)
         ax.set_title("Response Statistics by Category", fontsize=16, weight='bold')
         
@@ -137,11 +163,11 @@ class PDFExporter:
         
         ax.axis('off')
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
     
-    def _create_insights_page(self, pdf, df: pd.DataFrame, fig_width: float, fig_height: float):
+    @traced
+    def _create_insights_page(self, pdf, fig: Figure, df: pd.DataFrame):
         """Create insights page"""
-        fig = Figure(figsize=(fig_width, fig_height))
+        fig = self._new_page(fig)
         ax = fig.add_subplot(111)
         ax.text(0.1, 0.9, "Timeline Analysis & Insights", fontsize=16, weight='bold')
         
@@ -152,4 +178,3 @@ class PDFExporter:
         ax.set_ylim(0, 1)
         ax.axis('off')
         pdf.savefig(fig, bbox_inches='tight')
-        fig.clear()
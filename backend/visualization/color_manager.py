@@ -4,10 +4,22 @@ import matplotlib.colors as mcolors
 class ColorManager:
     """Centralized color management for the application"""
     
-    def __init__(self, color_config):
+    def __init__(self, color_config, config_manager=None):
         """Initialize with color configuration"""
-        self.colors = color_config or {}
+        # Copy so the shared (read-only) configuration is never modified
+        self.colors = dict(color_config or {})
         self._set_default_colors()
+        # Generated palettes, keyed by (base color, number of colors)
+        self._spectrum_cache = {}
+        if config_manager is not None:
+            # Pick up new colors when protocols are hot-reloaded
+            config_manager.subscribe(self._on_config_reloaded, weak=True)
+    
+    def _on_config_reloaded(self, snapshot):
+        """Replace colors from a reloaded configuration and drop cached palettes"""
+        self.colors = dict(snapshot.colors)
+        self._set_default_colors()
+        self._spectrum_cache = {}
     
     def _set_default_colors(self):
         """Set default colors if not provided"""
@@ -37,6 +49,10 @@ class ColorManager:
         if num_colors <= 0:
             return []
 
+        key = (base_color, num_colors)
+        if key in self._spectrum_cache:
+            return list(self._spectrum_cache[key])
+
         # Convert hex to RGB, then to HSV for easier lightness (V) scaling
         rgb = mcolors.hex2color(base_color)
         hsv = mcolors.rgb_to_hsv(rgb)
@@ -56,6 +72,7 @@ class ColorManager:
             new_rgb = mcolors.hsv_to_rgb(new_hsv)
             colors.append(mcolors.rgb2hex(new_rgb))
         
+        self._spectrum_cache[key] = tuple(colors)
         return colors
     
     def get_all_colors(self):
@@ -65,3 +82,4 @@ class ColorManager:
     def update_colors(self, new_colors):
         """Update color configuration"""
         self.colors.update(new_colors)
+        self._spectrum_cache = {}
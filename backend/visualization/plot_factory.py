@@ -1,20 +1,57 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 from matplotlib.figure import Figure
+from typing import Optional
 from datetime import datetime, timedelta
+from core.instrumentation import traced
+from core.logging_utils import get_logger
 from .color_manager import ColorManager
 
+logger = get_logger(__name__)
+
+
+SUBPLOT_PARAMETERS = ("left", "right", "bottom", "top", "wspace", "hspace")
+
 
 class PlotFactory:
-    """Factory class for creating matplotlib plots - returns pure Figure objects"""
+    """Factory class for creating matplotlib plots - returns pure Figure objects
+
+    Every create_* method draws into a new Figure, or into the figure passed
+    as `fig` (cleared first), so callers that own a figure can redraw it
+    instead of allocating a new one for every plot.
+    """
     
-    def create_time_series_plot(self, df, color_manager: ColorManager) -> Figure:
+    def __init__(self, config_manager=None):
+        # Optional - used to order responses the way the recorded protocol lists them
+        self.config_manager = config_manager
+
+    @staticmethod
+    def prepare_figure(fig: Optional[Figure], width: float, height: float) -> Figure:
+        """A new figure of the given size, or `fig` cleared, resized and reset for reuse"""
+        if fig is None:
+            return Figure(figsize=(width, height))
+        fig.clear()
+        fig.set_size_inches(width, height, forward=False)
+        # clear() keeps subplots_adjust settings; a reused figure must look like a new one
+        fig.subplots_adjust(**{name: matplotlib.rcParams[f"figure.subplot.{name}"] for name in SUBPLOT_PARAMETERS})
+        return fig
+    
+    def _get_protocol_index(self, df):
+        """Get the compiled index of the protocol a dataset was recorded with, if known"""
+        if self.config_manager is None:
+            return None
+        protocol_name = df.attrs.get('header_info', {}).get('Protocol')
+        if not protocol_name:
+            return None
+        return self.config_manager.get_protocol_index_by_name(protocol_name)
+    
+    @traced
+    def create_time_series_plot(self, df, color_manager: ColorManager, fig: Optional[Figure] = None) -> Figure:
         """Create horizontal interval plot showing time ranges for each category/response"""
-        print("")
-        print(df)
+        logger.debug("Time series plot input:\n%s", df)
         
-        fig = Figure(figsize=(12, 8))
+        fig = self.prepare_figure(fig, 12, 8)
         ax = fig.add_subplot(111)
         
         # Group by category first, then by response within each category
@@ -26,7 +63,16 @@ class PlotFactory:
         unique_combinations = df_sorted.groupby(['category', 'response']).agg({
             'value': 'mean'  # Aggregate value (you can use 'max', 'min', or 'first' instead)
         }).reset_index()
-        unique_combinations = unique_combinations.sort_values(['category', 'value', 'response'], ascending=[True, True, False])
+        index = self._get_protocol_index(df)
+        if index is not None:
+            # Within a value, keep the protocol's button order (first button on top)
+            unique_combinations['_rank'] = [
+                index.display_rank(category, response)
+                for category, response in zip(unique_combinations['category'], unique_combinations['response'])
+            ]
+            unique_combinations = unique_combinations.sort_values(['category', 'value', '_rank']).drop(columns='_rank')
+        else:
+            unique_combinations = unique_combinations.sort_values(['category', 'value', 'response'], ascending=[True, True, False])
         
         # Define custom category order for y-axis
         category_order = ['Instructor', 'Student', 'Engagement', 'Comment']
@@ -42,17 +88,15 @@ class PlotFactory:
         # Get unique categories from data
         unique_categories = unique_combinations['category'].unique()
         
-        # Debug: print what we have
-        print(f"Unique categories found: {list(unique_categories)}")
-        print(f"Category order map: {category_order_map}")
+        logger.debug("Unique categories found: %s", unique_categories)
+        logger.debug("Category order map: %s", category_order_map)
         
         # Sort by custom order (case-insensitive)
         # Use tuple (order, name) so that items with same order maintain consistent ordering
         unique_categories_sorted = sorted(unique_categories, 
                                          key=lambda x: (category_order_map.get(x.lower(), 999), x.lower()))
         
-        # Debug: print category order to verify
-        print(f"Category order in plot (after sorting): {unique_categories_sorted}")
+        logger.debug("Category order in plot (after sorting): %s", unique_categories_sorted)
         
         # First, count total number of category-response combinations to determine y positions
         total_combinations = len(unique_combinations)
@@ -179,7 +223,7 @@ class PlotFactory:
                 
             except (ValueError, KeyError) as e:
                 # If parsing fails, skip the secondary axis
-                print(f"Warning: Could not parse observation start time: {e}")
+                logger.warning("Could not parse observation start time: %s", e)
         
         return fig
 
@@ -216,11 +260,12 @@ class PlotFactory:
             # If less than 2 categories to group, return original counts
             return counts
 
-    def create_category_distribution_plot(self, df, color_manager: ColorManager) -> Figure:
+    @traced
+    def create_category_distribution_plot(self, df, color_manager: ColorManager, fig: Optional[Figure] = None) -> Figure:
         """Create three pie charts in a single row: instructor, student, and engagement"""
         combine_threshold = 0.06499999999999999  # Activities with proportion < this will be grouped
         
-        fig = Figure(figsize=(12, 4))
+        fig = self.prepare_figure(fig, 12, 4)
         # Single row layout with 3 plots
         ax1 = fig.add_subplot(131)  # Instructor (left)
         ax2 = fig.add_subplot(132)  # Student (middle)
@@ -0,0 +1 @@
+# Performance benchmarks (not part of the application)
@@ -0,0 +1,178 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Allow running as a script from the repository root or the benchmarks directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+from backend.config.config_manager import ConfigManager
+from backend.analysis.orchestrator import AnalysisOrchestrator
+from backend.visualization.plot_factory import PlotFactory
+from backend.export.pdf_exporter import PDFExporter
+from backend.data.exporters.csv_exporter import CSVExporter
+from benchmarks.session_generator import SessionGenerator
+
+# Sessions per corpus; with the default session shape 10,000 sessions are about 1M events
+DEFAULT_SCALES = (1, 10, 100, 1000, 10000)
+STAGES = ("load", "statistics", "insights", "time_series_plot", "category_plot", "csv_export", "pdf")
+
+
+class PipelineBenchmark:
+    """Time the analysis pipeline (load, statistics, insights, plots, exports) on synthetic corpora
+
+    Every stage is run once for its time and, when memory is measured, once
+    more under tracemalloc for its peak traced allocation (tracing slows the
+    code down, so the two are not measured in the same run). The statistics,
+    insights, plot and PDF stages run on the whole corpus as one DataFrame.
+    """
+
+    def __init__(self, protocol: Optional[str] = None, seed: int = 0, measure_memory: bool = True,
+                 stages: Tuple[str, ...] = STAGES, session_options: Optional[Dict[str, Any]] = None):
+        self.config_manager = ConfigManager()
+        self.generator = SessionGenerator.for_protocol(protocol, seed, self.config_manager)
+        self.orchestrator = AnalysisOrchestrator(self.config_manager.get_colors(), self.config_manager)
+        self.plot_factory = PlotFactory(self.config_manager)
+        self.pdf_exporter = PDFExporter(
+            self.orchestrator.statistics_calculator, self.orchestrator.insights_generator, self.plot_factory
+        )
+        self.csv_exporter = CSVExporter()
+        self.measure_memory = measure_memory
+        self.stages = stages
+        self.session_options = session_options or {}
+
+    def run(self, scales: Tuple[int, ...], work_dir: str) -> List[Dict[str, Any]]:
+        """Benchmark every corpus size; returns one result per (scale, stage)"""
+        results = []
+        for sessions in scales:
+            directory = os.path.join(work_dir, f"corpus_{sessions}")
+            started = time.perf_counter()
+            paths, events = self.generator.write_corpus(directory, sessions, **self.session_options)
+            print(f"\n{sessions} session(s), {events} events (generated in {time.perf_counter() - started:.1f}s)")
+            results.extend(self.run_corpus(paths, sessions, events))
+        return results
+
+    def stage_functions(self, paths: List[str]) -> Dict[str, Callable[[], Any]]:
+        """Callables running each stage on one corpus of session files"""
+        df = self._load_corpus(paths)
+        color_manager = self.orchestrator.get_color_manager()
+        metadata = df.attrs['header_info']
+        return {
+            "load": lambda: self._load_corpus(paths),
+            "statistics": lambda: (self.orchestrator.generate_summary_statistics(df),
+                                   self.orchestrator.generate_response_statistics(df)),
+            "insights": lambda: self.orchestrator.generate_insights(df),
+            "time_series_plot": lambda: self.plot_factory.create_time_series_plot(df, color_manager).clear(),
+            "category_plot": lambda: self.plot_factory.create_category_distribution_plot(df, color_manager).clear(),
+            "csv_export": lambda: self.csv_exporter.export_to_bytes(
+                df[["time_s", "category", "response", "value"]].itertuples(index=False, name=None), metadata
+            ),
+            "pdf": lambda: self.pdf_exporter.render_analysis_report(df, "benchmark", color_manager),
+        }
+
+    def run_corpus(self, paths: List[str], sessions: int, events: int) -> List[Dict[str, Any]]:
+        """Benchmark the stages on one corpus of session files"""
+        results = []
+        stage_functions = self.stage_functions(paths)
+        for stage in self.stages:
+            seconds, peak = self.measure(stage_functions[stage])
+            result = {"sessions": sessions, "events": events, "stage": stage, "seconds": seconds, "peak_bytes": peak}
+            results.append(result)
+            print(self.format_result(result))
+        return results
+
+    def measure(self, function: Callable[[], Any]) -> Tuple[float, Optional[int]]:
+        """Run a stage; returns (seconds, peak traced bytes or None)"""
+        # Keep the report readable when pipeline code prints (e.g. error messages)
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            function()
+            seconds = time.perf_counter() - started
+
+            peak = None
+            if self.measure_memory:
+                tracemalloc.start()
+                try:
+                    function()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        return seconds, peak
+
+    def _load_corpus(self, paths: List[str]) -> pd.DataFrame:
+        """Load every session with DataProcessor and combine them into one DataFrame"""
+        frames = []
+        for path in paths:
+            result = self.orchestrator.data_processor.load_and_validate_data(path)
+            if not result.success:
+                raise ValueError(f"{path}: {result.error}")
+            frames.append(result.data)
+        df = pd.concat(frames, ignore_index=True)
+        df.attrs['header_info'] = frames[0].attrs.get('header_info', {})
+        return df
+
+    @staticmethod
+    def format_result(result: Dict[str, Any]) -> str:
+        """One report line"""
+        peak = result["peak_bytes"]
+        memory = f"{peak / (1024 * 1024):10.1f} MiB" if peak is not None else "           -"
+        return f"  {result['stage']:<18} {result['seconds']:10.3f} s {memory}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the REFLECT analysis pipeline on synthetic sessions")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="comma-separated numbers of sessions per corpus")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--protocol", help="protocol name from config.json (default: the first)")
+    parser.add_argument("--duration", type=float, default=3000.0, help="session length in seconds")
+    parser.add_argument("--mode", choices=("interval", "timepoint"), help="default: the protocol's timer method")
+    parser.add_argument("--event-rate", type=float, default=2.0, help="codes per minute")
+    parser.add_argument("--comment-rate", type=float, default=6.0, help="comments per hour")
+    parser.add_argument("--suffix", default=".csv", help="session file format: .csv, .csv.gz, .csv.zst or .parquet")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--work-dir", help="keep generated sessions here (default: a temporary directory)")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stages = tuple(stage.strip() for stage in args.stages.split(",") if stage.strip())
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    scales = tuple(int(scale) for scale in args.scales.split(",") if scale.strip())
+
+    benchmark = PipelineBenchmark(args.protocol, args.seed, not args.no_memory, stages, {
+        "suffix": args.suffix, "duration_s": args.duration, "mode": args.mode,
+        "event_rate": args.event_rate, "comment_rate": args.comment_rate,
+    })
+    if args.work_dir:
+        results = benchmark.run(scales, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory(prefix="reflect-benchmark-") as work_dir:
+            results = benchmark.run(scales, work_dir)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "options": vars(args),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Allow running as a script from the repository root or the benchmarks directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.pipeline_benchmark import PipelineBenchmark, STAGES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BASELINE_VERSION = 1
+
+# Scales the median absolute deviation to a standard deviation for normal data
+MAD_SCALE = 1.4826
+
+EXIT_PASS = 0
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Median and median absolute deviation of repeated timings"""
+    median = statistics.median(samples)
+    mad = statistics.median(abs(sample - median) for sample in samples)
+    return {"median": median, "mad": mad, "runs": len(samples), "samples": samples}
+
+
+class RegressionGate:
+    """Compare benchmark timings against a stored baseline
+
+    Every stage runs `runs` times on one synthetic corpus (after a warm-up
+    run). A stage regresses when its median exceeds the baseline median by
+    more than the largest of:
+
+      - `mad_threshold` robust standard deviations (MAD * 1.4826) of the baseline,
+      - `relative_threshold` of the baseline median,
+      - `absolute_threshold` seconds (timer noise on very fast stages).
+
+    Baselines are machine specific: record one on the machine that runs the
+    gate with --update-baseline and commit it.
+    """
+
+    def __init__(self, sessions: int = 50, runs: int = 7, seed: int = 0,
+                 mad_threshold: float = 3.0, relative_threshold: float = 0.10, absolute_threshold: float = 0.005):
+        self.sessions = sessions
+        self.runs = runs
+        self.seed = seed
+        self.mad_threshold = mad_threshold
+        self.relative_threshold = relative_threshold
+        self.absolute_threshold = absolute_threshold
+
+    def measure(self, stages: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Time every stage `runs` times; returns a summary per stage"""
+        benchmark = PipelineBenchmark(seed=self.seed, measure_memory=False, stages=tuple(stages))
+        results = {}
+        with tempfile.TemporaryDirectory(prefix="reflect-gate-") as work_dir:
+            paths, events = benchmark.generator.write_corpus(work_dir, self.sessions)
+            print(f"Corpus: {self.sessions} session(s), {events} events; {self.runs} runs per stage")
+            functions = benchmark.stage_functions(paths)
+            for stage in stages:
+                # Warm-up: imports, caches and first-call costs are not part of the comparison
+                benchmark.measure(functions[stage])
+                samples = [benchmark.measure(functions[stage])[0] for _ in range(self.runs)]
+                results[stage] = summarize(samples)
+                print(f"  {stage:<18} median {results[stage]['median']:.4f} s  MAD {results[stage]['mad']:.4f} s")
+        return results
+
+    def settings(self) -> Dict[str, Any]:
+        """Corpus settings a baseline is only comparable under"""
+        return {"sessions": self.sessions, "seed": self.seed}
+
+    def allowed(self, baseline: Dict[str, Any]) -> float:
+        """Largest median (seconds) that still passes against a baseline stage"""
+        margin = max(
+            self.mad_threshold * MAD_SCALE * baseline["mad"],
+            self.relative_threshold * baseline["median"],
+            self.absolute_threshold,
+        )
+        return baseline["median"] + margin
+
+    def compare(self, current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pass/fail verdict per stage"""
+        verdicts = []
+        for stage, result in current.items():
+            reference = baseline.get(stage)
+            if reference is None:
+                verdicts.append({"stage": stage, "status": "NEW", "median": result["median"]})
+                continue
+            limit = self.allowed(reference)
+            verdicts.append({
+                "stage": stage,
+                "status": "FAIL" if result["median"] > limit else "PASS",
+                "median": result["median"],
+                "baseline": reference["median"],
+                "limit": limit,
+                "change": result["median"] / reference["median"] - 1 if reference["median"] else 0.0,
+            })
+        return verdicts
+
+    @staticmethod
+    def format_report(verdicts: List[Dict[str, Any]]) -> str:
+        """Readable pass/fail table"""
+        lines = [f"{'stage':<18} {'status':<6} {'median':>10} {'baseline':>10} {'limit':>10} {'change':>8}"]
+        for verdict in verdicts:
+            if verdict["status"] == "NEW":
+                lines.append(f"{verdict['stage']:<18} {'NEW':<6} {verdict['median']:>9.4f}s {'-':>10} {'-':>10} {'-':>8}")
+                continue
+            lines.append(
+                f"{verdict['stage']:<18} {verdict['status']:<6} {verdict['median']:>9.4f}s "
+                f"{verdict['baseline']:>9.4f}s {verdict['limit']:>9.4f}s {verdict['change']:>+7.1%}"
+            )
+        return "\n".join(lines)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Read a baseline file, None if there is none"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return None
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"unsupported baseline version in {path}")
+    return baseline
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: exit status 0 = pass, 1 = regression, 2 = no comparable baseline"""
+    parser = argparse.ArgumentParser(description="Fail when REFLECT pipeline benchmarks regress against a baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="measure and write the baseline instead of comparing")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--sessions", type=int, default=50, help="sessions in the benchmark corpus")
+    parser.add_argument("--runs", type=int, default=7, help="timed runs per stage")
+    parser.add_argument("--mad-threshold", type=float, default=3.0, help="allowed robust standard deviations")
+    parser.add_argument("--relative-threshold", type=float, default=0.10, help="allowed relative slowdown")
+    parser.add_argument("--absolute-threshold", type=float, default=0.005, help="allowed slowdown in seconds")
+    parser.add_argument("--report", help="also write the verdicts to this JSON file")
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    gate = RegressionGate(args.sessions, args.runs, mad_threshold=args.mad_threshold,
+                          relative_threshold=args.relative_threshold, absolute_threshold=args.absolute_threshold)
+
+    baseline = None
+    if not args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; record one on this machine with --update-baseline")
+            return EXIT_NO_BASELINE
+        if baseline.get("settings") != gate.settings():
+            print(f"Baseline was recorded with {baseline.get('settings')}, not {gate.settings()}; "
+                  "use matching options or record a new baseline")
+            return EXIT_NO_BASELINE
+        if baseline.get("machine") != platform.node() or baseline.get("python") != platform.python_version():
+            print(f"Warning: baseline recorded on {baseline.get('machine')} (Python {baseline.get('python')}); "
+                  "timings from another machine or interpreter are not comparable")
+
+    current = gate.measure(stages)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": BASELINE_VERSION,
+                "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "machine": platform.node(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "settings": gate.settings(),
+                "stages": current,
+            }, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return EXIT_PASS
+
+    verdicts = gate.compare(current, baseline["stages"])
+    print()
+    print(gate.format_report(verdicts))
+    failed = [verdict["stage"] for verdict in verdicts if verdict["status"] == "FAIL"]
+    print(f"\n{'FAIL: ' + ', '.join(failed) + ' regressed' if failed else 'PASS'}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"passed": not failed, "verdicts": verdicts}, f, indent=2)
+    return EXIT_REGRESSION if failed else EXIT_PASS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# Allow running as a script from the repository root or the benchmarks directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.config.config_manager import ConfigManager
+from backend.config.protocol_index import ProtocolIndex
+from backend.data.exporters.csv_exporter import CSVExporter
+from backend.data.exporters.parquet_exporter import ParquetExporter
+from backend.data import file_formats
+
+INTERVAL_MODE = "interval"
+TIMEPOINT_MODE = "timepoint"
+
+# Word pool for synthetic comments
+COMMENT_WORDS = (
+    "students", "clicker", "question", "group", "worksheet", "lecture", "board", "slides",
+    "discussion", "quiet", "engaged", "late", "demo", "video", "example", "answer",
+)
+
+
+class SessionGenerator:
+    """Generate synthetic observation sessions for any protocol in config.json
+
+    Interval mode records, at every timer interval, one engagement level plus
+    a random set of student and instructor codes (all at one timestamp, like
+    the interval observation page). Timepoint mode records single codes at
+    random times. Comments arrive at random times in both modes.
+    """
+
+    def __init__(self, protocol: Mapping[str, Any], seed: int = 0):
+        self.protocol = protocol
+        self.index = ProtocolIndex(protocol)
+        self.random = random.Random(seed)
+        self._actions = [code for code in range(self.index.size) if self.index.categories[code] != "Engagement"]
+        self._engagement = self.index.codes_in("Engagement")
+
+    @classmethod
+    def for_protocol(cls, name: Optional[str] = None, seed: int = 0,
+                     config_manager: Optional[ConfigManager] = None) -> "SessionGenerator":
+        """Generator for a protocol of the configuration (the first one by default)"""
+        config_manager = config_manager or ConfigManager()
+        names = config_manager.get_protocol_names()
+        if not names:
+            raise ValueError("the configuration has no protocols")
+        name = name or names[0]
+        protocol = config_manager.get_config_by_name(name)
+        if protocol is None:
+            raise ValueError(f"unknown protocol {name!r} (available: {', '.join(names)})")
+        return cls(protocol, seed)
+
+    def default_mode(self) -> str:
+        """The protocol's own timer method"""
+        return INTERVAL_MODE if self.protocol.get("timer_method") == INTERVAL_MODE else TIMEPOINT_MODE
+
+    def generate(self, duration_s: float = 3000.0, mode: Optional[str] = None, event_rate: float = 2.0,
+                 comment_rate: float = 6.0, interval_s: Optional[float] = None) -> List[Tuple]:
+        """Generate (time_s, category, response, value) rows sorted by time.
+
+        event_rate is the number of codes recorded per minute and comment_rate
+        the number of comments per hour. In interval mode codes are grouped at
+        the interval timestamps (the protocol's timer_interval by default).
+        """
+        mode = mode or self.default_mode()
+        if mode == INTERVAL_MODE:
+            interval_s = interval_s or self.protocol.get("timer_interval") or 120
+            rows = self._interval_rows(duration_s, event_rate, interval_s)
+        elif mode == TIMEPOINT_MODE:
+            rows = self._timepoint_rows(duration_s, event_rate)
+        else:
+            raise ValueError(f"unknown mode {mode!r}")
+
+        rows.extend(self._comment_rows(duration_s, comment_rate))
+        rows.sort(key=lambda row: row[0])
+        return rows
+
+    def metadata(self, start_time: float, duration_s: float) -> Dict[str, str]:
+        """Session header, as written by the observation pages"""
+        return CSVExporter().create_metadata(self.protocol, start_time, duration_s)
+
+    def write_session(self, path: str, start_time: Optional[float] = None, duration_s: float = 3000.0,
+                      **options) -> int:
+        """Write a generated session in the format given by the file name; returns the row count"""
+        rows = self.generate(duration_s, **options)
+        start_time = time.time() if start_time is None else start_time
+        metadata = self.metadata(start_time, duration_s)
+        if file_formats.format_from_path(path) == file_formats.PARQUET:
+            exporter = ParquetExporter()
+        else:
+            exporter = CSVExporter()
+        if not exporter.export_observations(rows, path, metadata):
+            raise OSError(f"failed to write {path}")
+        return len(rows)
+
+    def write_corpus(self, directory: str, sessions: int, suffix: str = ".csv",
+                     first_start: float = 1704067200.0, **options) -> Tuple[List[str], int]:
+        """Write many sessions (one per day from first_start); returns (paths, total rows)"""
+        os.makedirs(directory, exist_ok=True)
+        paths, rows = [], 0
+        for number in range(sessions):
+            path = os.path.join(directory, f"session_{number:05d}{suffix}")
+            rows += self.write_session(path, first_start + number * 86400, **options)
+            paths.append(path)
+        return paths, rows
+
+    def _interval_rows(self, duration_s: float, event_rate: float, interval_s: float) -> List[Tuple]:
+        """One engagement level and a random set of action codes per interval"""
+        rows = []
+        codes_per_interval = max(1, int(round(event_rate * interval_s / 60)))
+        time_s = interval_s
+        while time_s <= duration_s:
+            count = min(len(self._actions), self.random.randint(1, 2 * codes_per_interval - 1))
+            codes = self.random.sample(self._actions, count)
+            if self._engagement:
+                codes.append(self.random.choice(self._engagement))
+            rows.extend((time_s,) + row for row in self.index.rows_for(codes))
+            time_s += interval_s
+        return rows
+
+    def _timepoint_rows(self, duration_s: float, event_rate: float) -> List[Tuple]:
+        """Single codes at exponentially distributed times"""
+        rows = []
+        codes = self._actions + self._engagement
+        if not codes or event_rate <= 0:
+            return rows
+        time_s = self.random.expovariate(event_rate / 60)
+        while time_s <= duration_s:
+            code = self.random.choice(codes)
+            rows.extend((round(time_s, 1),) + row for row in self.index.rows_for([code]))
+            time_s += self.random.expovariate(event_rate / 60)
+        return rows
+
+    def _comment_rows(self, duration_s: float, comment_rate: float) -> List[Tuple]:
+        """Free-text comments at exponentially distributed times"""
+        rows = []
+        if comment_rate <= 0:
+            return rows
+        time_s = self.random.expovariate(comment_rate / 3600)
+        while time_s <= duration_s:
+            words = self.random.sample(COMMENT_WORDS, self.random.randint(3, 8))
+            rows.append((round(time_s, 1), "Comment", "Comment", " ".join(words).capitalize()))
+            time_s += self.random.expovariate(comment_rate / 3600)
+        return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: write synthetic sessions to a directory"""
+    parser = argparse.ArgumentParser(description="Generate synthetic REFLECT observation sessions")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--protocol", help="protocol name from config.json (default: the first)")
+    parser.add_argument("--duration", type=float, default=3000.0, help="session length in seconds")
+    parser.add_argument("--mode", choices=(INTERVAL_MODE, TIMEPOINT_MODE), help="default: the protocol's timer method")
+    parser.add_argument("--event-rate", type=float, default=2.0, help="codes per minute")
+    parser.add_argument("--comment-rate", type=float, default=6.0, help="comments per hour")
+    parser.add_argument("--suffix", default=".csv", help=".csv, .csv.gz, .csv.zst or .parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    generator = SessionGenerator.for_protocol(args.protocol, args.seed)
+    paths, rows = generator.write_corpus(
+        args.directory, args.sessions, args.suffix, duration_s=args.duration, mode=args.mode,
+        event_rate=args.event_rate, comment_rate=args.comment_rate
+    )
+    print(f"Wrote {len(paths)} session(s), {rows} rows, to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
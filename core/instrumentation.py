@@ -0,0 +1,291 @@
+# Per-stage timing and memory profiling of the analysis pipeline.
+#
+# Tracing is switched on with an environment variable before the app starts:
+#
+#     REFLECT_TRACE=trace.json python main.py
+#
+# Every stage (a function decorated with @traced, or a `with stage(...)` block)
+# records wall time, CPU time of its thread and, unless
+# REFLECT_TRACE_MEMORY=0, the memory it allocated (tracemalloc). Peak memory
+# per stage is only recorded with REFLECT_MEMPROFILE (below): tracemalloc's
+# peak is process-wide, and stages of concurrent threads would reset each
+# other's. The trace keeps the last REFLECT_TRACE_MAX_EVENTS events (default
+# 200000), is written when the process exits and opens in chrome://tracing or
+# https://ui.perfetto.dev.
+#
+# REFLECT_MEMPROFILE=1 turns on memory profiling: every request (a Streamlit
+# script run, a page action in the desktop app) prints the peak and retained
+# (still allocated at the end) memory of each of its stages, and the
+# matplotlib figures created during the request that are still alive.
+# tracemalloc's peak is process-wide, so profiled requests run one at a time:
+# concurrent Streamlit sessions wait for each other while profiling is on.
+#
+# When both are off, @traced returns the function unchanged and stage() returns
+# a shared no-op context manager.
+import atexit
+import collections
+import contextlib
+import functools
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+TRACE_PATH = os.environ.get("REFLECT_TRACE", "")
+# REFLECT_TRACE=1 writes to the default file name
+if TRACE_PATH.lower() in ("1", "true", "yes", "on"):
+    TRACE_PATH = "reflect-trace.json"
+MEMPROFILE = os.environ.get("REFLECT_MEMPROFILE", "").lower() in ("1", "true", "yes", "on")
+ENABLED = bool(TRACE_PATH) or MEMPROFILE
+TRACE_MEMORY = MEMPROFILE or (bool(TRACE_PATH) and os.environ.get("REFLECT_TRACE_MEMORY", "1") != "0")
+# Peaks are only meaningful while profiled requests run one at a time
+TRACE_PEAKS = MEMPROFILE
+MAX_EVENTS = int(os.environ.get("REFLECT_TRACE_MAX_EVENTS", "200000") or 0) or None
+
+# Oldest events are dropped once MAX_EVENTS are kept, so a long-running server does not grow
+_events: "collections.deque[Dict[str, Any]]" = collections.deque(maxlen=MAX_EVENTS)
+_local = threading.local()
+_origin = time.perf_counter()
+_NULL_STAGE = contextlib.nullcontext()
+# Held by the open profiled request (reentrant: a request may contain another on its thread)
+_request_lock = threading.RLock()
+
+
+def _stack() -> list:
+    """Stages open in the current thread"""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Stage:
+    """Context manager recording one trace event"""
+    __slots__ = ("name", "args", "start", "cpu_start", "memory_start", "peak_seen")
+
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Stage":
+        stack = _stack()
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            if TRACE_PEAKS:
+                # The enclosing stage keeps the peak reached so far; this stage measures its own
+                if stack:
+                    stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+                tracemalloc.reset_peak()
+            self.memory_start = current
+            self.peak_seen = current
+        stack.append(self)
+        self.cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        end = time.perf_counter()
+        cpu = time.thread_time() - self.cpu_start
+        stack = _stack()
+        stack.pop()
+
+        args = dict(self.args)
+        args["cpu_ms"] = round(cpu * 1000, 3)
+        if TRACE_MEMORY:
+            current, peak = tracemalloc.get_traced_memory()
+            args["retained_kib"] = round((current - self.memory_start) / 1024, 1)
+            if TRACE_PEAKS:
+                peak = max(peak, self.peak_seen)
+                if stack:
+                    stack[-1].peak_seen = max(stack[-1].peak_seen, peak)
+                args["peak_kib"] = round((peak - self.memory_start) / 1024, 1)
+        if exc_info[0] is not None:
+            args["error"] = exc_info[0].__name__
+
+        event = {
+            "name": self.name,
+            "cat": self.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((self.start - _origin) * 1e6, 1),
+            "dur": round((end - self.start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+        if TRACE_PATH:
+            # deque.append is atomic, so stages from worker threads need no lock
+            _events.append(event)
+        request = getattr(_local, "request", None)
+        if request is not None and request.active:
+            # Stages of worker threads that adopted the request are shown nested in it
+            depth = len(stack) if event["tid"] == request.thread_id else len(stack) + 1
+            request.stages.append((depth, event))
+
+
+def stage(name: str, **args: Any):
+    """Context manager timing a block as one stage (extra keyword arguments are stored with it)"""
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name, args)
+
+
+def traced(func: Callable) -> Callable:
+    """Decorator timing every call of a function as a stage named after it"""
+    if not ENABLED:
+        return func
+
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Stage(name, {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class _RequestScope:
+    """Collect the stages of one request and report their memory and leaked figures
+
+    Only stages of the thread that opened the request count towards it, and
+    those of worker threads running under adopt_request() with it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: List[tuple] = []
+        self.thread_id = threading.get_ident()
+        self.active = False
+        self._figures_before: "weakref.WeakSet" = weakref.WeakSet()
+        self._outer = None
+
+    def __enter__(self) -> "_RequestScope":
+        # One profiled request at a time, so no other request resets the tracemalloc peak
+        _request_lock.acquire()
+        self.thread_id = threading.get_ident()
+        self._outer = getattr(_local, "request", None)
+        _local.request = self
+        self.active = True
+        self._figures_before = weakref.WeakSet(_live_figures())
+        self._stage = _Stage(self.name, {})
+        self._stage.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        try:
+            self._stage.__exit__(*exc_info)
+            self.active = False
+            _local.request = self._outer
+            leaked = [figure for figure in _live_figures() if figure not in self._figures_before]
+            print(self.report(leaked))
+        finally:
+            _request_lock.release()
+
+    def report(self, leaked: list) -> str:
+        """Per-stage peak and retained memory of the request, then leaked figures"""
+        lines = [f"Memory profile of {self.name} (peak / retained KiB, wall ms):"]
+        # Stages are recorded when they end; show them in start order, indented by depth
+        for depth, event in sorted(self.stages, key=lambda item: item[1]["ts"]):
+            args = event["args"]
+            lines.append(
+                f"  {'  ' * depth}{event['name']:<{48 - 2 * depth}} "
+                f"{args.get('peak_kib', 0):>10.1f} {args.get('retained_kib', 0):>10.1f} {event['dur'] / 1000:>9.1f}"
+            )
+        if leaked:
+            lines.append(f"  {len(leaked)} matplotlib figure(s) created by this request are still alive:")
+            for figure in leaked[:10]:
+                lines.append(f"    {figure!r} with {len(figure.axes)} axes")
+        return "\n".join(lines)
+
+
+def _live_figures() -> list:
+    """matplotlib figures still alive after a garbage collection (profiling only: scans the heap)"""
+    figure_module = sys.modules.get("matplotlib.figure")
+    if figure_module is None:
+        return []
+    gc.collect()
+    return [obj for obj in gc.get_objects() if isinstance(obj, figure_module.Figure)]
+
+
+def request_scope(name: str):
+    """Context manager profiling one request when REFLECT_MEMPROFILE is on"""
+    if not MEMPROFILE:
+        return _NULL_STAGE
+    return _RequestScope(name)
+
+
+def current_request() -> Optional[_RequestScope]:
+    """The profiled request open in this thread, to hand to worker threads"""
+    return getattr(_local, "request", None) if MEMPROFILE else None
+
+
+@contextlib.contextmanager
+def _adopted(request: _RequestScope):
+    outer = getattr(_local, "request", None)
+    _local.request = request
+    try:
+        yield request
+    finally:
+        _local.request = outer
+
+
+def adopt_request(request: Optional[_RequestScope]):
+    """Context manager counting this worker thread's stages towards another thread's request"""
+    if request is None:
+        return _NULL_STAGE
+    return _adopted(request)
+
+
+def profiled_request(name: str) -> Callable[[Callable], Callable]:
+    """Decorator profiling every call of a function as one request when REFLECT_MEMPROFILE is on"""
+    def decorate(func: Callable) -> Callable:
+        if not MEMPROFILE:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _RequestScope(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def get_events() -> List[Dict[str, Any]]:
+    """Recorded trace events (Chrome "complete" events)"""
+    return list(_events)
+
+
+def reset() -> None:
+    """Drop the recorded events"""
+    _events.clear()
+
+
+def write_trace(path: Optional[str] = None) -> Optional[str]:
+    """Write the recorded events as a Chrome trace JSON file; returns the path written"""
+    path = path or TRACE_PATH
+    if not path or not _events:
+        return None
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": get_events(), "displayTimeUnit": "ms"}, f)
+    except OSError as e:
+        print(f"Failed to write trace {path}: {e}")
+        return None
+    return path
+
+
+def _write_trace_at_exit() -> None:
+    """Write the trace file when the process exits"""
+    path = write_trace()
+    if path:
+        print(f"Trace written to {path} ({len(_events)} events)")
+
+
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+if TRACE_PATH:
+    atexit.register(_write_trace_at_exit)
@@ -0,0 +1,167 @@
+# Leveled logging for the application, configured by environment variables:
+#
+#   REFLECT_LOG_LEVEL   default level, optionally followed by per-module levels:
+#                       "INFO" or "WARNING,backend.visualization=DEBUG,gui=INFO"
+#   REFLECT_LOG_FORMAT  "text" (default) or "json" (one JSON object per line)
+#   REFLECT_LOG_RATE    at most N records of one message per S seconds, "N/S"
+#                       (default "20/60"; "0" turns rate limiting off)
+#
+# Messages use logging's lazy %-style arguments, so a disabled call such as
+# logger.debug("Recorded %s", response) only costs a level check: nothing is
+# formatted. All loggers live under the "reflect" logger and do not propagate
+# to the root logger, so the host (e.g. the Streamlit server) keeps its own
+# logging setup.
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+ROOT_LOGGER = "reflect"
+DEFAULT_LEVEL = "WARNING"
+DEFAULT_RATE = "20/60"
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_STANDARD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including extra={...} fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most `burst` records of each message through per `period` seconds.
+
+    Records are grouped by logger and message template (not the formatted
+    text), so a click handler logging on every click is throttled as one
+    message. The first record after a throttled window reports how many were
+    dropped.
+    """
+
+    def __init__(self, burst: int, period: float):
+        super().__init__()
+        self.burst = burst
+        self.period = period
+        self._windows: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, str(record.msg))
+        now = record.created
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class _TextFormatter(logging.Formatter):
+    """Plain text format noting records dropped by the rate limit"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        return text
+
+
+def parse_levels(spec: str) -> Tuple[int, Dict[str, int]]:
+    """Parse "LEVEL,module=LEVEL,..." into (default level, per-module levels)"""
+    default = logging.getLevelName(DEFAULT_LEVEL)
+    modules: Dict[str, int] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.rpartition("=")
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            print(f"Ignoring unknown log level {level!r} in REFLECT_LOG_LEVEL")
+            continue
+        if name:
+            modules[name.strip()] = value
+        else:
+            default = value
+    return default, modules
+
+
+def parse_rate(spec: str) -> Optional[Tuple[int, float]]:
+    """Parse "N/S" into (burst, period); None turns rate limiting off"""
+    try:
+        burst, _, period = spec.partition("/")
+        burst_count = int(burst)
+        if burst_count <= 0:
+            return None
+        return burst_count, float(period or 1)
+    except ValueError:
+        print(f"Ignoring invalid REFLECT_LOG_RATE {spec!r}")
+        return parse_rate(DEFAULT_RATE)
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      rate: Optional[str] = None, stream=None) -> logging.Logger:
+    """(Re)configure the application loggers; arguments override the environment variables"""
+    global _configured
+    with _configure_lock:
+        default, modules = parse_levels(level if level is not None else os.environ.get("REFLECT_LOG_LEVEL", DEFAULT_LEVEL))
+        log_format = (log_format or os.environ.get("REFLECT_LOG_FORMAT", "text")).lower()
+        limit = parse_rate(rate if rate is not None else os.environ.get("REFLECT_LOG_RATE", DEFAULT_RATE))
+
+        root = logging.getLogger(ROOT_LOGGER)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        handler = logging.StreamHandler(stream or sys.stderr)
+        if log_format == "json":
+            handler.setFormatter(JSONFormatter())
+        else:
+            handler.setFormatter(_TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        if limit is not None:
+            handler.addFilter(RateLimitFilter(*limit))
+        root.addHandler(handler)
+        root.setLevel(default)
+        root.propagate = False
+
+        # Per-module levels from a previous configuration no longer apply
+        for name, logger in logging.Logger.manager.loggerDict.items():
+            if name.startswith(ROOT_LOGGER + ".") and isinstance(logger, logging.Logger):
+                logger.setLevel(logging.NOTSET)
+        for name, module_level in modules.items():
+            logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(module_level)
+
+        _configured = True
+        return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module (pass __name__); configures logging on first use"""
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
@@ -1,22 +1,80 @@
 import pandas as pd
+from typing import Callable, Dict, Optional
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from backend.visualization.plot_factory import PlotFactory
 from backend.visualization.color_manager import ColorManager
+from core.instrumentation import stage
+
+TIME_SERIES = "time_series"
+CATEGORY_DISTRIBUTION = "category_distribution"
 
 
 class PyQt6PlotAdapter:
-    """Adapter to convert matplotlib Figures to PyQt6 MplCanvas widgets"""
-    
+    """Adapter to convert matplotlib Figures to PyQt6 MplCanvas widgets
+
+    The adapter owns one figure (and its canvas) per kind of plot. Loading
+    another file clears and redraws the same figures instead of allocating
+    new ones, so memory stays flat however many files are loaded. Call
+    release_canvases() before deleting the widgets the canvases were placed
+    in, and dispose() when the page is torn down.
+
+    draw_* only touch the figure and may run in a worker thread while the
+    figure's canvas is not shown; canvas_for() must run on the GUI thread.
+    """
+
     def __init__(self, plot_factory: PlotFactory):
         self.plot_factory = plot_factory
-    
+        self._figures: Dict[str, Figure] = {}
+
     def create_time_series_canvas(self, df: pd.DataFrame, color_manager: ColorManager) -> FigureCanvas:
         """Create time series plot as FigureCanvas widget"""
-        fig = self.plot_factory.create_time_series_plot(df, color_manager)
-        return FigureCanvas(fig)
-    
+        return self.canvas_for(self.draw_time_series(df, color_manager))
+
     def create_category_distribution_canvas(self, df: pd.DataFrame, color_manager: ColorManager) -> FigureCanvas:
         """Create category distribution plot as FigureCanvas widget"""
-        fig = self.plot_factory.create_category_distribution_plot(df, color_manager)
-        return FigureCanvas(fig)
+        return self.canvas_for(self.draw_category_distribution(df, color_manager))
+
+    def draw_time_series(self, df: pd.DataFrame, color_manager: ColorManager) -> Figure:
+        """Draw the time series plot into its pooled figure"""
+        return self._draw(TIME_SERIES, lambda fig: self.plot_factory.create_time_series_plot(df, color_manager, fig))
+
+    def draw_category_distribution(self, df: pd.DataFrame, color_manager: ColorManager) -> Figure:
+        """Draw the category distribution plot into its pooled figure"""
+        return self._draw(CATEGORY_DISTRIBUTION,
+                          lambda fig: self.plot_factory.create_category_distribution_plot(df, color_manager, fig))
+
+    def _draw(self, kind: str, plot: Callable[[Optional[Figure]], Figure]) -> Figure:
+        """Redraw the pooled figure of a kind, creating it on first use"""
+        fig = plot(self._figures.get(kind))
+        self._figures[kind] = fig
+        return fig
+
+    def canvas_for(self, fig: Figure) -> FigureCanvas:
+        """The canvas showing a pooled figure, created on first use and resized and redrawn afterwards"""
+        canvas = fig.canvas
+        with stage("pyqt.figure_canvas"):
+            if not isinstance(canvas, FigureCanvas):
+                return FigureCanvas(fig)
+            # Detach the canvas from the section it was shown in before it is placed in a new one
+            canvas.setParent(None)
+            # The plot set the figure size; size the widget to it, as a new canvas would be
+            canvas.resize(*canvas.get_width_height())
+            canvas.draw_idle()
+        return canvas
+
+    def release_canvases(self):
+        """Take the pooled canvases out of their parent widgets so deleting those keeps the canvases"""
+        for fig in self._figures.values():
+            if isinstance(fig.canvas, FigureCanvas):
+                fig.canvas.setParent(None)
+
+    def dispose(self):
+        """Clear the pooled figures and delete their canvases"""
+        for fig in self._figures.values():
+            canvas = fig.canvas
+            fig.clear()
+            if isinstance(canvas, FigureCanvas):
+                canvas.setParent(None)
+                canvas.deleteLater()
+        self._figures.clear()
@@ -0,0 +1,94 @@
+from typing import Any, Callable, Optional, Set
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from core import instrumentation
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class _TaskSignals(QObject):
+    """Signals a task emits from its worker thread"""
+    done = pyqtSignal(object, object)
+    failed = pyqtSignal(object, object)
+
+
+class _Task(QRunnable):
+    """Run one function in the thread pool and report its result"""
+
+    def __init__(self, generation: int, function: Callable, args: tuple,
+                 on_done: Optional[Callable[[Any], None]], on_error: Optional[Callable[[Exception], None]]):
+        super().__init__()
+        # The adapter keeps the task until its result is delivered, so Python owns it
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.function = function
+        self.args = args
+        self.on_done = on_done
+        self.on_error = on_error
+        self.signals = _TaskSignals()
+        # Stages run by the task count towards the profiled request it was submitted from
+        self.request = instrumentation.current_request()
+
+    def run(self):
+        try:
+            with instrumentation.adopt_request(self.request):
+                result = self.function(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self, e)
+            return
+        self.signals.done.emit(self, result)
+
+
+class PyQt6TaskAdapter(QObject):
+    """Adapter to run backend work in a QThreadPool and deliver the results on the GUI thread
+
+    on_done / on_error callbacks always run on the GUI thread, so they may
+    create and change widgets. cancel() drops queued tasks and the results
+    of tasks already running, e.g. when another file is opened.
+    """
+
+    def __init__(self, max_threads: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        # Overlapping stages would make the per-stage memory of a profile meaningless
+        self.pool.setMaxThreadCount(1 if instrumentation.MEMPROFILE else max_threads)
+        self.generation = 0
+        # Keep the Python side of running tasks (and their signals) alive until they report
+        self._tasks: Set[_Task] = set()
+
+    def submit(self, function: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None, priority: int = 0) -> None:
+        """Run function(*args) in the pool; tasks with a higher priority start first"""
+        task = _Task(self.generation, function, args, on_done, on_error)
+        task.signals.done.connect(self._deliver_result)
+        task.signals.failed.connect(self._deliver_error)
+        self._tasks.add(task)
+        self.pool.start(task, priority)
+
+    def cancel(self) -> None:
+        """Drop queued tasks and ignore the results of the running ones"""
+        self.pool.clear()
+        self.generation += 1
+
+    def shutdown(self) -> None:
+        """Cancel everything and wait for the running tasks to finish"""
+        self.cancel()
+        self.pool.waitForDone()
+        self._tasks.clear()
+
+    @pyqtSlot(object, object)
+    def _deliver_result(self, task: _Task, result: Any) -> None:
+        self._tasks.discard(task)
+        if task.generation == self.generation and task.on_done is not None:
+            task.on_done(result)
+
+    @pyqtSlot(object, object)
+    def _deliver_error(self, task: _Task, error: Exception) -> None:
+        self._tasks.discard(task)
+        if task.generation != self.generation:
+            return
+        if task.on_error is not None:
+            task.on_error(error)
+        else:
+            logger.warning("Background task %s failed: %s", getattr(task.function, '__qualname__', task.function),
+                           error, exc_info=error)
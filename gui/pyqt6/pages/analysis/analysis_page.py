@@ -1,6 +1,8 @@
+import contextlib
+import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QFileDialog, QMessageBox, QScrollArea, 
-                            QFrame, QTextEdit, QSplitter)
+                            QFrame, QTextEdit, QSplitter, QProgressBar)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from backend.analysis.orchestrator import AnalysisOrchestrator
@@ -8,7 +10,11 @@ from backend.export.pdf_exporter import PDFExporter
 from backend.analysis.statistics_calculator import StatisticsCalculator
 from backend.analysis.insights_generator import InsightsGenerator
 from backend.visualization.plot_factory import PlotFactory
+from backend.data import file_formats
 from gui.pyqt6.adapters.plot_adapter import PyQt6PlotAdapter
+from gui.pyqt6.adapters.task_adapter import PyQt6TaskAdapter
+from core.instrumentation import request_scope
+from core.logging_utils import get_logger
 from gui.pyqt6.pages.analysis.components.summary_section import SummarySection
 from gui.pyqt6.pages.analysis.components.statistics_section import StatisticsSection
 from gui.pyqt6.pages.analysis.components.timeline_section import TimelineSection
@@ -16,6 +22,8 @@ from gui.pyqt6.pages.analysis.components.comments_section import CommentsSection
 from gui.pyqt6.pages.analysis.components.time_series_section import TimeSeriesSection
 from gui.pyqt6.pages.analysis.components.distribution_section import DistributionSection
 
+logger = get_logger(__name__)
+
 class AnalysisPage(QWidget):
     def __init__(self, switch_page, app_state):
         super().__init__()
@@ -30,7 +38,7 @@ class AnalysisPage(QWidget):
         self.orchestrator = AnalysisOrchestrator(colors, self.app_state.config_manager)
         self.statistics_calculator = StatisticsCalculator()
         self.insights_generator = InsightsGenerator()
-        self.plot_factory = PlotFactory()
+        self.plot_factory = PlotFactory(self.app_state.config_manager)
         self.plot_adapter = PyQt6PlotAdapter(self.plot_factory)
         
         # Initialize PDF export service
@@ -47,6 +55,21 @@ class AnalysisPage(QWidget):
         self.comments_section = CommentsSection()
         self.time_series_section = TimeSeriesSection(self.plot_adapter, self.orchestrator.get_color_manager())
         self.distribution_section = DistributionSection(self.plot_adapter, self.orchestrator.get_color_manager())
+        
+        # Sections in display order, and the order they are computed in (cheapest first)
+        self.sections = [
+            self.summary_section, self.time_series_section, self.comments_section,
+            self.distribution_section, self.statistics_section, self.timeline_section,
+        ]
+        self.compute_order = [
+            self.summary_section, self.statistics_section, self.comments_section,
+            self.timeline_section, self.distribution_section, self.time_series_section,
+        ]
+        
+        # Loading and section computations run in a thread pool; results are shown on the GUI thread
+        self.tasks = PyQt6TaskAdapter(parent=self)
+        self._pending_sections = 0
+        self._profile = contextlib.ExitStack()
 
         # Create main layout
         main_layout = QVBoxLayout()
@@ -57,9 +80,14 @@ class AnalysisPage(QWidget):
         self.label = QLabel("Open a CSV file to view responses")
         controls_layout.addWidget(self.label)
         
-        btn_open = QPushButton("Open Data File")
-        btn_open.clicked.connect(self.load_data)
-        controls_layout.addWidget(btn_open)
+        self.progress = QProgressBar()
+        self.progress.setMaximumWidth(200)
+        self.progress.setVisible(False)
+        controls_layout.addWidget(self.progress)
+        
+        self.btn_open = QPushButton("Open Data File")
+        self.btn_open.clicked.connect(self.load_data)
+        controls_layout.addWidget(self.btn_open)
         
         self.btn_export = QPushButton("Export to PDF")
         self.btn_export.clicked.connect(self.export_to_pdf)
@@ -86,16 +114,20 @@ class AnalysisPage(QWidget):
         self.content_widget.setLayout(self.content_layout)
         
         # Initial message
-        self.initial_label = QLabel("Open a CSV file to view analysis")
-        self.initial_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.initial_label.setStyleSheet("font-size: 16px; color: gray; padding: 50px;")
-        self.content_layout.addWidget(self.initial_label)
+        self.show_initial_message()
         
         scroll_area.setWidget(self.content_widget)
         main_layout.addWidget(scroll_area)
         
         self.setLayout(main_layout)
 
+    def show_initial_message(self):
+        """Show the prompt to open a file in the empty content area"""
+        self.initial_label = QLabel("Open a CSV file to view analysis")
+        self.initial_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.initial_label.setStyleSheet("font-size: 16px; color: gray; padding: 50px;")
+        self.content_layout.addWidget(self.initial_label)
+
     def get_colors_from_app_state(self):
         """Get color configuration from app state"""
         current_config = self.app_state.get_current_config()
@@ -119,41 +151,136 @@ class AnalysisPage(QWidget):
 
     def load_data(self):
         path, _ = QFileDialog.getOpenFileName(
-            self, "Open Data File", "data", "CSV Files (*.csv)"
+            self, "Open Data File", "data", file_formats.OPEN_FILE_FILTER
         )
         if not path:
             return
         
-        result = self.orchestrator.load_and_validate_data(path)
+        self.tasks.cancel()
+        self.clear_content()
+        self.df = None
+        self.btn_export.setEnabled(False)
+        name = os.path.basename(path)
+        self.label.setText(f"Loading: {name}")
+        self._set_busy(True)
         
-        if result.success:
-            self.df = result.data
-            self.label.setText(f"Loaded: {path.split('/')[-1]}")
-            self.btn_export.setEnabled(True)
-            self.create_analysis_content()
-        else:
-            QMessageBox.critical(self, "Error", result.error)
+        # Loading and building the sections is one profiled request with REFLECT_MEMPROFILE=1
+        self._profile.close()
+        self._profile.enter_context(request_scope("pyqt.load_data"))
+        
+        # An indeterminate progress bar until the file is parsed, then one step per section
+        self.progress.setRange(0, 0)
+        loading_label = QLabel(f"Loading {name}...")
+        loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        loading_label.setStyleSheet("font-size: 16px; color: gray; padding: 50px;")
+        self.content_layout.addWidget(loading_label)
+        self.tasks.submit(
+            self.orchestrator.load_and_validate_data, path,
+            on_done=lambda result: self._on_data_loaded(name, result),
+            on_error=lambda error: self._on_load_failed(str(error))
+        )
+
+    def _on_data_loaded(self, name: str, result):
+        """Show the analysis of a file loaded in the background"""
+        if not result.success:
+            self._on_load_failed(result.error)
+            return
+        self.df = result.data
+        self.label.setText(f"Loaded: {name}")
+        self.btn_export.setEnabled(True)
+        self.create_analysis_content()
+
+    def _on_load_failed(self, error: str):
+        """Report a file that could not be loaded"""
+        self.label.setText("Open a CSV file to view responses")
+        # Replace the "Loading ..." message with the initial prompt
+        self.clear_content()
+        self.show_initial_message()
+        self._finish_loading()
+        QMessageBox.critical(self, "Error", error)
+
+    def _set_busy(self, busy: bool):
+        """Show the progress bar and block opening another file while one is loading"""
+        self.progress.setVisible(busy)
+        self.btn_open.setEnabled(not busy)
+
+    def _finish_loading(self):
+        """Hide the progress indicator and close the profiled request"""
+        self._set_busy(False)
+        self._profile.close()
 
     def clear_content(self):
         """Clear existing content from the scrollable area"""
+        # The plot canvases are pooled and redrawn for the next file; keep them out of the deleted sections
+        self.plot_adapter.release_canvases()
         while self.content_layout.count():
             child = self.content_layout.takeAt(0)
             if child.widget():
                 child.widget().deleteLater()
 
+    def cleanup(self):
+        """Release figures and data before the page is destroyed"""
+        # Running tasks draw into the pooled figures; let them finish before the figures are disposed of
+        self.tasks.shutdown()
+        self._profile.close()
+        self.clear_content()
+        # Clear the pooled figures explicitly so their artists do not wait for the garbage collector
+        self.plot_adapter.dispose()
+        self.df = None
+        self.orchestrator.df = None
+
     def create_analysis_content(self):
-        """Create UI components using the new component architecture"""
+        """Create UI components using the new component architecture
+
+        Every section is computed in the thread pool, cheapest first, and
+        replaces its placeholder as soon as it is ready, so the first results
+        show while the plots are still being drawn.
+        """
         if self.df is None:
             return  
+        self.tasks.cancel()
         self.clear_content()
+        self._set_busy(True)
 
-        # Create sections using individual components
-        self.content_layout.addWidget(self.summary_section.create_section(self.df))  # Summary Statistics
-        self.content_layout.addWidget(self.time_series_section.create_section(self.df))  # Time Series Plot
-        self.content_layout.addWidget(self.comments_section.create_section(self.df))  # Comments Timeline
-        self.content_layout.addWidget(self.distribution_section.create_section(self.df))  # Category Distribution
-        self.content_layout.addWidget(self.statistics_section.create_section(self.df))  # Response Statistics by Category
-        self.content_layout.addWidget(self.timeline_section.create_section(self.df))  # Timeline Analysis
+        # Placeholders keep the sections in display order whatever order they finish in
+        placeholders = {}
+        for section in self.sections:
+            placeholder = QLabel(f"Loading {section.TITLE}...")
+            placeholder.setStyleSheet("color: gray; padding: 20px;")
+            self.content_layout.addWidget(placeholder)
+            placeholders[section] = placeholder
+
+        self._pending_sections = len(self.compute_order)
+        self.progress.setRange(0, self._pending_sections)
+        self.progress.setValue(0)
+        for priority, section in enumerate(reversed(self.compute_order)):
+            placeholder = placeholders[section]
+            self.tasks.submit(
+                section.compute, self.df, priority=priority,
+                on_done=lambda data, section=section, placeholder=placeholder:
+                    self._show_section(section, placeholder, data),
+                on_error=lambda error, section=section, placeholder=placeholder:
+                    self._show_section(section, placeholder, error=error)
+            )
+
+    def _show_section(self, section, placeholder: QLabel, data=None, error: Exception = None):
+        """Replace a section's placeholder with the section built from its computed data"""
+        if error is None:
+            try:
+                frame = section.build_section(data)
+            except Exception as e:
+                error = e
+        if error is not None:
+            logger.warning("Failed to create %s section: %s", section.TITLE, error, exc_info=error)
+            frame = QLabel(f"Could not create {section.TITLE}: {error}")
+            frame.setStyleSheet("color: gray; font-style: italic; padding: 20px;")
+        self.content_layout.replaceWidget(placeholder, frame)
+        placeholder.deleteLater()
+
+        self._pending_sections -= 1
+        self.progress.setValue(self.progress.maximum() - self._pending_sections)
+        if self._pending_sections == 0:
+            self._finish_loading()
 
     def export_to_pdf(self):
         """Export analysis to PDF"""
@@ -168,9 +295,10 @@ class AnalysisPage(QWidget):
             return
             
         # Use PDF export service
-        success = self.pdf_exporter.export_analysis_report(
-            self.df, path, self.label.text(), self.orchestrator.get_color_manager()
-        )
+        with request_scope("pyqt.export_pdf"):
+            success = self.pdf_exporter.export_analysis_report(
+                self.df, path, self.label.text(), self.orchestrator.get_color_manager()
+            )
         
         if success:
             QMessageBox.information(self, "Success", f"PDF report saved to: {path}")
@@ -1,63 +1,79 @@
 import pandas as pd
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QTextEdit
+from typing import List, Optional, Tuple
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
+from gui.pyqt6.widgets.record_table import RecordTable, RecordTableModel
+
+COLUMNS = ["Time", "Comment", "Value"]
+
+
+def format_timestamp(seconds: float) -> str:
+    """mm:ss of a session time"""
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def _comment_value(value) -> Optional[str]:
+    """Value recorded with a comment, None if there is none"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    return text or None
 
 
 class CommentsSection:
     """Component for creating comments section"""
     
+    TITLE = "Comments Timeline"
+    
     def create_section(self, df: pd.DataFrame) -> QFrame:
         """Create comments section with timestamps"""
+        return self.build_section(self.compute(df))
+    
+    def compute(self, df: pd.DataFrame) -> Optional[Tuple[List[tuple], float]]:
+        """(time_s, comment, value) rows sorted by time and their time span, None without comments (safe in a worker thread)"""
+        # Filter for comments/notes data
+        comments_data = df[df['category'].str.contains('Comment|Note|comment|note', case=False, na=False)]
+        
+        if comments_data.empty:
+            return None
+        
+        # Sort by timestamp; whole columns at once rather than row by row
+        comments_sorted = comments_data.sort_values('time_s', kind='stable')
+        rows = list(zip(
+            comments_sorted['time_s'].tolist(),
+            comments_sorted['response'].tolist(),
+            [_comment_value(value) for value in comments_sorted['value'].tolist()],
+        ))
+        time_span = rows[-1][0] - rows[0][0]
+        return rows, time_span
+    
+    def build_section(self, comments: Optional[Tuple[List[tuple], float]]) -> QFrame:
+        """Create the section widgets from the computed comments (GUI thread)"""
         comments_frame = QFrame()
         comments_layout = QVBoxLayout()
         
-        title = QLabel("Comments Timeline")
+        title = QLabel(self.TITLE)
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         comments_layout.addWidget(title)
         
-        # Filter for comments/notes data
-        comments_data = df[df['category'].str.contains('Comment|Note|comment|note', case=False, na=False)]
-        
-        if comments_data.empty:
+        if comments is None:
             no_comments_label = QLabel("No comments found in the data")
             no_comments_label.setStyleSheet("color: gray; font-style: italic; padding: 20px;")
             no_comments_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             comments_layout.addWidget(no_comments_label)
         else:
-            # Sort by timestamp
-            comments_sorted = comments_data.sort_values('time_s')
-            
-            # Create scrollable text area for comments
-            comments_text = QTextEdit()
-            comments_text.setReadOnly(True)
-            comments_text.setMaximumHeight(200)  # Limit height to keep it manageable
-            comments_text.setStyleSheet("border: none; background: transparent;")
-            
-            # Format comments with timestamps
-            comments_content = ""
-            for _, row in comments_sorted.iterrows():
-                timestamp = row['time_s']
-                minutes = int(timestamp // 60)
-                seconds = int(timestamp % 60)
-                time_str = f"{minutes:02d}:{seconds:02d}"
-                
-                comment_text = row.get('response', 'No comment text')
-                value = row.get('value', '')
-                
-                # Format the comment entry
-                comments_content += f"<b>[{time_str}]</b> {comment_text}"
-                if value and str(value).strip():
-                    comments_content += f" <i>({value})</i>"
-                comments_content += "<br><br>"
+            rows, time_span = comments
             
-            comments_text.setHtml(comments_content)
-            comments_layout.addWidget(comments_text)
+            # Virtualized table: only the visible comments are laid out, however many there are
+            model = RecordTableModel(COLUMNS, rows, {0: format_timestamp})
+            comments_table = RecordTable(model, "Filter comments...", stretch_column=1)
+            comments_table.setMinimumHeight(200)
+            comments_table.setMaximumHeight(320)  # Limit height to keep it manageable
+            comments_layout.addWidget(comments_table)
             
             # Add summary info
-            total_comments = len(comments_sorted)
-            time_span = comments_sorted['time_s'].max() - comments_sorted['time_s'].min()
-            summary_text = f"<b>Summary:</b> {total_comments} comments over {time_span:.1f} seconds"
+            summary_text = f"<b>Summary:</b> {len(rows)} comments over {time_span:.1f} seconds"
             summary_label = QLabel(summary_text)
             summary_label.setStyleSheet("color: #666; font-size: 12px; padding: 5px;")
             comments_layout.addWidget(summary_label)
@@ -1,57 +1,56 @@
 import pandas as pd
+from typing import List
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PyQt6.QtGui import QFont
 from backend.analysis.statistics_calculator import StatisticsCalculator
+from gui.pyqt6.widgets.record_table import RecordTable, RecordTableModel
+
+COLUMNS = ["Category", "Count", "Mean", "Std Dev", "Min", "Max"]
+
+
+def format_statistic(value) -> str:
+    """Format as float if numeric, otherwise display as string"""
+    if isinstance(value, (int, float)):
+        return f"{value:.2f}"
+    return "" if value is None else str(value)
 
 
 class StatisticsSection:
     """Component for creating response statistics section"""
     
+    TITLE = "Response Statistics by Category"
+    
     def __init__(self, statistics_calculator: StatisticsCalculator):
         self.statistics_calculator = statistics_calculator
     
     def create_section(self, df: pd.DataFrame) -> QFrame:
         """Create response statistics by category section"""
+        return self.build_section(self.compute(df))
+    
+    def compute(self, df: pd.DataFrame) -> List[tuple]:
+        """Response statistics as table rows (no widgets; safe to run in a worker thread)"""
+        # Use statistics calculator to get statistics
+        response_stats = self.statistics_calculator.generate_response_statistics(df)
+        return [
+            (stat['category'], stat['count'], stat['mean'], stat['std'], stat['min'], stat['max'])
+            for stat in response_stats
+        ]
+    
+    def build_section(self, rows: List[tuple]) -> QFrame:
+        """Create the section widgets from the computed rows (GUI thread)"""
         stats_frame = QFrame()
         stats_layout = QVBoxLayout()
         
-        title = QLabel("Response Statistics by Category")
+        title = QLabel(self.TITLE)
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         stats_layout.addWidget(title)
         
-        # Use statistics calculator to get statistics
-        response_stats = self.statistics_calculator.generate_response_statistics(df)
-        
-        # Create HTML table
-        stats_text = "<table border='1' style='border-collapse: collapse; width: 100%;'>"
-        stats_text += "<tr><th>Category</th><th>Count</th><th>Mean</th><th>Std Dev</th><th>Min</th><th>Max</th></tr>"
-        
-        for stat in response_stats:
-            stats_text += f"<tr>"
-            stats_text += f"<td>{stat['category']}</td>"
-            stats_text += f"<td>{stat['count']}</td>"
-            
-            # Handle mean - format as float if numeric, otherwise display as string
-            if isinstance(stat['mean'], (int, float)):
-                stats_text += f"<td>{stat['mean']:.2f}</td>"
-            else:
-                stats_text += f"<td>{stat['mean']}</td>"
-            
-            # Handle std - format as float if numeric, otherwise display as string
-            if isinstance(stat['std'], (int, float)):
-                stats_text += f"<td>{stat['std']:.2f}</td>"
-            else:
-                stats_text += f"<td>{stat['std']}</td>"
-            
-            stats_text += f"<td>{stat['min']}</td>"
-            stats_text += f"<td>{stat['max']}</td>"
-            stats_text += f"</tr>"
-        
-        stats_text += "</table>"
-        
-        stats_label = QLabel(stats_text)
-        stats_label.setWordWrap(True)
-        stats_layout.addWidget(stats_label)
+        # Sortable, filterable table that only lays out its visible rows
+        model = RecordTableModel(COLUMNS, rows, {2: format_statistic, 3: format_statistic})
+        stats_table = RecordTable(model, "Filter categories...", stretch_column=0)
+        stats_table.setMinimumHeight(160)
+        stats_table.setMaximumHeight(320)
+        stats_layout.addWidget(stats_table)
         
         stats_frame.setLayout(stats_layout)
         return stats_frame
@@ -7,21 +7,29 @@ from backend.analysis.statistics_calculator import StatisticsCalculator
 class SummarySection:
     """Component for creating summary statistics section"""
     
+    TITLE = "Data Summary"
+    
     def __init__(self, statistics_calculator: StatisticsCalculator):
         self.statistics_calculator = statistics_calculator
     
     def create_section(self, df: pd.DataFrame) -> QFrame:
         """Create summary statistics section"""
+        return self.build_section(self.compute(df))
+    
+    def compute(self, df: pd.DataFrame) -> dict:
+        """Summary statistics (no widgets; safe to run in a worker thread)"""
+        # Use statistics calculator to get summary statistics
+        return self.statistics_calculator.generate_summary_statistics(df)
+    
+    def build_section(self, summary: dict) -> QFrame:
+        """Create the section widgets from computed statistics (GUI thread)"""
         summary_frame = QFrame()
         summary_layout = QVBoxLayout()
         
-        title = QLabel("Data Summary")
+        title = QLabel(self.TITLE)
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         summary_layout.addWidget(title)
         
-        # Use statistics calculator to get summary statistics
-        summary = self.statistics_calculator.generate_summary_statistics(df)
-        
         # Build summary text with header information
         summary_text = f"""
         <b>Dataset Overview:</b><br>
@@ -1,4 +1,5 @@
 import pandas as pd
+from matplotlib.figure import Figure
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PyQt6.QtGui import QFont
 from gui.pyqt6.adapters.plot_adapter import PyQt6PlotAdapter
@@ -8,21 +9,31 @@ from backend.visualization.color_manager import ColorManager
 class TimeSeriesSection:
     """Component for creating time series plot section"""
     
+    TITLE = "Response Timeline"
+    
     def __init__(self, plot_adapter: PyQt6PlotAdapter, color_manager: ColorManager):
         self.plot_adapter = plot_adapter
         self.color_manager = color_manager
     
     def create_section(self, df: pd.DataFrame) -> QFrame:
         """Create time series plot section with frame and title"""
+        return self.build_section(self.compute(df))
+    
+    def compute(self, df: pd.DataFrame) -> Figure:
+        """Draw the plot into the adapter's figure (no widgets; safe to run in a worker thread)"""
+        return self.plot_adapter.draw_time_series(df, self.color_manager)
+    
+    def build_section(self, fig: Figure) -> QFrame:
+        """Create the section widgets around the drawn figure (GUI thread)"""
         plot_frame = QFrame()
         plot_layout = QVBoxLayout()
         
-        title = QLabel("Response Timeline")
+        title = QLabel(self.TITLE)
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         plot_layout.addWidget(title)
         
-        # Create the plot using plot adapter
-        canvas = self.plot_adapter.create_time_series_canvas(df, self.color_manager)
+        # Show the figure in the adapter's canvas
+        canvas = self.plot_adapter.canvas_for(fig)
         plot_layout.addWidget(canvas)
         
         plot_frame.setLayout(plot_layout)
@@ -1,4 +1,5 @@
 import pandas as pd
+from typing import List
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel
 from PyQt6.QtGui import QFont
 from backend.analysis.insights_generator import InsightsGenerator
@@ -7,21 +8,29 @@ from backend.analysis.insights_generator import InsightsGenerator
 class TimelineSection:
     """Component for creating timeline analysis section"""
     
+    TITLE = "Timeline Analysis & Insights"
+    
     def __init__(self, insights_generator: InsightsGenerator):
         self.insights_generator = insights_generator
     
     def create_section(self, df: pd.DataFrame) -> QFrame:
         """Create timeline analysis with insights section"""
+        return self.build_section(self.compute(df))
+    
+    def compute(self, df: pd.DataFrame) -> List[str]:
+        """Insights (no widgets; safe to run in a worker thread)"""
+        # Use insights generator to get insights
+        return self.insights_generator.generate_insights(df)
+    
+    def build_section(self, insights: List[str]) -> QFrame:
+        """Create the section widgets from computed insights (GUI thread)"""
         analysis_frame = QFrame()
         analysis_layout = QVBoxLayout()
         
-        title = QLabel("Timeline Analysis & Insights")
+        title = QLabel(self.TITLE)
         title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         analysis_layout.addWidget(title)
         
-        # Use insights generator to get insights
-        insights = self.insights_generator.generate_insights(df)
-        
         insights_text = f"""
         <b>Key Insights:</b><br>
         {''.join([f'• {insight}<br>' for insight in insights])}
@@ -3,12 +3,14 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                             QLabel, QFileDialog, QMessageBox, QTextEdit, 
                             QGroupBox, QGridLayout)
 from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QIcon, QPixmap
 from core.util_functions import resource_path, get_current_time
 from backend.data.collectors.observation_collector import ObservationCollector
 from backend.data.collectors.timer_service import TimerService
 from backend.data.exporters.csv_exporter import CSVExporter
+from backend.data.exporters.parquet_exporter import ParquetExporter
+from backend.data import file_formats
 from gui.pyqt6.adapters.timer_adapter import PyQt6TimerAdapter
+from gui.pyqt6.widgets.icon_cache import IconCache, ACTION_ICON_SIZE, ENGAGEMENT_ICON_SIZE
 
 class BaseObservationPage(QWidget):
     def __init__(self, switch_page, app_state):
@@ -19,14 +21,18 @@ class BaseObservationPage(QWidget):
         # Initialize backend services
         self.timer_service = TimerService()
         self.csv_exporter = CSVExporter()
+        self.parquet_exporter = ParquetExporter()
         
         # Button behavior configuration
         self.button_behavior = self.get_button_behavior()
         
         self.load_config()
         
+        # Compiled protocol (code ids, values, display order), shared per config snapshot
+        self.protocol_index = self.app_state.config_manager.get_protocol_index(self.config)
+        
         # Initialize observation collector with config
-        self.observation_collector = ObservationCollector(self.config)
+        self.observation_collector = ObservationCollector(self.config, self.protocol_index)
         
         # Initialize timer adapter
         self.timer_adapter = PyQt6TimerAdapter(self.timer_service, self.update_timer)
@@ -133,22 +139,14 @@ class BaseObservationPage(QWidget):
         
         return btn
 
-    def _load_button_image(self, btn, button_data):
+    def _load_button_image(self, btn, button_data, size=ACTION_ICON_SIZE):
         """Common image loading logic"""
-        image_path = button_data.get("image", "")
-        if image_path:
-            try:
-                # Use resource_path to make the path PyInstaller-safe
-                full_image_path = resource_path(image_path)
-                pixmap = QPixmap(full_image_path)
-                if not pixmap.isNull():
-                    # Scale image to fit button (leave some space for text)
-                    scaled_pixmap = pixmap.scaled(40, 40, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    icon = QIcon(scaled_pixmap)
-                    btn.setIcon(icon)
-                    btn.setIconSize(scaled_pixmap.size())
-            except Exception as e:
-                print(f"Could not load image {full_image_path}: {e}")
+        # Icons are decoded and scaled once per process and shared across page rebuilds
+        cached = IconCache().get_icon(button_data.get("image", ""), size, self.devicePixelRatioF())
+        if cached:
+            icon, icon_size = cached
+            btn.setIcon(icon)
+            btn.setIconSize(icon_size)
 
     def create_student_actions_section(self):
         """Create the left section for student actions"""
@@ -197,20 +195,8 @@ class BaseObservationPage(QWidget):
             btn.setToolTip(button_data["text"])
             btn.setCheckable(True)  # Make it a toggle button
             
-            # Try to load engagement image
-            image_path = button_data.get("image", "")
-            if image_path:
-                try:
-                    # Use resource_path to make the path PyInstaller-safe
-                    full_image_path = resource_path(image_path)
-                    pixmap = QPixmap(full_image_path)
-                    if not pixmap.isNull():
-                        scaled_pixmap = pixmap.scaled(30, 30, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                        icon = QIcon(scaled_pixmap)
-                        btn.setIcon(icon)
-                        btn.setIconSize(scaled_pixmap.size())
-                except Exception as e:
-                    print(f"Could not load engagement image {full_image_path}: {e}")
+            # Load engagement image
+            self._load_button_image(btn, button_data, ENGAGEMENT_ICON_SIZE)
             
             # Apply color to button background with toggle styling
             btn.setStyleSheet(f"""
@@ -285,7 +271,7 @@ class BaseObservationPage(QWidget):
 
     def toggle_engagement_button(self, label, checked, clicked_button):
         """Handle engagement button toggle with radio button behavior"""
-        if not self.start_time:
+        if not self.observation_collector.is_observation_active():
             return
         
         if checked:
@@ -294,15 +280,8 @@ class BaseObservationPage(QWidget):
                 if btn != clicked_button and btn.isChecked():
                     btn.setChecked(False)
             
-            # Update button states
-            self.button_states[f"Engagement_{label}"] = True
-            print(f"Engagement selected: {label}")
-        else:
-            # If this button was unchecked, remove it from states
-            key = f"Engagement_{label}"
-            if key in self.button_states:
-                del self.button_states[key]
-            print(f"Engagement deselected: {label}")
+            # Record the selected level with the value defined by the protocol
+            self.record_response("Engagement", label, self.protocol_index.engagement_value(label))
 
     def save_comment(self):
         """Save the current comment and clear the field"""
@@ -328,24 +307,39 @@ class BaseObservationPage(QWidget):
         """Stop observation and save data - override in subclasses for specific behavior"""
         self.timer_adapter.stop()
         
-        # Get responses from collector
-        responses = self.observation_collector.get_responses()
-        if not responses:
+        # Check the collector has data (it is streamed to the file below, not copied)
+        if not self.observation_collector.has_responses():
             QMessageBox.information(self, "No data", "No observations recorded.")
             return
 
-        path, _ = QFileDialog.getSaveFileName(
-            self, "Save Observation Data", "", "CSV Files (*.csv)"
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Observation Data", "", ";;".join(file_formats.SAVE_FILE_FILTERS.values())
         )
         if path:
+            # Dialogs do not always add double suffixes such as .csv.gz - use the chosen filter's
+            if not file_formats.has_known_suffix(path):
+                for file_format, file_filter in file_formats.SAVE_FILE_FILTERS.items():
+                    if file_filter == selected_filter:
+                        path = f"{path}.{file_format}"
+            
             # Create metadata for export
             current_config = self.app_state.get_current_config()
             start_time = self.observation_collector.start_time
             duration = self.observation_collector.get_elapsed_time()
             metadata = self.csv_exporter.create_metadata(current_config, start_time, duration)
             
-            # Export using CSV exporter
-            success = self.csv_exporter.export_observations(responses, path, metadata)
+            # Export as .reflect, Parquet or (optionally compressed) CSV, depending on the file name
+            file_format = file_formats.format_from_path(path)
+            if file_format == file_formats.REFLECT:
+                success = self.observation_collector.export_session(path, metadata)
+            else:
+                if file_format == file_formats.PARQUET:
+                    exporter = self.parquet_exporter
+                else:
+                    exporter = self.csv_exporter
+                success = exporter.export_observations(
+                    self.observation_collector.iter_responses(), path, metadata
+                )
             if success:
                 QMessageBox.information(self, "Saved", f"Observation data saved to:\n{path}")
             else:
@@ -355,3 +349,10 @@ class BaseObservationPage(QWidget):
     def handle_back_to_home(self):
         """Handle back to home button - override in subclasses for specific behavior"""
         self.switch_page(0)
+
+    def cleanup(self):
+        """Stop timers and drop recorded data before the page is destroyed"""
+        self.timer_adapter.stop()
+        if self.observation_collector.is_observation_active():
+            self.observation_collector.stop_observation()
+        self.observation_collector.clear_responses()
@@ -3,12 +3,15 @@ from PyQt6.QtCore import QTimer
 from gui.pyqt6.pages.observation.base_observation_page import BaseObservationPage
 from gui.pyqt6.pages.observation.components.button_behaviors import ToggleButtonBehavior
 from core.util_functions import get_current_time
+from core.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 class ObservationIntervalPage(BaseObservationPage):
     def __init__(self, switch_page, app_state):
         """run some additional init before running base init"""
-        # Track button states for toggle functionality
-        self.button_states = {}
+        # Per-code toggle flags, indexed by protocol code id
+        self.toggled = bytearray()
         self.interval_timer = QTimer()
         self.interval_timer.timeout.connect(self.save_interval_data)
         
@@ -29,34 +32,32 @@ class ObservationIntervalPage(BaseObservationPage):
         if not self.observation_collector.is_observation_active():
             return
         
-        key = f"{category}_{label}"
-        if checked:
-            self.button_states[key] = True
-            print(f"Toggled ON: {category} - {label}")
-        else:
-            self.button_states[key] = False
-            print(f"Toggled OFF: {category} - {label}")
+        code_id = self.protocol_index.code_id(category, label)
+        if code_id is None:
+            return
+        self.toggled[code_id] = 1 if checked else 0
+        logger.debug("Toggled %s: %s - %s", "ON" if checked else "OFF", category, label)
 
     def toggle_engagement_button(self, label, checked, clicked_button):
         """Handle engagement button toggle with radio button behavior"""
         if not self.observation_collector.is_observation_active():
             return
         
+        code_id = self.protocol_index.code_id("Engagement", label)
+        if code_id is None:
+            return
+        
         if checked:
-            # Uncheck all other engagement buttons
+            # Uncheck all other engagement buttons (their handlers clear their flags)
             for btn in self.engagement_buttons:
                 if btn != clicked_button and btn.isChecked():
                     btn.setChecked(False)
             
-            # Update button states
-            self.button_states[f"Engagement_{label}"] = True
-            print(f"Engagement selected: {label}")
+            self.toggled[code_id] = 1
+            logger.debug("Engagement selected: %s", label)
         else:
-            # If this button was unchecked, remove it from states
-            key = f"Engagement_{label}"
-            if key in self.button_states:
-                del self.button_states[key]
-            print(f"Engagement deselected: {label}")
+            self.toggled[code_id] = 0
+            logger.debug("Engagement deselected: %s", label)
 
     def save_comment(self):
         """Save the current comment and clear the field"""
@@ -68,7 +69,7 @@ class ObservationIntervalPage(BaseObservationPage):
     def start_observation(self):
         """Override to start interval timer"""
         super().start_observation()
-        self.button_states = {}
+        self.toggled = bytearray(self.protocol_index.size)
         self.interval_timer.start(self.timer_interval)  # Start interval timer
 
     def save_interval_data(self):
@@ -76,25 +77,16 @@ class ObservationIntervalPage(BaseObservationPage):
         if not self.observation_collector.is_observation_active():
             return
         
-        # Save data for all toggled buttons
-        for key, is_toggled in self.button_states.items():
-            if is_toggled:
-                category, label = key.split("_", 1)
-                # Determine value based on category
-                if category == "Engagement":
-                    engagement_values = {"Low": 1, "Medium": 2, "High": 3}
-                    value = engagement_values.get(label, 1)
-                else:  # Student and Instructor categories
-                    value = 1
-                
-                self.observation_collector.record_response(category, label, value)
-                print(f"Interval save: {category} - {label} (value: {value})")
+        # Save data for all toggled buttons (values come from the protocol index)
+        code_ids = self.protocol_index.toggled_codes(self.toggled)
+        self.observation_collector.record_codes(code_ids)
+        logger.debug("Interval save: %d codes", len(code_ids))
         
         # Reset all buttons
         self.reset_all_buttons()
         
-        # Clear button states
-        self.button_states = {}
+        # Clear toggle flags
+        self.toggled = bytearray(self.protocol_index.size)
 
     def reset_all_buttons(self):
         """Reset all toggle buttons to unchecked state"""
@@ -110,16 +102,7 @@ class ObservationIntervalPage(BaseObservationPage):
         
         # Save any remaining toggled buttons before stopping
         if self.observation_collector.is_observation_active():
-            for key, is_toggled in self.button_states.items():
-                if is_toggled:
-                    category, label = key.split("_", 1)
-                    # Determine value based on category
-                    if category == "Engagement":
-                        engagement_values = {"Low": 1, "Medium": 2, "High": 3}
-                        value = engagement_values.get(label, 1)
-                    else:  # Student and Instructor categories
-                        value = 1
-                    self.observation_collector.record_response(category, label, value)
+            self.observation_collector.record_codes(self.protocol_index.toggled_codes(self.toggled))
         
         # Call parent stop_observation to handle the rest
         super().stop_observation()
@@ -144,3 +127,8 @@ class ObservationIntervalPage(BaseObservationPage):
         else:
             # Timer is not running, go back directly
             self.switch_page(0)
+
+    def cleanup(self):
+        """Override to also stop the interval timer"""
+        self.interval_timer.stop()
+        super().cleanup()
@@ -0,0 +1,89 @@
+# gui/pyqt6/pages/page_manager.py
+from typing import Callable, Dict, Iterable, List, Optional
+from PyQt6.QtWidgets import QStackedWidget, QWidget
+
+
+class PageManager:
+    """Owns the lifecycle of the pages shown in the main QStackedWidget.
+
+    Stateless pages (home, settings) are built once and reused on every visit.
+    All other pages are built on entry and torn down as soon as the user
+    navigates away, so only the cached pages plus the current page are alive
+    at any time.
+
+    Pages are described by loaders - zero-argument callables returning the page
+    class - so a page's module (and its heavy dependencies) is only imported the
+    first time the page is needed.
+    """
+
+    def __init__(self, stack: QStackedWidget, page_loaders: List[Callable[[], type]], switch_page: Callable,
+                 app_state, cached_indices: Iterable[int] = ()):
+        self.stack = stack
+        self.page_loaders = page_loaders
+        self.switch_page = switch_page
+        self.app_state = app_state
+        self.cached_indices = set(cached_indices)
+        self._cached_pages: Dict[int, QWidget] = {}
+        self._current_index: Optional[int] = None
+        self._current_page: Optional[QWidget] = None
+
+    def show_page(self, index: int) -> Optional[QWidget]:
+        """Show the page at index, reusing or building it as needed"""
+        if not 0 <= index < len(self.page_loaders):
+            return None
+
+        page = self._get_or_create_page(index)
+        previous_index, previous_page = self._current_index, self._current_page
+        self._current_index, self._current_page = index, page
+        self.stack.setCurrentWidget(page)
+
+        # Tear down the page we are leaving unless it is kept in the cache
+        if previous_page is not None and previous_page is not page and previous_index not in self.cached_indices:
+            self._dispose_page(previous_page)
+        return page
+
+    def preload(self, indices: Iterable[int]) -> None:
+        """Build cacheable pages ahead of time without showing them"""
+        for index in indices:
+            if index in self.cached_indices and 0 <= index < len(self.page_loaders):
+                self._get_or_create_page(index)
+
+    def current_page(self) -> Optional[QWidget]:
+        """Get the page currently shown"""
+        return self._current_page
+
+    def dispose_all(self) -> None:
+        """Tear down every page, cached or not (used on application exit)"""
+        pages = list(self._cached_pages.values())
+        if self._current_page is not None and self._current_page not in pages:
+            pages.append(self._current_page)
+        self._cached_pages = {}
+        self._current_index, self._current_page = None, None
+        for page in pages:
+            self._dispose_page(page)
+
+    def _get_or_create_page(self, index: int) -> QWidget:
+        """Return the cached page for index or build a fresh one"""
+        page = self._cached_pages.get(index)
+        if page is not None:
+            return page
+
+        page_class = self.page_loaders[index]()
+        page = page_class(self.switch_page, self.app_state)
+        self.stack.addWidget(page)
+        if index in self.cached_indices:
+            self._cached_pages[index] = page
+        return page
+
+    def _dispose_page(self, page: QWidget) -> None:
+        """Release the page's resources and schedule the widget for deletion"""
+        # Pages holding figures, data frames or timers expose cleanup()
+        cleanup = getattr(page, "cleanup", None)
+        if callable(cleanup):
+            try:
+                cleanup()
+            except Exception as e:
+                print(f"Failed to clean up page {type(page).__name__}: {e}")
+        self.stack.removeWidget(page)
+        # deleteLater is safe even when called from one of the page's own slots
+        page.deleteLater()
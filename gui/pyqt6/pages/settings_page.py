@@ -1,8 +1,10 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QComboBox, QGroupBox, QTextEdit, QMessageBox)
 from PyQt6.QtCore import Qt
-import json
-from core.util_functions import resource_path
+from collections.abc import Mapping
+from gui.pyqt6.widgets.icon_cache import IconCache
+from backend.config.config_service import thaw
+from backend.config.protocol_schema import validate_config
 
 class SettingsPage(QWidget):
     # Constants
@@ -18,59 +20,47 @@ class SettingsPage(QWidget):
 
         self.config_data = {}
         self.load_config()
-        self.current_config_index = self.get_current_config_index()
+        self.current_config_name = self.get_current_config_name()
 
         self.setup_ui()
         
-    def get_observation_configs(self):
-        """Get the list of observation configurations"""
-        return self.config_data.get("observation_configs", [])
-    
-    def get_current_config_index(self):
-        """Get the index of the currently active configuration"""
-        current_config = self.app_state.get_current_config()
-        current_name = current_config.get("name", "")
-        
-        configs = self.get_observation_configs()
-        for i, config in enumerate(configs):
-            if config.get("name", "") == current_name:
-                return i
+    def showEvent(self, event):
+        """Re-sync the protocol list and selection with the configuration when the page is shown again"""
+        super().showEvent(event)
+        # Protocols may have been added, removed or reordered by a hot reload since the page was built
+        self.current_config_name = self.get_current_config_name()
+        self.populate_config_combo()
+        self.set_current_config_selection()
+        self.update_config_display()
         
-        # Fallback to first config if not found
-        return 0
+    def get_protocol_names(self):
+        """Get the names of the available protocols (protocol bodies load on selection)"""
+        return self.app_state.config_manager.get_protocol_names()
+    
+    def get_current_config_name(self):
+        """Get the name of the currently active configuration"""
+        return self.app_state.get_current_config().get("name", "")
         
     def load_config(self):
-        """Load configuration from config.json"""
-        try:
-            config_path = resource_path("config.json")
-            with open(config_path, "r") as f:
-                self.config_data = json.load(f)
-            
-            # Validate configuration structure
-            if not self.validate_config():
-                QMessageBox.warning(self, "Warning", "Configuration file has invalid structure. Using defaults.")
-                self.config_data = {"observation_configs": []}
-                
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            QMessageBox.critical(self, "Error", f"Could not load configuration: {e}")
-            self.switch_page(0)
-            return
+        """Load configuration from the shared configuration snapshot"""
+        # The snapshot is parsed once per process and is read-only, so no copy is needed
+        self.config_data = self.app_state.config_manager.load_config()
+        
+        # Validate configuration structure
+        if not self.validate_config():
+            QMessageBox.warning(self, "Warning", "Configuration file has invalid structure. Using defaults.")
+            self.config_data = {"observation_configs": []}
     
     def validate_config(self):
-        """Validate the loaded configuration structure"""
-        if not isinstance(self.config_data, dict):
-            return False
-        
-        observation_configs = self.config_data.get("observation_configs", [])
-        if not isinstance(observation_configs, list):
+        """Validate the loaded configuration against the protocol schema"""
+        if not isinstance(self.config_data, Mapping):
             return False
         
-        # Validate each config has required fields
-        for config in observation_configs:
-            if not isinstance(config, dict) or "name" not in config:
-                return False
-        
-        return True
+        # The schema works on plain JSON types, so check a mutable copy of the snapshot
+        errors = validate_config(thaw(self.config_data))
+        for error in errors:
+            print(f"Invalid configuration: {error}")
+        return not errors
     
     def setup_ui(self):
         """Set up the user interface"""
@@ -150,33 +140,37 @@ class SettingsPage(QWidget):
         layout.addLayout(button_layout)
     
     def populate_config_combo(self):
-        """Populate the configuration dropdown"""
-        configs = self.get_observation_configs()
-        for i, config in enumerate(configs):
-            self.config_combo.addItem(config.get("name", f"Config {i+1}"))
+        """Populate the configuration dropdown from the current protocol names"""
+        # Refilling must not count as a selection by the user
+        self.config_combo.blockSignals(True)
+        self.config_combo.clear()
+        for i, name in enumerate(self.get_protocol_names()):
+            # Items carry the protocol name, so selections survive reordering
+            self.config_combo.addItem(name or f"Config {i+1}", name)
+        self.config_combo.blockSignals(False)
     
     def set_current_config_selection(self):
         """Set the dropdown to show the currently active configuration"""
-        # Use the already-calculated index instead of searching again
-        if 0 <= self.current_config_index < self.config_combo.count():
-            self.config_combo.setCurrentIndex(self.current_config_index)
-        else:
-            # Fallback to first item if index is invalid
-            self.config_combo.setCurrentIndex(0)
-            self.current_config_index = 0
+        index = self.config_combo.findData(self.current_config_name)
+        if index < 0:
+            # Fallback to first item if the protocol is no longer available
+            index = 0
+            self.current_config_name = self.config_combo.itemData(0) if self.config_combo.count() else ""
+        self.config_combo.blockSignals(True)
+        self.config_combo.setCurrentIndex(index)
+        self.config_combo.blockSignals(False)
     
     def on_config_changed(self, index):
         """Handle configuration selection change"""
-        self.current_config_index = index
+        self.current_config_name = self.config_combo.itemData(index)
         self.update_config_display()
     
     def update_config_display(self):
         """Update the display with current configuration details"""
-        configs = self.get_observation_configs()
-        if not configs or self.current_config_index >= len(configs):
+        # Only the selected protocol is loaded
+        current_config = self.app_state.config_manager.get_config_by_name(self.current_config_name)
+        if not current_config:
             return
-            
-        current_config = configs[self.current_config_index]
         
         # Update description and details (only if UI elements exist)
         description = current_config.get("description", "No description available.")
@@ -237,6 +231,8 @@ class SettingsPage(QWidget):
     def save_settings(self):
         """Save the current settings and update the app state"""
         # Update the app state with the new configuration
-        self.app_state.update_config(self.current_config_index)
+        self.app_state.update_config_by_name(self.current_config_name)
+        # Warm the icon cache for the newly selected protocol
+        IconCache().preload_protocol(self.app_state.get_current_config(), self.devicePixelRatioF())
         self.switch_page(0)
         
\ No newline at end of file
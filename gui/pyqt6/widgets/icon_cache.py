@@ -0,0 +1,81 @@
+# gui/pyqt6/widgets/icon_cache.py
+from typing import Any, Dict, Optional, Tuple
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QGuiApplication, QIcon, QPixmap
+from core.util_functions import resource_path
+
+# Icon sizes used by the observation pages (logical pixels)
+ACTION_ICON_SIZE = (40, 40)
+ENGAGEMENT_ICON_SIZE = (30, 30)
+
+
+class IconCache:
+    """Process-wide cache of decoded and scaled button icons.
+
+    Entries are keyed by image path, logical size and device pixel ratio, so an
+    image is read from disk and smooth-scaled once per process no matter how many
+    buttons or page rebuilds use it. Missing or unreadable images are cached too,
+    so they are not retried on every page build.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self._icons: Dict[Tuple[str, int, int, float], Optional[Tuple[QIcon, QSize]]] = {}
+            IconCache._initialized = True
+
+    def get_icon(self, image_path: str, size: Tuple[int, int] = ACTION_ICON_SIZE,
+                 device_pixel_ratio: Optional[float] = None) -> Optional[Tuple[QIcon, QSize]]:
+        """Return (icon, logical icon size) for an image, or None if it cannot be loaded"""
+        if not image_path:
+            return None
+        if device_pixel_ratio is None:
+            device_pixel_ratio = self._screen_pixel_ratio()
+
+        key = (image_path, size[0], size[1], float(device_pixel_ratio))
+        if key not in self._icons:
+            self._icons[key] = self._load_icon(image_path, size, device_pixel_ratio)
+        return self._icons[key]
+
+    def preload_protocol(self, config: Dict[str, Any], device_pixel_ratio: Optional[float] = None) -> int:
+        """Decode and scale every button image used by an observation protocol"""
+        loaded = 0
+        for key in ("student_actions", "instructor_actions"):
+            for button_data in config.get(key, []):
+                if self.get_icon(button_data.get("image", ""), ACTION_ICON_SIZE, device_pixel_ratio):
+                    loaded += 1
+        for button_data in config.get("engagement_images", []):
+            if self.get_icon(button_data.get("image", ""), ENGAGEMENT_ICON_SIZE, device_pixel_ratio):
+                loaded += 1
+        return loaded
+
+    def clear(self) -> None:
+        """Drop all cached icons (e.g. after images on disk were replaced)"""
+        self._icons = {}
+
+    def _load_icon(self, image_path: str, size: Tuple[int, int], device_pixel_ratio: float) -> Optional[Tuple[QIcon, QSize]]:
+        """Read and scale an image at the requested size for the given pixel ratio"""
+        # Use resource_path to make the path PyInstaller-safe
+        full_image_path = resource_path(image_path)
+        pixmap = QPixmap(full_image_path)
+        if pixmap.isNull():
+            return None
+
+        # Scale in device pixels so icons stay sharp on high-DPI screens
+        scaled_pixmap = pixmap.scaled(
+            round(size[0] * device_pixel_ratio), round(size[1] * device_pixel_ratio),
+            Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        scaled_pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return QIcon(scaled_pixmap), scaled_pixmap.deviceIndependentSize().toSize()
+
+    def _screen_pixel_ratio(self) -> float:
+        """Pixel ratio of the primary screen, 1.0 if no screen is available"""
+        screen = QGuiApplication.primaryScreen()
+        return screen.devicePixelRatio() if screen else 1.0
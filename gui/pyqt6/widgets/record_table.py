@@ -0,0 +1,157 @@
+from numbers import Number
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, QTimer
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QLineEdit, QTableView, QVBoxLayout, QWidget
+
+# Milliseconds to wait after the last keystroke before filtering
+FILTER_DELAY_MS = 150
+
+
+def _sort_key(value: Any) -> tuple:
+    """Sort numbers before text and empty cells last, whatever a column mixes"""
+    if value is None:
+        return (2, "")
+    if isinstance(value, Number):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+class RecordTableModel(QAbstractTableModel):
+    """Read-only table model over a list of row tuples
+
+    Views only ask for the rows they show, so cells are formatted lazily
+    and the cost of scrolling does not depend on the number of rows.
+    Formatters turn a column's raw value into its display text.
+    """
+
+    def __init__(self, headers: Sequence[str], rows: List[tuple],
+                 formatters: Optional[Dict[int, Callable[[Any], str]]] = None, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.rows = rows
+        self.formatters = formatters or {}
+        self._search_text: Optional[List[str]] = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return self.display_text(index.row(), index.column())
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return None
+
+    def display_text(self, row: int, column: int) -> str:
+        """Formatted text of one cell"""
+        value = self.rows[row][column]
+        formatter = self.formatters.get(column)
+        if formatter is not None:
+            return formatter(value)
+        return "" if value is None else str(value)
+
+    def search_text(self, row: int) -> str:
+        """Lower-case text of all cells of a row, built once for filtering"""
+        if self._search_text is None:
+            columns = range(len(self.headers))
+            self._search_text = [
+                " ".join(self.display_text(number, column) for column in columns).lower()
+                for number in range(len(self.rows))
+            ]
+        return self._search_text[row]
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Sort the rows in place (one Python sort instead of a comparison callback per pair)"""
+        if not 0 <= column < len(self.headers):
+            return
+        self.layoutAboutToBeChanged.emit()
+        order_before = list(range(len(self.rows)))
+        order_before.sort(key=lambda number: _sort_key(self.rows[number][column]),
+                          reverse=order == Qt.SortOrder.DescendingOrder)
+        self.rows = [self.rows[number] for number in order_before]
+        if self._search_text is not None:
+            self._search_text = [self._search_text[number] for number in order_before]
+        # Keep selections and the current row on the same records
+        new_row = {old: new for new, old in enumerate(order_before)}
+        for index in self.persistentIndexList():
+            self.changePersistentIndex(index, self.index(new_row[index.row()], index.column()))
+        self.layoutChanged.emit()
+
+
+class RecordFilterProxyModel(QSortFilterProxyModel):
+    """Case-insensitive substring filter over whole rows; sorting is done by the source model"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_filter_text(self, text: str) -> None:
+        """Show only rows containing text in any cell"""
+        needle = text.strip().lower()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        return not self._needle or self._needle in self.sourceModel().search_text(source_row)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        # Without a sort column of its own the proxy keeps the source order
+        self.sourceModel().sort(column, order)
+
+
+class RecordTable(QWidget):
+    """Filter box and virtualized, sortable table view over a RecordTableModel"""
+
+    def __init__(self, model: RecordTableModel, filter_placeholder: str = "Filter...",
+                 stretch_column: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.proxy = RecordFilterProxyModel(self)
+        self.proxy.setSourceModel(model)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText(filter_placeholder)
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
+        # Filter once typing pauses rather than on every keystroke
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(lambda: self.proxy.set_filter_text(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        # Keep the rows in the order they were given until a header is clicked
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.view.setSortingEnabled(True)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setWordWrap(False)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.verticalHeader().setVisible(False)
+
+        # Fixed row heights and column widths: layout never measures every row
+        vertical_header = self.view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.view.fontMetrics().height() + 8)
+        horizontal_header = self.view.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(stretch_column is None)
+        if stretch_column is not None:
+            horizontal_header.setSectionResizeMode(stretch_column, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.view)
+
+        self.setLayout(layout)
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from backend.visualization.plot_factory import PlotFactory
 from backend.visualization.color_manager import ColorManager
+from core.instrumentation import stage
 
 
 class StreamlitPlotAdapter:
@@ -13,9 +14,13 @@ class StreamlitPlotAdapter:
     def display_time_series_plot(self, df: pd.DataFrame, color_manager: ColorManager):
         """Display time series plot in Streamlit"""
         fig = self.plot_factory.create_time_series_plot(df, color_manager)
-        st.pyplot(fig)
+        # The figure is not reused once rendered; clearing it frees its artists right away
+        with stage("streamlit.pyplot"):
+            st.pyplot(fig, clear_figure=True)
     
     def display_category_distribution_plot(self, df: pd.DataFrame, color_manager: ColorManager):
         """Display category distribution plot in Streamlit"""
         fig = self.plot_factory.create_category_distribution_plot(df, color_manager)
-        st.pyplot(fig)
+        # The figure is not reused once rendered; clearing it frees its artists right away
+        with stage("streamlit.pyplot"):
+            st.pyplot(fig, clear_figure=True)
@@ -1,7 +1,7 @@
 import streamlit as st
-from backend.config.config_manager import ConfigManager
-from backend.config.app_state import AppState
+from .shared_resources import get_config_manager, get_app_state
 from .pages import home_page, observation_page, analysis_page, settings_page
+from core.instrumentation import request_scope
 import os
 
 
@@ -15,10 +15,10 @@ def main():
         initial_sidebar_state="collapsed"
     )
     
-    # Initialize configuration
+    # Initialize configuration (the manager and app state are shared by all sessions)
     if 'config_manager' not in st.session_state:
-        st.session_state.config_manager = ConfigManager()
-        st.session_state.app_state = AppState(st.session_state.config_manager)
+        st.session_state.config_manager = get_config_manager()
+        st.session_state.app_state = get_app_state()
         
         # Load initial configuration
         config = st.session_state.app_state.get_current_config()
@@ -28,6 +28,10 @@ def main():
         # Initialize page state
         st.session_state.page = "home"
     
+    # Hot-reload protocols when config.json is replaced (one watcher per process)
+    st.session_state.config_manager.start_watching()
+    _sync_config_with_reloads()
+    
     # Initialize page state if not exists
     if 'page' not in st.session_state:
         st.session_state.page = "home"
@@ -35,19 +39,35 @@ def main():
     # Add custom CSS for better styling
     add_custom_css()
     
-    # Render current page
-    if st.session_state.page == "home":
-        home_page.render_home_page()
-    elif st.session_state.page == "observation":
-        observation_page.render_observation_page()
-    elif st.session_state.page == "analysis":
-        analysis_page.render_analysis_page()
-    elif st.session_state.page == "settings":
-        settings_page.render_settings_page()
-    else:
-        st.error("Unknown page. Redirecting to home...")
-        st.session_state.page = "home"
-        st.rerun()
+    # Render current page (one profiled request per script run with REFLECT_MEMPROFILE=1)
+    with request_scope(f"streamlit.{st.session_state.page}"):
+        if st.session_state.page == "home":
+            home_page.render_home_page()
+        elif st.session_state.page == "observation":
+            observation_page.render_observation_page()
+        elif st.session_state.page == "analysis":
+            analysis_page.render_analysis_page()
+        elif st.session_state.page == "settings":
+            settings_page.render_settings_page()
+        else:
+            st.error("Unknown page. Redirecting to home...")
+            st.session_state.page = "home"
+            st.rerun()
+
+
+def _sync_config_with_reloads():
+    """Refresh this session's protocol and colors after config.json was hot-reloaded"""
+    snapshot = st.session_state.config_manager.get_snapshot()
+    if st.session_state.get('config_version') == snapshot.version:
+        return
+    st.session_state.config_version = snapshot.version
+    
+    # Keep the session on the same protocol (by name) if it still exists
+    current_config = st.session_state.get('current_config') or {}
+    config = snapshot.get_protocol_by_name(current_config.get('name')) or snapshot.get_protocol(0)
+    if config:
+        st.session_state.current_config = config
+        st.session_state.colors = config.get('colors', {})
 
 
 def add_custom_css():
@@ -1,33 +1,23 @@
 import streamlit as st
 import pandas as pd
-from backend.analysis.orchestrator import AnalysisOrchestrator
-from backend.analysis.statistics_calculator import StatisticsCalculator
-from backend.analysis.insights_generator import InsightsGenerator
-from backend.visualization.plot_factory import PlotFactory
-from backend.export.pdf_exporter import PDFExporter
-from gui.streamlit.adapters.plot_adapter import StreamlitPlotAdapter
+from backend.data import file_formats
+from gui.streamlit.shared_resources import (get_analysis_services, get_dataset_analysis, load_dataset,
+                                            dataset_csv_download, get_pdf_report, request_pdf_report,
+                                            discard_pdf_report)
+
+# Accepted upload extensions (.csv, .csv.gz, .csv.zst, .parquet, .reflect)
+UPLOAD_TYPES = ['csv', 'gz', 'zst', 'parquet', 'reflect']
+
+# How often a pending PDF report is checked (seconds)
+PDF_POLL_SECONDS = 1
 
 
 def render_analysis_page():
     """Render the analysis page"""
-    # Initialize services
-    if 'analysis_orchestrator' not in st.session_state:
-        colors = st.session_state.get('colors', {})
-        config_manager = st.session_state.get('config_manager')
-        st.session_state.analysis_orchestrator = AnalysisOrchestrator(colors, config_manager)
-        st.session_state.plot_factory = PlotFactory()
-        st.session_state.plot_adapter = StreamlitPlotAdapter(st.session_state.plot_factory)
-        st.session_state.statistics_calculator = StatisticsCalculator()
-        st.session_state.insights_generator = InsightsGenerator()
-        st.session_state.pdf_exporter = PDFExporter(
-            st.session_state.statistics_calculator,
-            st.session_state.insights_generator,
-            st.session_state.plot_factory
-        )
-    
-    orchestrator = st.session_state.analysis_orchestrator
-    plot_adapter = st.session_state.plot_adapter
-    pdf_exporter = st.session_state.pdf_exporter
+    # Services are stateless and shared by all sessions
+    services = get_analysis_services()
+    orchestrator = services.orchestrator
+    plot_adapter = services.plot_adapter
     
     # render UI 
     # header section
@@ -40,18 +30,16 @@ def render_analysis_page():
         if 'current_data' in st.session_state and 'current_data_filename' in st.session_state:
             display_export_options(
                 st.session_state.current_data, 
-                pdf_exporter, 
-                orchestrator, 
+                st.session_state.current_data_digest, 
                 st.session_state.current_data_filename
             )
 
     with header_col3:
         if st.button("Back to Home"):
             # Clear all analysis-related data when leaving the page
-            analysis_keys = ['current_data', 'current_data_filename',
-                             'comparison_data', 'comparison_data_filename',
-                             'analysis_orchestrator', 'plot_factory', 'plot_adapter',
-                             'statistics_calculator', 'insights_generator', 'pdf_exporter']
+            # (parsed datasets stay in the shared cache for other sessions)
+            analysis_keys = ['current_data', 'current_data_filename', 'current_data_digest',
+                             'comparison_data', 'comparison_data_filename', 'comparison_data_digest']
             
             for key in analysis_keys:
                 if key in st.session_state:
@@ -67,27 +55,18 @@ def render_analysis_page():
 
     with data1_col:
         if 'current_data' not in st.session_state or 'current_data_filename' not in st.session_state:
-            uploaded_file = st.file_uploader("Upload observation file", type=['csv'], help="Upload a CSV file with observation data")
+            uploaded_file = st.file_uploader("Upload observation file", type=UPLOAD_TYPES, help="Upload observation data (CSV, compressed CSV, Parquet or .reflect)")
         
             if uploaded_file is not None:
-                # Save uploaded file temporarily
                 with st.spinner("Loading and validating data..."):
-                    # Create a temporary file path
-                    temp_path = f"temp_{uploaded_file.name}_1"
-                    with open(temp_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    
-                    # Load and validate data
-                    result = orchestrator.load_and_validate_data(temp_path)
-                    
-                    # Clean up temp file
-                    import os
-                    os.remove(temp_path)
+                    # Parsed once per distinct file content, shared across sessions
+                    digest, result = load_dataset(uploaded_file.getvalue())
                 
                     if result.success:
                         df = result.data
+                        st.session_state.current_data_digest = digest
                         st.session_state.current_data = df        
-                        filename = uploaded_file.name.rsplit('.', 1)[0] if '.' in uploaded_file.name else uploaded_file.name
+                        filename = file_formats.strip_suffix(uploaded_file.name)
                         st.session_state.current_data_filename = filename
                         st.rerun()
             
@@ -99,27 +78,18 @@ def render_analysis_page():
     with data2_col:
         if 'current_data' in st.session_state and 'current_data_filename' in st.session_state:
             if 'comparison_data' not in st.session_state or 'comparison_data_filename' not in st.session_state:
-                comparison_file = st.file_uploader("Upload file for comparison", type=['csv'], help="Upload a CSV file with observation data")
+                comparison_file = st.file_uploader("Upload file for comparison", type=UPLOAD_TYPES, help="Upload observation data (CSV, compressed CSV, Parquet or .reflect)")
             
                 if comparison_file is not None:
-                    # Save uploaded file temporarily
                     with st.spinner("Loading and validating data..."):
-                        # Create a temporary file path
-                        temp_path = f"temp_{comparison_file.name}_1"
-                        with open(temp_path, "wb") as f:
-                            f.write(comparison_file.getbuffer())
-                        
-                        # Load and validate data
-                        result = orchestrator.load_and_validate_data(temp_path)
-                        
-                        # Clean up temp file
-                        import os
-                        os.remove(temp_path)
+                        # Parsed once per distinct file content, shared across sessions
+                        digest, result = load_dataset(comparison_file.getvalue())
                     
                         if result.success:
                             df = result.data
+                            st.session_state.comparison_data_digest = digest
                             st.session_state.comparison_data = df        
-                            filename = comparison_file.name.rsplit('.', 1)[0] if '.' in comparison_file.name else comparison_file.name
+                            filename = file_formats.strip_suffix(comparison_file.name)
                             st.session_state.comparison_data_filename = filename
                             st.rerun()
                 
@@ -151,34 +121,34 @@ def render_analysis_page():
         st.markdown("---")
     
     if 'current_data' in st.session_state and 'current_data_filename' in st.session_state:
-        df = st.session_state.current_data
-        # Display text summaries
+        # Text summaries are computed once per dataset and shared across sessions
+        analysis = get_dataset_analysis(st.session_state.current_data_digest, st.session_state.current_data)
         summary_col, insights_col = st.columns([1, 1])
         with summary_col:
-            display_summary_statistics(df, orchestrator)
+            display_summary_statistics(analysis['summary'])
         with insights_col:
-            display_insights(df, orchestrator)
+            display_insights(analysis['insights'])
         
     
     if 'comparison_data' in st.session_state and 'comparison_data_filename' in st.session_state:
-        df = st.session_state.comparison_data
-        # Display text summaries
+        # Text summaries are computed once per dataset and shared across sessions
+        analysis = get_dataset_analysis(st.session_state.comparison_data_digest, st.session_state.comparison_data)
         summary_col, insights_col = st.columns([1, 1])
         with summary_col:
-            display_summary_statistics(df, orchestrator)
+            display_summary_statistics(analysis['summary'])
         with insights_col:
-            display_insights(df, orchestrator)
+            display_insights(analysis['insights'])
 
     if 'current_data' in st.session_state and 'current_data_filename' in st.session_state:
         st.markdown("---")
         
     if 'current_data' in st.session_state and 'current_data_filename' in st.session_state:
-        df = st.session_state.current_data
-        display_statistics_table(df, orchestrator)
+        analysis = get_dataset_analysis(st.session_state.current_data_digest, st.session_state.current_data)
+        display_statistics_table(analysis['response_stats'])
     
     if 'comparison_data' in st.session_state and 'comparison_data_filename' in st.session_state:
-        df = st.session_state.comparison_data
-        display_statistics_table(df, orchestrator)
+        analysis = get_dataset_analysis(st.session_state.comparison_data_digest, st.session_state.comparison_data)
+        display_statistics_table(analysis['response_stats'])
 
 
 def display_time_series_plot(df, plot_adapter, orchestrator):
@@ -193,10 +163,9 @@ def display_distribution_plot(df, plot_adapter, orchestrator):
     plot_adapter.display_category_distribution_plot(df, orchestrator.get_color_manager())
 
 
-def display_summary_statistics(df, orchestrator):
+def display_summary_statistics(summary):
     """Display summary statistics"""
     st.subheader("Data Summary")
-    summary = orchestrator.generate_summary_statistics(df)
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -219,70 +188,65 @@ def display_summary_statistics(df, orchestrator):
             st.markdown(f"- **{key}:** {value}")
 
 
-def display_insights(df, orchestrator):
+def display_insights(insights):
     """Display insights"""
     st.subheader("Timeline Analysis & Insights")
-    insights = orchestrator.generate_insights(df)
     
     for insight in insights:
         st.markdown(f"• {insight}")
 
 
-def display_statistics_table(df, orchestrator):
+def display_statistics_table(stats):
     """Display statistics table"""
     st.subheader("Response Statistics by Category")
-    stats = orchestrator.generate_response_statistics(df)
     
     # Convert to DataFrame for better display
     stats_df = pd.DataFrame(stats)
     st.dataframe(stats_df, width='stretch')
 
 
-def display_export_options(df, pdf_exporter, orchestrator, filename):
+def display_export_options(df, digest, filename):
     """Display export options"""
     st.subheader("Export Options")
     
     col1, col2 = st.columns(2)
     
     with col1:
-        # CSV Export
-        csv_data = df.to_csv(index=False)
+        # CSV Export - written by CSVExporter (header info included) only when downloaded
         st.download_button(
             label="Download CSV",
-            data=csv_data,
+            data=dataset_csv_download(df),
             file_name=f"{filename}_analysis.csv",
             mime="text/csv",
             help="Download the analyzed data as CSV"
         )
     
     with col2:
-        # PDF Export
-        if st.button("Generate PDF Report", help="Generate a comprehensive PDF report"):
-            with st.spinner("Generating PDF report..."):
-                # Create a temporary file for PDF
-                import tempfile
-                import os
-                
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                    temp_path = tmp_file.name
-                
-                success = pdf_exporter.export_analysis_report(
-                    df, temp_path, filename, orchestrator.get_color_manager()
-                )
-                
-                if success:
-                    with open(temp_path, "rb") as pdf_file:
-                        pdf_data = pdf_file.read()
-                    
-                    st.download_button(
-                        label="Download PDF Report",
-                        data=pdf_data,
-                        file_name=f"{filename}_report.pdf",
-                        mime="application/pdf",
-                        help="Download comprehensive analysis report as PDF"
-                    )
-                    
-                    # Clean up temp file
-                    os.unlink(temp_path)
-                else:
-                    st.error("Failed to generate PDF report")
+        # PDF Export - rendered in memory in the background and kept until the data changes
+        report = get_pdf_report(digest, filename)
+        if report is None:
+            if st.button("Generate PDF Report", help="Generate a comprehensive PDF report"):
+                request_pdf_report(digest, df, filename)
+                st.rerun()
+        elif not report.done():
+            _poll_pdf_report(report)
+        elif report.result() is None:
+            st.error("Failed to generate PDF report")
+            # Allow another attempt
+            discard_pdf_report(digest, filename)
+        else:
+            st.download_button(
+                label="Download PDF Report",
+                data=report.result(),
+                file_name=f"{filename}_report.pdf",
+                mime="application/pdf",
+                help="Download comprehensive analysis report as PDF"
+            )
+
+
+@st.fragment(run_every=PDF_POLL_SECONDS)
+def _poll_pdf_report(report):
+    """Show progress of a pending report; rerun the page once it is ready"""
+    if report.done():
+        st.rerun()
+    st.info("Generating PDF report...")
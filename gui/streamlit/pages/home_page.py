@@ -44,22 +44,17 @@ def render_home_page():
             app_state = st.session_state.get('app_state')
             
             if config_manager and app_state:
-                # Get available observation configs
-                observation_configs = config_manager.get_observation_configs()
+                # Get available protocol names (protocol bodies load on selection)
+                config_names = config_manager.get_protocol_names()
                 
-                if observation_configs:
-                    # Create list of config names
-                    config_names = [config['name'] for config in observation_configs]
-                    
+                if config_names:
                     # Get current config index from app state
                     current_config = app_state.get_current_config()
                     current_index = 0
                     
                     # Find the index of the current config
-                    for i, config in enumerate(observation_configs):
-                        if config['name'] == current_config.get('name'):
-                            current_index = i
-                            break
+                    if current_config.get('name') in config_names:
+                        current_index = config_names.index(current_config.get('name'))
                     
                     # Radio buttons for protocol selection
                     selected = st.radio(
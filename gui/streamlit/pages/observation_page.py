@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
 import time
+from backend.config.protocol_index import ProtocolIndex
 from backend.data.collectors.observation_collector import ObservationCollector
 from backend.data.collectors.timer_service import TimerService
 from backend.data.exporters.csv_exporter import CSVExporter
 from gui.streamlit.adapters.timer_adapter import StreamlitTimerAdapter
+from gui.streamlit.shared_resources import csv_download
 import streamlit.components.v1 as components
 from streamlit_autorefresh import st_autorefresh
 
@@ -42,17 +44,25 @@ def reset_observation_state():
     
     # Clear download state
     st.session_state.show_download = False
-    st.session_state.csv_data = None
+    st.session_state.csv_metadata = None
     
     # Clear comment field
     if 'comment_field' in st.session_state:
         del st.session_state.comment_field
 
 
+def _get_protocol_index(config):
+    """Get the compiled protocol index, shared through the config manager when available"""
+    config_manager = st.session_state.get('config_manager')
+    if config_manager is not None:
+        return config_manager.get_protocol_index(config)
+    return ProtocolIndex(config)
+
+
 def _initialize_services(config):
     """Initialize all services and state"""
     if 'observation_collector' not in st.session_state:
-        st.session_state.observation_collector = ObservationCollector(config)
+        st.session_state.observation_collector = ObservationCollector(config, _get_protocol_index(config))
         st.session_state.timer_service = TimerService()
         st.session_state.timer_adapter = StreamlitTimerAdapter(st.session_state.timer_service)
         st.session_state.csv_exporter = CSVExporter()
@@ -145,18 +155,12 @@ def _render_finish_button(timer_adapter, collector, observation_type, config):
         if observation_type == "interval":
             save_interval_data(collector, config)
         
-        responses = collector.get_responses()
-        
-        if responses:
-            # Use CSVExporter to create CSV data with metadata
+        if collector.has_responses():
+            # Keep only the metadata; the CSV is written from the collector when downloaded
             csv_exporter = st.session_state.csv_exporter
             start_time = collector.start_time
             duration = collector.get_elapsed_time()
-            metadata = csv_exporter.create_metadata(config, start_time, duration)
-            
-            # Create CSV data string
-            csv_data = create_csv_data_with_metadata(responses, metadata)
-            st.session_state.csv_data = csv_data
+            st.session_state.csv_metadata = csv_exporter.create_metadata(config, start_time, duration)
             st.session_state.show_download = True
         else:
             st.warning("No observations recorded.")
@@ -167,13 +171,14 @@ def _render_finish_button(timer_adapter, collector, observation_type, config):
         st.rerun()
 
 
-def _render_download_button():
+def _render_download_button(collector):
     """Render download data button"""
-    csv_data = st.session_state.get('csv_data', '')
-    if csv_data:
+    metadata = st.session_state.get('csv_metadata')
+    if metadata:
         st.download_button(
             label="Download Data",
-            data=csv_data,
+            # Streamed through CSVExporter from the recorded responses when clicked
+            data=csv_download(collector.iter_responses, metadata),
             file_name=f"observation_{int(time.time())}.csv",
             mime="text/csv",
             help="Download your observation data as CSV",
@@ -191,7 +196,7 @@ def _render_start_button(collector, timer_adapter):
         st.session_state.interval_start_time = None
         # Clear any previous download state when starting new observation
         st.session_state.show_download = False
-        st.session_state.csv_data = None
+        st.session_state.csv_metadata = None
         st.rerun()
 
 
@@ -223,7 +228,7 @@ def render_timer_controls(timer_adapter, collector, observation_type, config, ha
             _render_finish_button(timer_adapter, collector, observation_type, config)
         elif has_saved_data:
             # State 2: Timer not running and data is saved -> "Download Data" button
-            _render_download_button()
+            _render_download_button(collector)
         else:
             # State 1: Timer not running and no data saved -> "Start Observation" button
             _render_start_button(collector, timer_adapter)
@@ -366,26 +371,14 @@ def save_interval_data(collector, config):
         return
     
     button_states = st.session_state.get('button_states', {})
+    index = collector.protocol_index
     
-    # Save data for all toggled buttons
-    for key, is_toggled in button_states.items():
-        if is_toggled:
-            # Parse category and label from key using prefixes
-            category = None
-            label = None
-            value = 1
-            
-            for prefix, category_name in CATEGORY_PREFIXES.items():
-                prefix_with_underscore = f"{prefix}_"
-                if key.startswith(prefix_with_underscore):
-                    category = category_name
-                    label = key.replace(prefix_with_underscore, "", 1)
-                    if category == "Engagement":
-                        value = get_engagement_value(label)
-                    break
-            
-            if category and label:
-                collector.record_response(category, label, value)
+    # Save data for all toggled buttons - keys map straight to protocol code ids
+    code_ids = [
+        index.state_keys[key] for key, is_toggled in button_states.items()
+        if is_toggled and key in index.state_keys
+    ]
+    collector.record_codes(code_ids)
     
     # Clear button states after saving
     st.session_state.button_states = {}
@@ -466,31 +459,8 @@ def render_comments_section(collector):
 
 
 def get_engagement_value(label):
-    """Get numeric value for engagement level"""
-    engagement_values = {"Low": 1, "Medium": 2, "High": 3}
-    return engagement_values.get(label, 1)
-
-
-def create_csv_data_with_metadata(responses, metadata):
-    """Create CSV data string with metadata using CSVExporter format"""
-    import csv
-    import io
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Add metadata as comment lines (matching CSVExporter format)
-    for key, value in metadata.items():
-        writer.writerow([f"# {key}: {value}"])
-    
-    # Add empty line separator
-    writer.writerow([])
-    
-    # Add data header and rows
-    writer.writerow(["time_s", "category", "response", "value"])
-    writer.writerows(responses)
-    
-    return output.getvalue()
+    """Get numeric value for engagement level from the current protocol"""
+    return st.session_state.observation_collector.protocol_index.engagement_value(label)
 
 
 def render_observation_page():
@@ -531,5 +501,5 @@ def render_observation_page():
     st.markdown("---")
 
     # Timer display, controls, and back button
-    has_saved_data = st.session_state.get('show_download', False) and st.session_state.get('csv_data', '')
+    has_saved_data = st.session_state.get('show_download', False) and bool(st.session_state.get('csv_metadata'))
     render_timer_controls(timer_adapter, collector, observation_type, config, has_saved_data)
@@ -1,11 +1,11 @@
 import streamlit as st
-from backend.config.config_manager import ConfigManager
+from gui.streamlit.shared_resources import get_config_manager
 
 
 def _initialize_config_manager():
     """Initialize config manager in session state if needed."""
     if 'config_manager' not in st.session_state:
-        st.session_state.config_manager = ConfigManager()
+        st.session_state.config_manager = get_config_manager()
     return st.session_state.config_manager
 
 
@@ -21,9 +21,8 @@ def _render_header():
     st.markdown("---")
 
 
-def _render_protocol_selection(config_manager, observation_configs):
+def _render_protocol_selection(config_manager, protocol_names):
     """Handle protocol selection logic and UI."""
-    protocol_names = [config['name'] for config in observation_configs]
     
     # Initialize selected protocol if needed
     if 'selected_protocol' not in st.session_state:
@@ -140,14 +139,14 @@ def render_settings_page():
     """Render the settings page."""
     # Initialization
     config_manager = _initialize_config_manager()
-    observation_configs = config_manager.get_observation_configs()
+    protocol_names = config_manager.get_protocol_names()
     colors = config_manager.get_colors()
     
     # Header
     _render_header()
     
     # Protocol selection and overview
-    selected_protocol = _render_protocol_selection(config_manager, observation_configs)
+    selected_protocol = _render_protocol_selection(config_manager, protocol_names)
     
     col1, col2 = st.columns(2)
     with col1:
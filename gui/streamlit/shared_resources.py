@@ -0,0 +1,194 @@
+import hashlib
+import threading
+import streamlit as st
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+from backend.config.config_manager import ConfigManager
+from backend.config.app_state import AppState
+from backend.analysis.orchestrator import AnalysisOrchestrator
+from backend.analysis.statistics_calculator import StatisticsCalculator
+from backend.analysis.insights_generator import InsightsGenerator
+from backend.data.processors.data_processor import DataLoadResult
+from backend.data.exporters.csv_exporter import CSVExporter, CSV_COLUMNS
+from backend.visualization.plot_factory import PlotFactory
+from backend.export.pdf_exporter import PDFExporter
+from gui.streamlit.adapters.plot_adapter import StreamlitPlotAdapter
+
+# Parsed datasets (and their analyses) kept across sessions, least recently used dropped first
+DATASET_CACHE_ENTRIES = 32
+DATASET_CACHE_TTL = 6 * 60 * 60  # seconds
+
+# Background export rendering
+EXPORT_WORKERS = 2
+EXPORT_JOB_ENTRIES = 32
+
+# st.download_button accepts a callable for `data` (called when the button is clicked) from 1.50
+DEFERRED_DOWNLOADS = tuple(int(part) for part in st.__version__.split(".")[:2] if part.isdigit()) >= (1, 50)
+
+
+# Process-wide services. Streamlit runs every browser session in the same process,
+# so stateless services are built once here instead of per session in st.session_state.
+
+@st.cache_resource
+def get_config_manager() -> ConfigManager:
+    """Configuration manager shared by all sessions"""
+    return ConfigManager()
+
+
+@st.cache_resource
+def get_app_state() -> AppState:
+    """Application state built on the shared configuration manager"""
+    return AppState(get_config_manager())
+
+
+class AnalysisServices:
+    """Stateless analysis, plotting and export services shared by all sessions"""
+
+    def __init__(self, config_manager: ConfigManager):
+        self.orchestrator = AnalysisOrchestrator(config_manager.get_colors(), config_manager)
+        self.statistics_calculator = StatisticsCalculator()
+        self.insights_generator = InsightsGenerator()
+        self.plot_factory = PlotFactory(config_manager)
+        self.plot_adapter = StreamlitPlotAdapter(self.plot_factory)
+        self.csv_exporter = CSVExporter()
+        self.pdf_exporter = PDFExporter(
+            self.statistics_calculator,
+            self.insights_generator,
+            self.plot_factory
+        )
+
+
+@st.cache_resource
+def get_analysis_services() -> AnalysisServices:
+    """Analysis services shared by all sessions"""
+    return AnalysisServices(get_config_manager())
+
+
+def csv_download(responses: Callable[[], Iterable[Tuple]], metadata: Dict[str, Any]) -> Union[Callable[[], bytes], bytes]:
+    """Data for st.download_button: the CSV export, built by CSVExporter only when the button is clicked.
+
+    `responses` is called at download time, so nothing is serialized on page
+    renders and no CSV copy is kept in session state or a cache. Older
+    Streamlit versions need the bytes up front.
+    """
+    exporter = get_analysis_services().csv_exporter
+
+    def build() -> bytes:
+        return b"".join(exporter.iter_csv_chunks(responses(), metadata))
+    return build if DEFERRED_DOWNLOADS else build()
+
+
+def content_digest(data: bytes) -> str:
+    """Hash of uploaded file contents, used as the cross-session cache key"""
+    return hashlib.sha256(data).hexdigest()
+
+
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES, ttl=DATASET_CACHE_TTL, show_spinner=False)
+def _load_dataset(digest: str, config_version: int, _data: bytes) -> DataLoadResult:
+    """Parse an uploaded file once per distinct content and configuration version"""
+    # Arguments starting with "_" are not hashed; the digest stands in for the bytes
+    processor = get_analysis_services().orchestrator.data_processor
+    return processor.load_and_validate_bytes(_data)
+
+
+def load_dataset(data: bytes) -> Tuple[str, DataLoadResult]:
+    """Load an uploaded file through the shared dataset cache; returns (digest, result).
+
+    Identical uploads from different sessions share one parsed DataFrame, which
+    must therefore be treated as read-only by the pages.
+    """
+    digest = content_digest(data)
+    config_version = get_config_manager().get_snapshot().version
+    return digest, _load_dataset(digest, config_version, data)
+
+
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES, ttl=DATASET_CACHE_TTL, show_spinner=False)
+def _analyze_dataset(digest: str, config_version: int, _df) -> Dict[str, Any]:
+    """Compute the text summaries of a dataset once per distinct content"""
+    orchestrator = get_analysis_services().orchestrator
+    return {
+        'summary': orchestrator.generate_summary_statistics(_df),
+        'response_stats': orchestrator.generate_response_statistics(_df),
+        'insights': orchestrator.generate_insights(_df)
+    }
+
+
+def get_dataset_analysis(digest: str, df) -> Dict[str, Any]:
+    """Summary statistics, response statistics and insights of a cached dataset"""
+    config_version = get_config_manager().get_snapshot().version
+    return _analyze_dataset(digest, config_version, df)
+
+
+def dataset_csv_download(df) -> Union[Callable[[], bytes], bytes]:
+    """Download data for a dataset as CSV, with its header info as the metadata lines"""
+    return csv_download(lambda: df[CSV_COLUMNS].itertuples(index=False, name=None),
+                        df.attrs.get('header_info', {}))
+
+
+class ExportJobs:
+    """Exports rendered in background threads and kept (bounded) until their data changes.
+
+    Jobs are keyed by dataset version, so every session asking for the same
+    report shares one render and reruns only look up the finished bytes.
+    """
+
+    def __init__(self, max_entries: int = EXPORT_JOB_ENTRIES, workers: int = EXPORT_WORKERS):
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reflect-export")
+        self._jobs: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Future]:
+        """Get the job for a key, None if it was never requested (or was dropped)"""
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None:
+                self._jobs.move_to_end(key)
+            return future
+
+    def submit(self, key: Hashable, render: Callable[..., Any], *args) -> Future:
+        """Start rendering in the background unless a job for the key already exists"""
+        with self._lock:
+            if key not in self._jobs:
+                self._jobs[key] = self._executor.submit(render, *args)
+                # Drop the least recently used results beyond the limit
+                while len(self._jobs) > self.max_entries:
+                    self._jobs.popitem(last=False)
+            return self._jobs[key]
+
+    def discard(self, key: Hashable) -> None:
+        """Forget a job (e.g. a failed render) so it can be requested again"""
+        with self._lock:
+            self._jobs.pop(key, None)
+
+
+@st.cache_resource
+def get_export_jobs() -> ExportJobs:
+    """Background export jobs shared by all sessions"""
+    return ExportJobs()
+
+
+def _pdf_job_key(digest: str, file_name: str) -> Tuple[str, str, str, int]:
+    """Reports depend on the data, the title and the configuration (ordering, colors)"""
+    return ("pdf", digest, file_name, get_config_manager().get_snapshot().version)
+
+
+def get_pdf_report(digest: str, file_name: str) -> Optional[Future]:
+    """Get the PDF report job for a dataset; its result is the PDF bytes (None on failure)"""
+    return get_export_jobs().get(_pdf_job_key(digest, file_name))
+
+
+def request_pdf_report(digest: str, df, file_name: str) -> Future:
+    """Start rendering the PDF report of a dataset into memory in the background"""
+    services = get_analysis_services()
+    return get_export_jobs().submit(
+        _pdf_job_key(digest, file_name),
+        services.pdf_exporter.render_analysis_report,
+        df, file_name, services.orchestrator.get_color_manager()
+    )
+
+
+def discard_pdf_report(digest: str, file_name: str) -> None:
+    """Forget a PDF report so it can be generated again"""
+    get_export_jobs().discard(_pdf_job_key(digest, file_name))
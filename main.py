@@ -1,33 +1,96 @@
+import time
+_STARTUP_T0 = time.perf_counter()
+
 import sys
+import threading
 from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget
+from PyQt6.QtCore import QTimer
 from gui.pyqt6.pages.home_page import HomePage
-from gui.pyqt6.pages.observation.interval_observation_page import ObservationIntervalPage
-from gui.pyqt6.pages.observation.timepoint_observation_page import ObservationTimepointPage
-from gui.pyqt6.pages.analysis.analysis_page import AnalysisPage
-from gui.pyqt6.pages.settings_page import SettingsPage
+from gui.pyqt6.pages.page_manager import PageManager
+from gui.pyqt6.widgets.icon_cache import IconCache
 from backend.config.config_manager import ConfigManager
 from backend.config.app_state import AppState
 
+# Command line flags
+STARTUP_TIMING_FLAG = "--startup-timing"  # print startup marks and exit once the app is warm
+NO_WARMUP_FLAG = "--no-warmup"            # do not preload the analysis stack in the background
+
+
+# Page loaders - everything except the home page is imported on first use so that
+# pandas, matplotlib and the analysis services stay out of the cold start path.
+# The imports are written out (not importlib strings) so PyInstaller still bundles them.
+def _load_interval_observation_page():
+    from gui.pyqt6.pages.observation.interval_observation_page import ObservationIntervalPage
+    return ObservationIntervalPage
+
+
+def _load_timepoint_observation_page():
+    from gui.pyqt6.pages.observation.timepoint_observation_page import ObservationTimepointPage
+    return ObservationTimepointPage
+
+
+def _load_analysis_page():
+    from gui.pyqt6.pages.analysis.analysis_page import AnalysisPage
+    return AnalysisPage
+
+
+def _load_settings_page():
+    from gui.pyqt6.pages.settings_page import SettingsPage
+    return SettingsPage
+
+
+class StartupTimer:
+    """Collects wall-clock marks from process start until the app is usable"""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, label: str) -> None:
+        """Record the time elapsed since the process started importing main.py"""
+        if self.enabled:
+            with self._lock:
+                self.marks.append((label, time.perf_counter() - _STARTUP_T0))
+
+    def report(self) -> str:
+        """Format the recorded marks as a small table"""
+        lines = ["Startup timing (seconds since main.py import):"]
+        for label, elapsed in self.marks:
+            lines.append(f"  {elapsed:8.3f}  {label}")
+        return "\n".join(lines)
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.stack = QStackedWidget()
-        
+
         # Initialize configuration manager and app state
         self.config_manager = ConfigManager()
         self.app_state = AppState(self.config_manager)
-        
+
         self.resize(int(1532/1.25), int(659/1.25))
 
-        # Define page classes in order
-        self.page_classes = [
-            HomePage,
-            ObservationIntervalPage,
-            ObservationTimepointPage,
-            AnalysisPage,
-            SettingsPage
+        # Define page loaders in order
+        self.page_loaders = [
+            lambda: HomePage,
+            _load_interval_observation_page,
+            _load_timepoint_observation_page,
+            _load_analysis_page,
+            _load_settings_page
         ]
-        
+
+        # Home and settings hold no session data, so they are built once and reused.
+        # Observation and analysis pages are rebuilt on entry and torn down on exit.
+        self.page_manager = PageManager(
+            self.stack,
+            self.page_loaders,
+            self.switch_page,
+            self.app_state,
+            cached_indices=(0, 4)
+        )
+
         # Add a placeholder widget initially
         from PyQt6.QtWidgets import QWidget
         placeholder = QWidget()
@@ -37,18 +100,63 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("REFLECT App")
 
     def switch_page(self, index):
-        # Validate index
-        if 0 <= index < len(self.page_classes):
-            # Create new page instance
-            page_class = self.page_classes[index]
-            new_page = page_class(self.switch_page, self.app_state)
-            self.stack.addWidget(new_page)
-            self.stack.setCurrentWidget(new_page)
-    
+        self.page_manager.show_page(index)
+
+    def closeEvent(self, event):
+        """Release page resources (timers, figures, data) before exiting"""
+        self.config_manager.stop_watching()
+        self.page_manager.dispose_all()
+        super().closeEvent(event)
+
+
+def start_background_warmup(startup_timer: StartupTimer) -> threading.Thread:
+    """Import the analysis/plotting stack in a daemon thread after the home page is up"""
+    def warm_up():
+        try:
+            _load_analysis_page()
+            startup_timer.mark("analysis stack imported (background)")
+        except Exception as e:
+            # The page will simply be imported on first use instead
+            print(f"Background warm-up failed: {e}")
+
+    thread = threading.Thread(target=warm_up, name="reflect-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def on_home_page_shown(window: MainWindow, startup_timer: StartupTimer, warmup: bool) -> None:
+    """Deferred initialization run once the first event loop iteration has painted the home page"""
+    startup_timer.mark("home page shown")
+    window.page_manager.preload([4])
+    startup_timer.mark("settings page preloaded")
+    IconCache().preload_protocol(window.app_state.get_current_config(), window.devicePixelRatioF())
+    startup_timer.mark("protocol icons cached")
+    # Pick up protocol updates deployed by replacing config.json
+    window.config_manager.start_watching()
+
+    warmup_thread = start_background_warmup(startup_timer) if warmup else None
+
+    if startup_timer.enabled:
+        # Measurement mode: report once warm-up has finished, then exit
+        def finish_when_warm():
+            if warmup_thread is not None and warmup_thread.is_alive():
+                QTimer.singleShot(20, finish_when_warm)
+                return
+            print(startup_timer.report())
+            QApplication.quit()
+        finish_when_warm()
+
+
 if __name__ == "__main__":
+    startup_timer = StartupTimer(STARTUP_TIMING_FLAG in sys.argv)
+    warmup = NO_WARMUP_FLAG not in sys.argv
+    startup_timer.mark("modules imported")
+
     app = QApplication(sys.argv)
     window = MainWindow()
+    startup_timer.mark("main window created")
     window.show()
     # Start with home page
     window.switch_page(0)
-    sys.exit(app.exec())
\ No newline at end of file
+    QTimer.singleShot(0, lambda: on_home_page_shown(window, startup_timer, warmup))
+    sys.exit(app.exec())